@@ -54,6 +54,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        # Helpers of app.db.migrations commit mid-migration; keep it to their own file
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -61,7 +63,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # Helpers of app.db.migrations commit mid-migration; keep it to their own file
+        transaction_per_migration=True,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,82 @@
+"""Add quizzes table with full-text search
+
+Revision ID: 22018d752234
+Revises: 8f951c01403b
+Create Date: 2026-10-19 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '22018d752234'
+down_revision: Union[str, Sequence[str], None] = '8f951c01403b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('quizzes',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('questions', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('question_count', sa.Integer(), nullable=False),
+    sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=False),
+    sa.Column('average_rating', sa.Float(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quizzes_owner_id'), 'quizzes', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_quizzes_average_rating'), 'quizzes', ['average_rating'], unique=False)
+    op.create_index('ix_quizzes_created_at_id', 'quizzes', ['created_at', 'id'], unique=False)
+    op.create_index('ix_quizzes_tags', 'quizzes', ['tags'], unique=False, postgresql_using='gin')
+    op.create_index('ix_quizzes_search_vector', 'quizzes', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # Keep search_vector up to date on every write (mirrors app/models/quiz.py)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION quizzes_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(
+                    (SELECT string_agg(q ->> 'question_text', ' ')
+                     FROM jsonb_array_elements(NEW.questions) AS q), '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER quizzes_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, questions ON quizzes
+        FOR EACH ROW EXECUTE FUNCTION quizzes_search_vector_update()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS quizzes_search_vector_trigger ON quizzes')
+    op.execute('DROP FUNCTION IF EXISTS quizzes_search_vector_update()')
+    op.drop_index('ix_quizzes_search_vector', table_name='quizzes', postgresql_using='gin')
+    op.drop_index('ix_quizzes_tags', table_name='quizzes', postgresql_using='gin')
+    op.drop_index('ix_quizzes_created_at_id', table_name='quizzes')
+    op.drop_index(op.f('ix_quizzes_average_rating'), table_name='quizzes')
+    op.drop_index(op.f('ix_quizzes_owner_id'), table_name='quizzes')
+    op.drop_table('quizzes')
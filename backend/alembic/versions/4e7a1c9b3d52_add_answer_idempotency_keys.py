@@ -0,0 +1,30 @@
+"""Add answer idempotency keys
+
+Revision ID: 4e7a1c9b3d52
+Revises: 9d4b7e21a6c8
+Create Date: 2026-10-19 16:02:11.418530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e7a1c9b3d52'
+down_revision: Union[str, Sequence[str], None] = '9d4b7e21a6c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('game_answers', sa.Column('idempotency_key', sa.Uuid(), nullable=True))
+    op.create_index('ix_game_answers_user_id_idempotency_key', 'game_answers', ['user_id', 'idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_game_answers_user_id_idempotency_key', table_name='game_answers')
+    op.drop_column('game_answers', 'idempotency_key')
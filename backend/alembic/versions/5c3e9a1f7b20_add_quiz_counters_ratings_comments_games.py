@@ -0,0 +1,75 @@
+"""Add quiz counters, ratings, comments and games
+
+Revision ID: 5c3e9a1f7b20
+Revises: 22018d752234
+Create Date: 2026-10-19 11:40:08.127655
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e9a1f7b20'
+down_revision: Union[str, Sequence[str], None] = '22018d752234'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quizzes', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('quizzes', sa.Column('rating_total', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('quizzes', sa.Column('play_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('quizzes', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('quiz_ratings',
+    sa.Column('quiz_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('quiz_id', 'user_id')
+    )
+    op.create_table('quiz_comments',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('quiz_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('body', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_quiz_comments_quiz_id_created_at', 'quiz_comments', ['quiz_id', 'created_at'], unique=False)
+    op.create_table('games',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('quiz_id', sa.Uuid(), nullable=False),
+    sa.Column('host_id', sa.Uuid(), nullable=False),
+    sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['host_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_games_host_id'), 'games', ['host_id'], unique=False)
+    op.create_index(op.f('ix_games_quiz_id'), 'games', ['quiz_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_games_quiz_id'), table_name='games')
+    op.drop_index(op.f('ix_games_host_id'), table_name='games')
+    op.drop_table('games')
+    op.drop_index('ix_quiz_comments_quiz_id_created_at', table_name='quiz_comments')
+    op.drop_table('quiz_comments')
+    op.drop_table('quiz_ratings')
+    op.drop_column('quizzes', 'comment_count')
+    op.drop_column('quizzes', 'play_count')
+    op.drop_column('quizzes', 'rating_total')
+    op.drop_column('quizzes', 'rating_count')
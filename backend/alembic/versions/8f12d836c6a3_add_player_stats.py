@@ -0,0 +1,42 @@
+"""Add player stats
+
+Revision ID: 8f12d836c6a3
+Revises: f0581e810a42
+Create Date: 2026-10-19 21:05:12.377820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f12d836c6a3'
+down_revision: Union[str, Sequence[str], None] = 'f0581e810a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('player_stats',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_player_stats_total_points', 'player_stats', ['total_points', 'user_id'], unique=False)
+    op.execute(
+        'INSERT INTO player_stats (user_id, games_played, total_points, updated_at) '
+        'SELECT user_id, sum(games_played), sum(total_points), now() '
+        'FROM player_quiz_stats GROUP BY user_id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_player_stats_total_points', table_name='player_stats')
+    op.drop_table('player_stats')
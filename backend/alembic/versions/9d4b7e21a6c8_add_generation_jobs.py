@@ -0,0 +1,52 @@
+"""Add generation jobs
+
+Revision ID: 9d4b7e21a6c8
+Revises: c28c290c5c3b
+Create Date: 2026-10-19 15:21:37.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b7e21a6c8'
+down_revision: Union[str, Sequence[str], None] = 'c28c290c5c3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('generation_jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('prompt_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('request', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('message', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('cached', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_jobs_owner_id'), 'generation_jobs', ['owner_id'], unique=False)
+    op.create_index('ix_generation_jobs_prompt_hash_status', 'generation_jobs', ['prompt_hash', 'status'], unique=False)
+    op.create_index('ix_generation_jobs_status_created_at', 'generation_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generation_jobs_status_created_at', table_name='generation_jobs')
+    op.drop_index('ix_generation_jobs_prompt_hash_status', table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_owner_id'), table_name='generation_jobs')
+    op.drop_table('generation_jobs')
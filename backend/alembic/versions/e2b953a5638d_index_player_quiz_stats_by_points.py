@@ -0,0 +1,33 @@
+"""Index player quiz stats by points
+
+Revision ID: e2b953a5638d
+Revises: 8f12d836c6a3
+Create Date: 2026-10-19 21:06:40.118254
+
+"""
+from typing import Sequence, Union
+
+from app.db import migrations
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b953a5638d'
+down_revision: Union[str, Sequence[str], None] = '8f12d836c6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    migrations.create_index_concurrently(
+        'ix_player_quiz_stats_quiz_id_total_points',
+        'player_quiz_stats',
+        ['quiz_id', 'total_points', 'user_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    migrations.drop_index_concurrently(
+        'ix_player_quiz_stats_quiz_id_total_points', 'player_quiz_stats'
+    )
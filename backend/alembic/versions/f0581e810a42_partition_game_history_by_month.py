@@ -0,0 +1,137 @@
+"""Partition game history by month
+
+Revision ID: f0581e810a42
+Revises: b7d3f0a2c614
+Create Date: 2026-10-19 20:14:37.806215
+
+A table cannot be partitioned in place: game_answers is rebuilt as a partitioned table and
+its rows copied over, which is quick while answers are few. game_events is new. Later
+partitions are created by app.db.partitions.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+from app.db import migrations, partitions
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0581e810a42'
+down_revision: Union[str, Sequence[str], None] = 'b7d3f0a2c614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ANSWER_COLUMNS = (
+    "game_id, user_id, question_index, answer, is_correct, points, elapsed_ms, "
+    "idempotency_key, answered_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    migrations.set_lock_timeout()
+    op.rename_table('game_answers', 'game_answers_unpartitioned')
+    op.execute(
+        'ALTER TABLE game_answers_unpartitioned '
+        'RENAME CONSTRAINT game_answers_pkey TO game_answers_unpartitioned_pkey'
+    )
+    op.execute(
+        'ALTER INDEX ix_game_answers_user_id_idempotency_key '
+        'RENAME TO ix_game_answers_unpartitioned_user_id_idempotency_key'
+    )
+
+    op.create_table(
+        'game_answers',
+        sa.Column('game_id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('question_index', sa.Integer(), nullable=False),
+        sa.Column('game_started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('answer', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('is_correct', sa.Boolean(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('elapsed_ms', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.Uuid(), nullable=True),
+        sa.Column('answered_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('game_id', 'user_id', 'question_index', 'game_started_at'),
+        postgresql_partition_by='RANGE (game_started_at)',
+    )
+    op.create_index(
+        'ix_game_answers_user_id_idempotency_key',
+        'game_answers',
+        ['user_id', 'idempotency_key', 'game_started_at'],
+        unique=True,
+    )
+    op.create_table(
+        'game_events',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('game_id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=True),
+        sa.Column('type', sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id', 'occurred_at'),
+        postgresql_partition_by='RANGE (occurred_at)',
+    )
+    op.create_index(op.f('ix_game_events_game_id'), 'game_events', ['game_id'], unique=False)
+
+    # Partitions for every game played so far (offline, from the current month)
+    since = None
+    if not op.get_context().as_sql:
+        since = op.get_bind().scalar(sa.text('SELECT min(started_at) FROM games'))
+    partitions.create_partitions('game_answers', since)
+    partitions.create_partitions('game_events')
+
+    op.execute(
+        f'INSERT INTO game_answers ({ANSWER_COLUMNS}, game_started_at) '
+        f'SELECT {ANSWER_COLUMNS}, games.started_at '
+        'FROM game_answers_unpartitioned '
+        'JOIN games ON games.id = game_answers_unpartitioned.game_id'
+    )
+    op.drop_table('game_answers_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('game_answers', 'game_answers_partitioned')
+    op.execute(
+        'ALTER TABLE game_answers_partitioned '
+        'RENAME CONSTRAINT game_answers_pkey TO game_answers_partitioned_pkey'
+    )
+    op.execute(
+        'ALTER INDEX ix_game_answers_user_id_idempotency_key '
+        'RENAME TO ix_game_answers_partitioned_user_id_idempotency_key'
+    )
+    op.create_table(
+        'game_answers',
+        sa.Column('game_id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('question_index', sa.Integer(), nullable=False),
+        sa.Column('answer', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('is_correct', sa.Boolean(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('elapsed_ms', sa.Integer(), nullable=False),
+        sa.Column('answered_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('idempotency_key', sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('game_id', 'user_id', 'question_index'),
+    )
+    op.create_index(
+        'ix_game_answers_user_id_idempotency_key',
+        'game_answers',
+        ['user_id', 'idempotency_key'],
+        unique=True,
+    )
+    op.execute(
+        f'INSERT INTO game_answers ({ANSWER_COLUMNS}) '
+        f'SELECT {ANSWER_COLUMNS} FROM game_answers_partitioned'
+    )
+    # Dropping a partitioned table drops its partitions
+    op.drop_table('game_answers_partitioned')
+    op.drop_index(op.f('ix_game_events_game_id'), table_name='game_events')
+    op.drop_table('game_events')
@@ -1,14 +1,24 @@
-from datetime import timedelta
+import math
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies import get_current_token_data
 from app.core.config import settings
 from app.db.session import get_db
-from app.models.user import Token, UserCreate, UserLogin, UserRead
-from app.services import auth_service, user_service
+from app.models.user import (
+    GoogleLogin,
+    RefreshRequest,
+    Token,
+    TokenData,
+    UserCreate,
+    UserLogin,
+    UserRead,
+)
+from app.services import auth_service, google_auth, token_service, user_service
+from app.utils import rate_limit
 from app.utils.responses import get_responses
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -46,8 +56,9 @@ async def register(
     return UserRead.model_validate(user)
 
 
-@router.post("/login", response_model=Token, responses=get_responses(401))
+@router.post("/login", response_model=Token, responses=get_responses(401, 429))
 async def login(
+    request: Request,
     form_data: UserLogin,
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> Token:
@@ -55,16 +66,30 @@ async def login(
     Authenticate a user and return a JWT access token.
 
     This endpoint allows a user to log in by providing their email and password.
-    If the credentials are correct, an access token is generated and returned.
+    If the credentials are correct, a short-lived access token and a refresh token are
+    generated and returned.
     If the credentials are incorrect, an HTTP 401 error is raised.
+    Too many attempts from one address, or failures against one email, are answered with
+    an HTTP 429 error before any database or password hashing work.
 
     Args:
+        `request` (Request): The incoming request.
         `form_data` (UserLogin): User login data (email and password).
         `session` (AsyncSession): Async database session for executing queries.
 
     Returns:
-        Token: Access token and token type
+        Token: Access token, token type and refresh token
     """
+    throttle = rate_limit.login_throttle
+    client_ip = request.client.host if request.client else None
+    retry_after = await throttle.check(client_ip, form_data.email)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
     user = await auth_service.authenticate_user(session, form_data.email, form_data.password)
     if not user:
         raise HTTPException(
@@ -73,10 +98,125 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token_expires = timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
-    access_token = auth_service.create_access_token(
-        data={"sub": str(user.id), "email": user.email},
-        expires_delta=access_token_expires,
-    )
+    await throttle.record_success(form_data.email)
+    return await token_service.issue_tokens(session, user)
+
+
+@router.post("/google", response_model=Token, responses=get_responses(401, 409, 503))
+async def google_login(
+    google_login: GoogleLogin,
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> Token:
+    """
+    Authenticate a user with a Google ID token and return a JWT access token.
+
+    The token is verified against Google's signing keys, which are cached in memory, so
+    most logins make no request to Google. A user is created on their first Google login.
+    An HTTP 409 error is raised if the email is already registered with a password.
+
+    Args:
+        `google_login` (GoogleLogin): The ID token from Google Sign-In.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        Token: Access token, token type and refresh token
+    """
+    if not settings.GOOGLE_CLIENT_ID:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Google login is not configured",
+        )
+    try:
+        identity = await google_auth.verify_google_id_token(
+            google_login.google_id_token, settings.GOOGLE_CLIENT_ID, google_auth.google_key_cache
+        )
+    except google_auth.SigningKeysUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Google login is temporarily unavailable",
+        )
+    except google_auth.GoogleTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Google ID token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    return Token.model_validate({"access_token": access_token, "token_type": "bearer"})
+    user = await user_service.get_user_by_google_id(session, identity.sub)
+    if not user:
+        username = identity.name or identity.email.split("@")[0]
+        try:
+            user = await user_service.create_user(
+                session,
+                UserCreate(email=identity.email, username=username, google_id=identity.sub),
+            )
+        except IntegrityError:
+            # A concurrent first login of the same account may have created the user
+            await session.rollback()
+            user = await user_service.get_user_by_google_id(session, identity.sub)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
+                )
+    return await token_service.issue_tokens(session, user)
+
+
+@router.post("/refresh", response_model=Token, responses=get_responses(401))
+async def refresh(
+    refresh_request: RefreshRequest,
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Each refresh token can be used once. Reusing one signs out the session it belongs to,
+    since it must have been stolen. An HTTP 401 error is raised for invalid, expired or
+    reused refresh tokens, and for inactive users.
+
+    Args:
+        `refresh_request` (RefreshRequest): The refresh token.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        Token: Access token, token type and refresh token
+    """
+    try:
+        return await token_service.rotate_refresh_token(session, refresh_request.refresh_token)
+    except token_service.RefreshTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_request: RefreshRequest,
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """
+    Sign out one session by revoking its refresh token.
+
+    Its access token stays valid until it expires, within `ACCESS_TOKEN_EXPIRE_MINUTES`.
+
+    Args:
+        `refresh_request` (RefreshRequest): The session's refresh token.
+        `session` (AsyncSession): Async database session for executing queries.
+    """
+    await token_service.revoke_refresh_token(session, refresh_request.refresh_token)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT, responses=get_responses(401))
+async def logout_all(
+    token_data: Annotated[TokenData, Depends(get_current_token_data)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """
+    Sign out every session of the current user, revoking their access and refresh tokens.
+
+    Args:
+        `token_data` (TokenData): The current user's verified access token.
+        `session` (AsyncSession): Async database session for executing queries.
+    """
+    await token_service.revoke_user_tokens(session, token_data.user_id)
@@ -5,30 +5,29 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from app.models.user import User
-from app.services import auth_service, user_service
+from app.models.user import TokenData, User
+from app.services import auth_service, token_service, user_service
 
 # HTTPBearer is used to extract the token from the Authorization header
 http_scheme = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    session: Annotated[AsyncSession, Depends(get_db)],
+async def get_current_token_data(
     http_credentials: Annotated[HTTPAuthorizationCredentials, Depends(http_scheme)],
-) -> User:
+) -> TokenData:
     """
-    FastAPI dependency to authenticate and retrieve the current user
-    based on the provided JWT token.
+    FastAPI dependency to verify the provided JWT token without reading the database.
+
+    Checks the token's signature and expiry, and that it was not revoked, in memory.
 
     Args:
-        `session`: Async database session for executing queries.
         `http_credentials`: The Bearer credentials extracted from the Authorization header.
 
     Returns:
-        The authenticated User object.
+        The verified token's data.
 
     Raises:
-        HTTPException: If the token is invalid, the user is not found, or the user is inactive.
+        HTTPException: If the token is missing, invalid or revoked.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,9 +46,37 @@ async def get_current_user(
     if token_data is None:
         raise credentials_exception
 
+    if token_service.revocations.is_revoked(token_data.user_id, token_data.issued_at):
+        raise credentials_exception
+
+    return token_data
+
+
+async def get_current_user(
+    session: Annotated[AsyncSession, Depends(get_db)],
+    token_data: Annotated[TokenData, Depends(get_current_token_data)],
+) -> User:
+    """
+    FastAPI dependency to authenticate and retrieve the current user
+    based on the provided JWT token.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `token_data`: The verified token's data.
+
+    Returns:
+        The authenticated User object.
+
+    Raises:
+        HTTPException: If the token is invalid, the user is not found, or the user is inactive.
+    """
     user = await user_service.get_user_by_id(session, token_data.user_id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
 
@@ -0,0 +1,180 @@
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_active_user
+from app.db.session import get_db
+from app.game.pack import GamePack
+from app.models.game import (
+    AnswerResult,
+    AnswerSubmit,
+    AnswerSyncBatch,
+    AnswerSyncResult,
+    Game,
+    GameRead,
+)
+from app.models.user import User
+from app.services import game_service
+from app.utils.body import PayloadTooLargeError, UnsupportedEncodingError, read_body
+from app.utils.responses import get_responses
+from app.utils.serialization import ModelResponse
+
+router = APIRouter(prefix="/games", tags=["games"])
+
+# Largest decompressed sync batch; a full batch of answers is well under this
+MAX_SYNC_BODY_BYTES = 1024 * 1024
+
+GameNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Game not found",
+)
+
+
+async def get_game(
+    game_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    _: Annotated[User, Depends(get_current_active_user)],
+) -> Game:
+    """
+    FastAPI dependency to retrieve a game by its unique ID.
+
+    Raises:
+        HTTPException: If the game does not exist.
+    """
+    game = await game_service.get_game_by_id(session, game_id)
+    if game is None:
+        raise GameNotFoundException
+    return game
+
+
+async def get_running_game_pack(
+    game: Annotated[Game, Depends(get_game)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> GamePack:
+    """
+    FastAPI dependency to retrieve the compiled pack of a game that is still running.
+
+    Raises:
+        HTTPException: If the game has ended or its quiz version is no longer available.
+    """
+    if game.ended_at is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Game has ended")
+    pack = await game_service.get_game_pack_for_game(session, game)
+    if pack is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Quiz version expired")
+    return pack
+
+
+@router.post(
+    "/sync", response_model=AnswerSyncResult, responses=get_responses(400, 401, 403, 413, 415)
+)
+async def sync_answers(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> AnswerSyncResult:
+    """
+    Sync a batch of answers the current user gave while offline.
+
+    The body is an `AnswerSyncBatch` as JSON, optionally sent with `Content-Encoding: gzip`
+    or `deflate`. Each answer carries a client-generated idempotency key, so the same batch
+    can be retried safely after a lost response.
+
+    Args:
+        `request` (Request): The incoming request, whose body holds the batch.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        AnswerSyncResult: Whether each answer was accepted, a duplicate, or rejected.
+    """
+    try:
+        body = await read_body(request, MAX_SYNC_BODY_BYTES)
+    except PayloadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Batch is too large"
+        )
+    except UnsupportedEncodingError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        batch = AnswerSyncBatch.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+    results = await game_service.sync_answers(session, current_user.id, batch.items)
+    return AnswerSyncResult(results=results)
+
+
+@router.post(
+    "/{game_id}/answers",
+    response_model=AnswerResult,
+    status_code=status.HTTP_201_CREATED,
+    responses=get_responses(400, 401, 403, 404, 409),
+)
+async def submit_answer(
+    answer: AnswerSubmit,
+    game: Annotated[Game, Depends(get_game)],
+    pack: Annotated[GamePack, Depends(get_running_game_pack)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> Response:
+    """
+    Submit the current user's answer to a question of a running game.
+
+    Args:
+        `answer` (AnswerSubmit): Question index, answer and time taken.
+        `game` (Game): The running game, provided by the dependency.
+        `pack` (GamePack): The compiled quiz version of the game, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        AnswerResult: Whether the answer is correct and the points it earned.
+    """
+    if answer.question_index >= pack.question_count:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No such question")
+    try:
+        stored = await game_service.submit_answer(session, game, pack, current_user.id, answer)
+    except game_service.GameEndedError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Game has ended")
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already answered")
+    result = AnswerResult(
+        question_index=stored.question_index, is_correct=stored.is_correct, points=stored.points
+    )
+    return ModelResponse(result, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/{game_id}/finish", response_model=GameRead, responses=get_responses(401, 403, 404, 409)
+)
+async def finish_game(
+    game: Annotated[Game, Depends(get_game)],
+    pack: Annotated[GamePack, Depends(get_running_game_pack)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> GameRead:
+    """
+    End a running game hosted by the current user and update the quiz analytics.
+
+    Args:
+        `game` (Game): The running game, provided by the dependency.
+        `pack` (GamePack): The compiled quiz version of the game, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        GameRead: The finished game.
+    """
+    if game.host_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not the game host")
+    game = await game_service.finish_game(session, game, pack)
+    return GameRead.model_validate({**game.model_dump(), "question_count": pack.question_count})
@@ -0,0 +1,180 @@
+import uuid
+from typing import Annotated, AsyncContextManager, Callable, Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Path, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_active_user
+from app.core.config import settings
+from app.db.session import get_db, get_session_factory
+from app.ingestion import UnsupportedDocumentError
+from app.models.generation import (
+    DocumentIngestionRead,
+    GenerationJob,
+    GenerationJobRead,
+    GenerationRequest,
+    JobStatus,
+)
+from app.models.quiz import QuestionType
+from app.models.user import User
+from app.services import generation_service, ingestion_service
+from app.utils.responses import get_responses
+from app.utils.serialization import ModelResponse
+
+router = APIRouter(prefix="/generations", tags=["generations"])
+
+# Allowance for the multipart framing and form fields around an uploaded document
+SPOOL_SLACK_BYTES = 64 * 1024
+
+JobNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Generation job not found",
+)
+
+DocumentTooLargeException = HTTPException(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail="Document is too large",
+)
+
+
+async def get_owned_job(
+    job_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> GenerationJob:
+    """
+    FastAPI dependency to retrieve a generation job requested by the current user.
+
+    Raises:
+        HTTPException: If the job does not exist or belongs to another user.
+    """
+    job = await generation_service.get_job(session, job_id)
+    if job is None or job.owner_id != current_user.id:
+        raise JobNotFoundException
+    return job
+
+
+@router.post(
+    "/",
+    response_model=GenerationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses=get_responses(401, 403),
+)
+async def submit_generation(
+    request: GenerationRequest,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> GenerationJobRead:
+    """
+    Request an AI-generated quiz. The quiz is generated in the background.
+
+    Identical requests are answered from the cache, with the job already succeeded.
+
+    Args:
+        `request` (GenerationRequest): Topic, optional source material and question settings.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        GenerationJobRead: The job, to poll or follow until it completes.
+    """
+    job = await generation_service.submit_job(session, current_user.id, request)
+    if job.status == JobStatus.QUEUED:
+        generation_service.generation_queue.enqueue(job.id)
+    return GenerationJobRead.model_validate(job)
+
+
+@router.post(
+    "/documents",
+    response_model=DocumentIngestionRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses=get_responses(401, 403, 413, 415),
+)
+async def submit_document_generation(
+    request: Request,
+    file: Annotated[UploadFile, File()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    topic: Annotated[Optional[str], Form(max_length=2000)] = None,
+    questions_per_chunk: Annotated[int, Form(ge=1, le=30)] = 5,
+    question_type: Annotated[Optional[QuestionType], Form()] = None,
+) -> DocumentIngestionRead:
+    """
+    Upload a PDF, DOCX or text document and generate quizzes from its content.
+
+    The document is split into chunks and one generation job is submitted per chunk.
+
+    Args:
+        `request` (Request): The incoming request, used to reject oversized uploads early.
+        `file` (UploadFile): The document.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+        `topic` (Optional[str]): What the quizzes are about; defaults to the file name.
+        `questions_per_chunk` (int): Number of questions to generate from each chunk.
+        `question_type` (Optional[QuestionType]): Restrict questions to one type.
+
+    Returns:
+        DocumentIngestionRead: The extraction summary and the submitted jobs.
+    """
+    max_bytes = settings.INGESTION_MAX_UPLOAD_MB * 1024 * 1024
+    if int(request.headers.get("content-length") or 0) > max_bytes + SPOOL_SLACK_BYTES:
+        raise DocumentTooLargeException
+    try:
+        return await ingestion_service.ingest_document(
+            session, current_user.id, file, topic, questions_per_chunk, question_type
+        )
+    except ingestion_service.DocumentTooLargeError:
+        raise DocumentTooLargeException
+    except UnsupportedDocumentError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=GenerationJobRead, responses=get_responses(401, 403, 404))
+async def read_generation(
+    job: Annotated[GenerationJob, Depends(get_owned_job)],
+) -> Response:
+    """
+    Poll a generation job requested by the current user.
+
+    Args:
+        `job` (GenerationJob): The job, provided by the dependency.
+
+    Returns:
+        GenerationJobRead: The job's status, progress and, once succeeded, the quiz.
+    """
+    return ModelResponse(GenerationJobRead.model_validate(job))
+
+
+@router.get(
+    "/{job_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Job progress events"},
+        **get_responses(401, 403, 404),
+    },
+)
+async def stream_generation(
+    job: Annotated[GenerationJob, Depends(get_owned_job)],
+    session_factory: Annotated[
+        Callable[[], AsyncContextManager[AsyncSession]], Depends(get_session_factory)
+    ],
+) -> StreamingResponse:
+    """
+    Follow the progress of a generation job as Server-Sent Events.
+
+    The stream ends once the job has succeeded or failed. It opens its own sessions, as the
+    request's session is closed once the response has started.
+
+    Args:
+        `job` (GenerationJob): The job, provided by the dependency.
+        `session_factory`: Opens the stream's database sessions, provided by the dependency.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    return StreamingResponse(
+        generation_service.stream_job_events(job.id, session_factory),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
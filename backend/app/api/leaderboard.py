@@ -0,0 +1,58 @@
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_active_user
+from app.db.session import get_db
+from app.models.leaderboard import MAX_LEADERBOARD_SIZE, Leaderboard, LeaderboardEntry
+from app.models.user import User
+from app.services import leaderboard_service
+from app.utils.responses import get_responses
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+@router.get("/", response_model=Leaderboard, responses=get_responses(401, 403))
+async def read_leaderboard(
+    session: Annotated[AsyncSession, Depends(get_db)],
+    _: Annotated[User, Depends(get_current_active_user)],
+    limit: Annotated[int, Query(ge=1, le=MAX_LEADERBOARD_SIZE)] = 10,
+) -> Leaderboard:
+    """
+    Read the top players by points across every game played.
+
+    Args:
+        `session` (AsyncSession): Async database session for executing queries.
+        `limit` (int): Number of players to return.
+
+    Returns:
+        Leaderboard: The leading players, best first.
+    """
+    return await leaderboard_service.get_leaderboard(session, None, limit)
+
+
+@router.get("/{user_id}", response_model=LeaderboardEntry, responses=get_responses(401, 403, 404))
+async def read_leaderboard_entry(
+    user_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    _: Annotated[User, Depends(get_current_active_user)],
+) -> LeaderboardEntry:
+    """
+    Read a player's rank on the global leaderboard.
+
+    Args:
+        `user_id` (uuid.UUID): UUID of the player.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        LeaderboardEntry: The player's rank and points.
+
+    Raises:
+        HTTPException: If the player has not finished a game.
+    """
+    entry = await leaderboard_service.get_player_rank(session, None, user_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not ranked")
+    return entry
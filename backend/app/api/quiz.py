@@ -0,0 +1,397 @@
+import uuid
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_active_user
+from app.db.session import get_db
+from app.game.pack import content_hash
+from app.models.analytics import QuizAnalytics
+from app.models.export import PaperSize, WorksheetOptions
+from app.models.game import GameRead
+from app.models.leaderboard import MAX_LEADERBOARD_SIZE, Leaderboard, LeaderboardEntry
+from app.models.quiz import (
+    Quiz,
+    QuizCommentCreate,
+    QuizCommentRead,
+    QuizContent,
+    QuizCreate,
+    QuizRatingCreate,
+    QuizRatingRead,
+    QuizRead,
+    QuizSearchPage,
+)
+from app.models.user import User
+from app.services import (
+    analytics_service,
+    export_service,
+    game_service,
+    leaderboard_service,
+    quiz_service,
+    quiz_stats_service,
+)
+from app.utils.http_cache import conditional_response, response_cache
+from app.utils.pagination import InvalidCursorError, PageParams, page_params
+from app.utils.responses import InvalidCursorException, get_responses
+from app.utils.serialization import ModelResponse, dump_model
+
+router = APIRouter(prefix="/quizzes", tags=["quizzes"])
+
+# How long a rendered quiz is kept; entries are checked against the row's ETag before use
+QUIZ_CACHE_TTL_SECONDS = 300
+
+QuizNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Quiz not found",
+)
+
+
+async def get_owned_quiz(
+    quiz_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> Quiz:
+    """
+    FastAPI dependency to retrieve a quiz owned by the current user.
+
+    Raises:
+        HTTPException: If the quiz does not exist or belongs to another user.
+    """
+    quiz = await quiz_service.get_quiz_by_id(session, quiz_id)
+    if quiz is None:
+        raise QuizNotFoundException
+    if quiz.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not the quiz owner")
+    return quiz
+
+
+async def get_visible_quiz(
+    quiz_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> Quiz:
+    """
+    FastAPI dependency to retrieve a quiz that is public or owned by the current user.
+
+    Raises:
+        HTTPException: If the quiz does not exist or is private to another user.
+    """
+    quiz = await quiz_service.get_quiz_by_id(session, quiz_id)
+    if quiz is None or (not quiz.is_public and quiz.owner_id != current_user.id):
+        raise QuizNotFoundException
+    return quiz
+
+
+def worksheet_options(
+    paper: Annotated[PaperSize, Query()] = PaperSize.A4,
+    font_size: Annotated[int, Query(ge=9, le=16)] = 11,
+    include_answers: Annotated[bool, Query()] = False,
+) -> WorksheetOptions:
+    """
+    FastAPI dependency to read the worksheet formatting options from the query string.
+    """
+    return WorksheetOptions(paper=paper, font_size=font_size, include_answers=include_answers)
+
+
+@router.post(
+    "/",
+    response_model=QuizRead,
+    status_code=status.HTTP_201_CREATED,
+    responses=get_responses(401, 403),
+)
+async def create_quiz(
+    quiz_create: QuizCreate,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> QuizRead:
+    """
+    Create a new quiz owned by the current user.
+
+    Args:
+        `quiz_create` (QuizCreate): Quiz content, tags and visibility.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        QuizRead: The newly created quiz.
+    """
+    quiz = await quiz_service.create_quiz(session, current_user.id, quiz_create)
+    return QuizRead.model_validate(quiz)
+
+
+@router.get("/", response_model=QuizSearchPage, responses=get_responses(400, 401, 403))
+async def search_quizzes(
+    session: Annotated[AsyncSession, Depends(get_db)],
+    _: Annotated[User, Depends(get_current_active_user)],
+    page: Annotated[PageParams, Depends(page_params)],
+    q: Annotated[Optional[str], Query(max_length=200, description="Search terms")] = None,
+    tags: Annotated[Optional[list[str]], Query(description="Required tags")] = None,
+    min_rating: Annotated[Optional[float], Query(ge=0, le=5)] = None,
+) -> Response:
+    """
+    Browse and search public quizzes for the community dashboard.
+
+    Quiz titles, descriptions and question text are searched with full-text search and
+    ranked by relevance. Without search terms, the newest quizzes are returned first.
+
+    Args:
+        `session` (AsyncSession): Async database session for executing queries.
+        `page` (PageParams): Page size and cursor returned with the previous page.
+        `q` (str): Optional search terms.
+        `tags` (list[str]): Only return quizzes carrying all of these tags.
+        `min_rating` (float): Only return quizzes with at least this average rating.
+
+    Returns:
+        QuizSearchPage: The matching quizzes and the cursor for the next page.
+    """
+    try:
+        return ModelResponse(await quiz_service.search_quizzes(session, q, tags, min_rating, page))
+    except InvalidCursorError:
+        raise InvalidCursorException
+
+
+@router.get("/{quiz_id}", response_model=QuizRead, responses=get_responses(304, 401, 403, 404))
+async def read_quiz(request: Request, quiz: Annotated[Quiz, Depends(get_owned_quiz)]) -> Response:
+    """
+    Retrieve a quiz, including its answers, by its unique ID.
+
+    Only the quiz owner can read the full quiz. Answers 304 Not Modified when
+    `If-None-Match` holds the current ETag, and reuses the cached body while the quiz is
+    unchanged.
+
+    Args:
+        `request` (Request): The incoming request.
+        `quiz` (Quiz): The requested quiz, provided by the dependency.
+
+    Returns:
+        QuizRead: The full quiz.
+    """
+    etag = quiz_service.quiz_etag(quiz)
+    return conditional_response(
+        request,
+        etag,
+        lambda: response_cache.render(
+            quiz_service.QUIZ_CACHE_NAMESPACE,
+            quiz.id,
+            etag,
+            lambda: dump_model(QuizRead.model_validate(quiz)),
+            QUIZ_CACHE_TTL_SECONDS,
+        ),
+    )
+
+
+@router.put("/{quiz_id}", response_model=QuizRead, responses=get_responses(401, 403, 404))
+async def update_quiz(
+    quiz_update: QuizCreate,
+    quiz: Annotated[Quiz, Depends(get_owned_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> QuizRead:
+    """
+    Replace the content of a quiz owned by the current user.
+
+    Each update creates a new quiz version.
+
+    Args:
+        `quiz_update` (QuizCreate): New quiz content, tags and visibility.
+        `quiz` (Quiz): The quiz to update, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        QuizRead: The updated quiz.
+    """
+    quiz = await quiz_service.update_quiz(session, quiz, quiz_update)
+    return QuizRead.model_validate(quiz)
+
+
+@router.put(
+    "/{quiz_id}/rating", response_model=QuizRatingRead, responses=get_responses(401, 403, 404)
+)
+async def rate_quiz(
+    rating: QuizRatingCreate,
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> QuizRatingRead:
+    """
+    Rate a quiz from 1 to 5, replacing the current user's previous rating if any.
+
+    Args:
+        `rating` (QuizRatingCreate): The rating score.
+        `quiz` (Quiz): The rated quiz, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        QuizRatingRead: The stored rating.
+    """
+    stored = await quiz_stats_service.rate_quiz(session, quiz.id, current_user.id, rating.score)
+    return QuizRatingRead.model_validate(stored)
+
+
+@router.post(
+    "/{quiz_id}/comments",
+    response_model=QuizCommentRead,
+    status_code=status.HTTP_201_CREATED,
+    responses=get_responses(401, 403, 404),
+)
+async def add_comment(
+    comment: QuizCommentCreate,
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> QuizCommentRead:
+    """
+    Comment on a quiz.
+
+    Args:
+        `comment` (QuizCommentCreate): The comment text.
+        `quiz` (Quiz): The commented quiz, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        QuizCommentRead: The new comment.
+    """
+    stored = await quiz_stats_service.add_comment(session, quiz.id, current_user.id, comment.body)
+    return QuizCommentRead.model_validate(stored)
+
+
+@router.post(
+    "/{quiz_id}/games",
+    response_model=GameRead,
+    status_code=status.HTTP_201_CREATED,
+    responses=get_responses(401, 403, 404),
+)
+async def start_game(
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> GameRead:
+    """
+    Start a new game of a quiz hosted by the current user.
+
+    Args:
+        `quiz` (Quiz): The quiz to play, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        GameRead: The new game.
+    """
+    game, pack = await game_service.start_game(session, quiz, current_user.id)
+    return GameRead.model_validate({**game.model_dump(), "question_count": pack.question_count})
+
+
+@router.get(
+    "/{quiz_id}/analytics",
+    response_model=QuizAnalytics,
+    responses=get_responses(401, 403, 404),
+)
+async def read_quiz_analytics(
+    quiz: Annotated[Quiz, Depends(get_owned_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> QuizAnalytics:
+    """
+    Read the per-question and per-player analytics of the current version of an owned quiz.
+
+    Args:
+        `quiz` (Quiz): The quiz to analyse, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        QuizAnalytics: Analytics aggregated over every finished game of this quiz version.
+    """
+    digest = content_hash(QuizContent.model_validate(quiz))
+    return await analytics_service.get_quiz_analytics(session, quiz.id, digest)
+
+
+@router.get(
+    "/{quiz_id}/leaderboard", response_model=Leaderboard, responses=get_responses(401, 403, 404)
+)
+async def read_quiz_leaderboard(
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    limit: Annotated[int, Query(ge=1, le=MAX_LEADERBOARD_SIZE)] = 10,
+) -> Leaderboard:
+    """
+    Read the top players of a public or owned quiz, by points across all its games.
+
+    Args:
+        `quiz` (Quiz): The quiz, provided by the dependency.
+        `session` (AsyncSession): Async database session for executing queries.
+        `limit` (int): Number of players to return.
+
+    Returns:
+        Leaderboard: The leading players, best first.
+    """
+    return await leaderboard_service.get_leaderboard(session, quiz.id, limit)
+
+
+@router.get(
+    "/{quiz_id}/leaderboard/{user_id}",
+    response_model=LeaderboardEntry,
+    responses=get_responses(401, 403, 404),
+)
+async def read_quiz_leaderboard_entry(
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    user_id: Annotated[uuid.UUID, Path()],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> LeaderboardEntry:
+    """
+    Read a player's rank on a public or owned quiz's leaderboard.
+
+    Args:
+        `quiz` (Quiz): The quiz, provided by the dependency.
+        `user_id` (uuid.UUID): UUID of the player.
+        `session` (AsyncSession): Async database session for executing queries.
+
+    Returns:
+        LeaderboardEntry: The player's rank and points.
+
+    Raises:
+        HTTPException: If the player has not finished a game of this quiz.
+    """
+    entry = await leaderboard_service.get_player_rank(session, quiz.id, user_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not ranked")
+    return entry
+
+
+@router.get(
+    "/{quiz_id}/worksheet.pdf",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/pdf": {}}, "description": "The worksheet PDF"},
+        **get_responses(401, 403, 404),
+    },
+)
+async def download_worksheet(
+    quiz: Annotated[Quiz, Depends(get_visible_quiz)],
+    options: Annotated[WorksheetOptions, Depends(worksheet_options)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> StreamingResponse:
+    """
+    Download a printable PDF worksheet of a quiz.
+
+    Worksheets are rendered in worker processes and cached per quiz version and options.
+
+    Args:
+        `quiz` (Quiz): The quiz to print, provided by the dependency.
+        `options` (WorksheetOptions): Paper size, font size and whether to add an answer key.
+        `current_user` (User): Current authenticated active user, provided by the dependency.
+
+    Returns:
+        StreamingResponse: The PDF file.
+    """
+    if options.include_answers and quiz.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Only the owner can export answers"
+        )
+    file = await export_service.get_worksheet(QuizContent.model_validate(quiz), options)
+    return StreamingResponse(
+        export_service.iter_file(file),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="quiz-{quiz.id}.pdf"'},
+    )
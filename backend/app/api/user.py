@@ -1,7 +1,7 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,49 +9,89 @@ from app.api.dependencies import get_current_active_user
 from app.db.session import get_db
 from app.models.user import User, UserRead
 from app.services import user_service
+from app.utils.http_cache import conditional_response, response_cache
 from app.utils.responses import get_responses
+from app.utils.serialization import dump_model
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# How long a user looked up by id or email is served from memory without reading the database
+USER_CACHE_TTL_SECONDS = 60
+
 UserNotFoundException = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail="User not found",
 )
 
 
+def cached_user_response(request: Request, user: User) -> Response:
+    """
+    Render a user's `UserRead`, caching the body under both the user's id and email.
+    """
+    etag = user_service.user_etag(user)
+
+    def render() -> bytes:
+        body = response_cache.render(
+            user_service.USER_CACHE_NAMESPACE,
+            user.id,
+            etag,
+            lambda: dump_model(UserRead.model_validate(user)),
+            USER_CACHE_TTL_SECONDS,
+        )
+        response_cache.put(
+            user_service.USER_CACHE_NAMESPACE,
+            ("email", user.email),
+            etag,
+            body,
+            USER_CACHE_TTL_SECONDS,
+        )
+        return body
+
+    return conditional_response(request, etag, render)
+
+
 @router.get(
     "/me",
     response_model=UserRead,
     summary="Read currently logged in user",
-    responses=get_responses(401, 403),
+    responses=get_responses(304, 401, 403),
 )
-async def read_user_me(current_user: Annotated[User, Depends(get_current_active_user)]) -> UserRead:
+async def read_user_me(
+    request: Request, current_user: Annotated[User, Depends(get_current_active_user)]
+) -> Response:
     """
     Retrieve the current authenticated user's information.
 
     This endpoint allows the currently authenticated user to fetch their own user details.
     It uses the `get_current_active_user` dependency to ensure the user is authenticated.
+    Answers 304 Not Modified when `If-None-Match` holds the current ETag.
 
     Args:
+        `request` (Request): The incoming request.
         `current_user` (User): Current authenticated active user, provided by the dependency
 
     Returns:
         UserRead: The authenticated user's information including id, username, email,
         active status, and created timestamp.
     """
-    return UserRead.model_validate(current_user)
+    return cached_user_response(request, current_user)
 
 
-@router.get("/{user_id}", response_model=UserRead, responses=get_responses(401, 403, 404))
+@router.get("/{user_id}", response_model=UserRead, responses=get_responses(304, 401, 403, 404))
 async def read_user_by_id(
+    request: Request,
     user_id: Annotated[uuid.UUID, Path()],
     session: Annotated[AsyncSession, Depends(get_db)],
     _: Annotated[User, Depends(get_current_active_user)],
-) -> UserRead:
+) -> Response:
     """
     Retrieve a user's information by their unique user ID.
 
+    Recently read users are served from the response cache. Answers 304 Not Modified when
+    `If-None-Match` holds the current ETag.
+
     Args:
+        `request` (Request): The incoming request.
         `user_id` (uuid.UUID): Unique identifier of the user to retrieve.
         `session` (AsyncSession): Async database session for executing queries.
 
@@ -59,22 +99,31 @@ async def read_user_by_id(
         UserRead: The requested user's information including id, username, email,
         active status, and created timestamp.
     """
+    cached = response_cache.get(user_service.USER_CACHE_NAMESPACE, user_id)
+    if cached is not None:
+        return conditional_response(request, cached.etag, lambda: cached.body)
+
     user = await user_service.get_user_by_id(session, user_id)
     if not user:
         raise UserNotFoundException
-    return UserRead.model_validate(user)
+    return cached_user_response(request, user)
 
 
-@router.get("/", response_model=UserRead, responses=get_responses(401, 403, 404))
+@router.get("/", response_model=UserRead, responses=get_responses(304, 401, 403, 404))
 async def read_user_by_email(
+    request: Request,
     email: Annotated[EmailStr, Query(description="User email address")],
     session: Annotated[AsyncSession, Depends(get_db)],
     _: Annotated[User, Depends(get_current_active_user)],
-) -> UserRead:
+) -> Response:
     """
     Retrieve a user's information by their unique email address.
 
+    Recently read users are served from the response cache. Answers 304 Not Modified when
+    `If-None-Match` holds the current ETag.
+
     Args:
+        `request` (Request): The incoming request.
         `email` (str): Email address of the user to retrieve.
         `session` (AsyncSession): Async database session for executing queries.
         _ (User): Current authenticated active user, provided by the dependency.
@@ -82,7 +131,12 @@ async def read_user_by_email(
     Returns:
         UserRead object containing the user's information.
     """
+    key = ("email", email.strip().lower())
+    cached = response_cache.get(user_service.USER_CACHE_NAMESPACE, key)
+    if cached is not None:
+        return conditional_response(request, cached.etag, lambda: cached.body)
+
     user = await user_service.get_user_by_email(session, email)
     if not user:
         raise UserNotFoundException
-    return UserRead.model_validate(user)
+    return cached_user_response(request, user)
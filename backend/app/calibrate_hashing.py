@@ -0,0 +1,162 @@
+"""
+Pick password hashing cost parameters for the machine this runs on.
+
+Usage (from `backend/`, on the deployment hardware, while it is otherwise idle):
+    python -m app.calibrate_hashing --target-ms 250
+    python -m app.calibrate_hashing --scheme argon2 --option memory_cost=65536 --target-ms 100
+
+Prints the `PASSWORD_HASH_*` settings that make one password verification take as long as
+possible without exceeding the target. Existing hashes are upgraded to the new cost as
+users log in.
+"""
+
+import argparse
+import math
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from app.core.config import settings
+from app.utils.serialization import dumps
+
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+# Rounds are never pushed past this many doublings of a log2 cost in one step, so a noisy
+# first measurement cannot jump to a cost that takes minutes to measure
+MAX_LOG2_STEP = 4
+MAX_ITERATIONS = 8
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """
+    Attributes:
+        `scheme` (str): The passlib scheme.
+        `options` (dict[str, int]): Cost parameters, including the calibrated `rounds`.
+        `verify_seconds` (float): Median time of one verification with those parameters.
+    """
+
+    scheme: str
+    options: dict[str, int]
+    verify_seconds: float
+
+
+def time_verify(
+    scheme: str, options: Mapping[str, int], samples: int, password: str = SAMPLE_PASSWORD
+) -> float:
+    """
+    Measure the median time of verifying a password hashed with the given parameters.
+    """
+    context = CryptContext(
+        schemes=[scheme], **{f"{scheme}__{name}": value for name, value in options.items()}
+    )
+    hashed = context.hash(password)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(password, hashed)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(
+    scheme: str,
+    target_seconds: float,
+    fixed_options: Optional[Mapping[str, int]] = None,
+    samples: int = 5,
+) -> Calibration:
+    """
+    Find the highest `rounds` whose verification time stays within a target.
+
+    Uses the scheme's cost model: each extra round doubles the work of log2 schemes
+    (bcrypt, scrypt) and adds a constant amount to linear ones (argon2, pbkdf2).
+
+    Args:
+        `scheme`: passlib scheme name.
+        `target_seconds`: Longest acceptable verification time.
+        `fixed_options`: Other cost parameters to keep, such as argon2's `memory_cost`.
+        `samples`: Verifications timed per candidate.
+
+    Returns:
+        The calibrated parameters; the scheme's minimum rounds if even those are too slow.
+
+    Raises:
+        KeyError: If passlib does not know the scheme.
+        ValueError: If the scheme has no rounds parameter.
+    """
+    handler = get_crypt_handler(scheme)
+    if not hasattr(handler, "rounds_cost"):
+        raise ValueError(f"{scheme} has no cost parameter to calibrate")
+    log2 = handler.rounds_cost == "log2"
+    min_rounds, max_rounds = handler.min_rounds, handler.max_rounds or sys.maxsize
+    fixed = dict(fixed_options or {})
+
+    # Start below the default of log2 schemes, which may already take a second
+    start = handler.default_rounds - MAX_LOG2_STEP if log2 else handler.default_rounds
+    rounds = max(min_rounds, start)
+    measured: dict[int, float] = {}
+    for _ in range(MAX_ITERATIONS):
+        if rounds in measured:
+            break
+        elapsed = measured[rounds] = time_verify(scheme, {**fixed, "rounds": rounds}, samples)
+        if log2:
+            step = math.floor(math.log2(target_seconds / elapsed))
+            estimate = rounds + max(-MAX_LOG2_STEP, min(step, MAX_LOG2_STEP))
+        else:
+            estimate = math.floor(rounds * target_seconds / elapsed)
+        rounds = max(min_rounds, min(estimate, max_rounds))
+
+    within = [r for r, elapsed in measured.items() if elapsed <= target_seconds]
+    best = max(within) if within else min_rounds
+    if best not in measured:
+        measured[best] = time_verify(scheme, {**fixed, "rounds": best}, samples)
+    return Calibration(
+        scheme=scheme, options={**fixed, "rounds": best}, verify_seconds=measured[best]
+    )
+
+
+def parse_option(value: str) -> tuple[str, int]:
+    name, _, number = value.partition("=")
+    try:
+        return name, int(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected name=integer, got {value!r}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost.")
+    parser.add_argument("--scheme", default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument(
+        "--option",
+        type=parse_option,
+        action="append",
+        default=[],
+        help="other cost parameter to keep fixed, as name=value",
+    )
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = calibrate(args.scheme, args.target_ms / 1000, dict(args.option), args.samples)
+    workers = settings.PASSWORD_HASH_WORKERS
+    print(
+        f"{result.scheme} with {result.options} verifies in "
+        f"{result.verify_seconds * 1000:.1f} ms on this machine; with "
+        f"PASSWORD_HASH_WORKERS={workers} and as many free cores, a process handles about "
+        f"{workers / result.verify_seconds:.0f} logins per second.\n"
+    )
+    print(f"PASSWORD_HASH_SCHEME={result.scheme}")
+    print(f"PASSWORD_HASH_OPTIONS={dumps(result.options).decode()}")
+    if result.scheme != settings.PASSWORD_HASH_SCHEME:
+        legacy = [settings.PASSWORD_HASH_SCHEME, *settings.PASSWORD_HASH_LEGACY_SCHEMES]
+        print(f"PASSWORD_HASH_LEGACY_SCHEMES={dumps(legacy).decode()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,12 +18,68 @@ class Settings(BaseSettings):
         `POSTGRES_DB` (Optional[str]): The PostgreSQL database name.
         `SECRET_KEY` (str): The secret key for security purposes.
         `ALGORITHM` (str): The algorithm used for security, default is "HS256".
-        `ACCESS_TOKEN_EXPIRE_DAYS` (int): The number of days before an access token expires,\
+        `ACCESS_TOKEN_EXPIRE_MINUTES` (int): The number of minutes before an access token \
+            expires, default is 15 minutes.
+        `REFRESH_TOKEN_EXPIRE_DAYS` (int): The number of days a refresh token may be used, \
             default is 30 days.
+        `TOKEN_REVOCATION_SYNC_SECONDS` (float): Interval at which each worker reloads \
+            access token revocations made by other workers, default is 5 seconds.
+        `PASSWORD_HASH_WORKERS` (int): Number of threads hashing and verifying passwords, \
+            default is 4.
+        `PASSWORD_HASH_SCHEME` (str): passlib scheme new passwords are hashed with, such as \
+            "bcrypt", "scrypt" or "argon2", default is "bcrypt".
+        `PASSWORD_HASH_OPTIONS` (dict[str, int]): Cost parameters of the scheme, default is \
+            {"rounds": 12}; pick them with `python -m app.calibrate_hashing`.
+        `PASSWORD_HASH_LEGACY_SCHEMES` (list[str]): Schemes still accepted at login, whose \
+            hashes are upgraded to the current scheme on the next successful login.
+        `LOGIN_ATTEMPTS_PER_IP` (int): Login attempts allowed per client address in \
+            `LOGIN_IP_WINDOW_SECONDS`, 0 to disable, default is 20 per 60 seconds.
+        `LOGIN_FAILURES_PER_EMAIL` (int): Login attempts allowed per email in \
+            `LOGIN_EMAIL_WINDOW_SECONDS`, counted before the password is checked and \
+            cleared by a successful login; 0 to disable, default is 5 per 300 seconds.
+        `THROTTLE_REDIS_URL` (Optional[str]): Redis URL where login attempts are counted, \
+            shared by all workers; counted per process when unset.
         `GOOGLE_CLIENT_ID` (Optional[str]): The Google OAuth client ID.
         `GOOGLE_CLIENT_SECRET` (Optional[str]): The Google OAuth client secret.
+        `GOOGLE_CERTS_URL` (str): URL of the keys Google signs ID tokens with.
         `CORS_ORIGINS` (list[str]): A list of allowed CORS origins.
         `GOOGLE_API_KEY` (Optional[str]): The Google API key for AI/ML services.
+        `AI_PROVIDER` (str): Model provider for quiz generation, "gemini" or "fake" for a \
+            local stand-in, default is "gemini".
+        `AI_MODEL` (str): Name of the model used for quiz generation.
+        `GENERATION_WORKERS` (int): Number of concurrent generation jobs per process, \
+            default is 4.
+        `GENERATION_TIMEOUT_SECONDS` (float): Time limit of one generation, default is 120.
+        `GENERATION_CACHE_TTL_HOURS` (int): How long a generated quiz is reused for an \
+            identical request, default is 7 days.
+        `GENERATION_POLL_INTERVAL_SECONDS` (float): How often progress streams re-read their \
+            job, default is 1 second.
+        `COUNTER_FLUSH_INTERVAL_SECONDS` (float): How often buffered quiz counter changes \
+            (plays, ratings, comments) are written to the database, default is 5 seconds.
+        `INGESTION_MAX_UPLOAD_MB` (int): Largest document accepted for quiz generation, \
+            default is 50 MB.
+        `INGESTION_CHUNK_CHARS` (int): Target size of the document chunks sent to the model, \
+            default is 12000 characters.
+        `INGESTION_MAX_CHUNKS` (int): Most chunks generated from one document, default is 20.
+        `EXPORT_CACHE_DIR` (str): Directory where rendered worksheet PDFs are cached, default is \
+            a "doqu-exports" folder in the system temporary directory.
+        `EXPORT_CACHE_MAX_MB` (int): Maximum total size of the export cache, default is 512 MB.
+        `EXPORT_WORKERS` (int): Number of worker processes rendering exports, default is 2.
+        `RESPONSE_CACHE_ENABLED` (bool): Whether rendered read responses are cached in \
+            memory, default is True.
+        `RESPONSE_CACHE_MAX_ENTRIES` (int): Most responses cached per process, default is 10000.
+        `METRICS_ENABLED` (bool): Whether request metrics are recorded and served at \
+            `/metrics`, default is True.
+        `LOG_LEVEL` (str): Level of the root logger, default is "INFO".
+        `LOG_LEVELS` (dict[str, str]): Levels of individual loggers, such as \
+            {"app.services.generation_service": "DEBUG"}.
+        `LOG_FORMAT` (str): "json" for one JSON object per line, or "text", default is "json".
+        `LOG_SAMPLE_RATES` (dict[str, float]): Fraction of records kept for high-volume \
+            events, by the `event` field of the record, default keeps 1% of socket connects \
+            and disconnects.
+        `LOG_QUEUE_SIZE` (int): Most records waiting to be written before new ones are \
+            dropped, default is 10000.
+        `DB_ECHO` (bool): Whether every SQL statement is logged, default is False.
         `model_config` (SettingsConfigDict): Configuration for the Pydantic model, including the \
             environment file and extra settings.
     """
@@ -35,17 +93,72 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_DAYS: int = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_HASH_OPTIONS: dict[str, int] = {"rounds": 12}
+    PASSWORD_HASH_LEGACY_SCHEMES: list[str] = []
+
+    # Login throttling
+    LOGIN_ATTEMPTS_PER_IP: int = 20
+    LOGIN_IP_WINDOW_SECONDS: float = 60.0
+    LOGIN_FAILURES_PER_EMAIL: int = 5
+    LOGIN_EMAIL_WINDOW_SECONDS: float = 300.0
+    THROTTLE_REDIS_URL: Optional[str] = None
 
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
 
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:3001"]
 
     # AI/ML
     GOOGLE_API_KEY: Optional[str] = None
+    AI_PROVIDER: str = "gemini"
+    AI_MODEL: str = "gemini-1.5-flash"
+    GENERATION_WORKERS: int = 4
+    GENERATION_TIMEOUT_SECONDS: float = 120.0
+    GENERATION_CACHE_TTL_HOURS: int = 24 * 7
+    GENERATION_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # Game history partitions (months; a retention of 0 keeps everything)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 3600.0
+    GAME_ANSWERS_RETENTION_MONTHS: int = 24
+    GAME_EVENTS_RETENTION_MONTHS: int = 6
+
+    # Leaderboards
+    LEADERBOARD_REDIS_URL: Optional[str] = None
+
+    # Community counters
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+
+    # Document ingestion
+    INGESTION_MAX_UPLOAD_MB: int = 50
+    INGESTION_CHUNK_CHARS: int = 12_000
+    INGESTION_MAX_CHUNKS: int = 20
+
+    # Exports
+    EXPORT_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "doqu-exports")
+    EXPORT_CACHE_MAX_MB: int = 512
+    EXPORT_WORKERS: int = 2
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Observability
+    METRICS_ENABLED: bool = True
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: dict[str, str] = {"sqlalchemy.engine": "WARNING"}
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATES: dict[str, float] = {"socket.connect": 0.01, "socket.disconnect": 0.01}
+    LOG_QUEUE_SIZE: int = 10_000
+    DB_ECHO: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -0,0 +1,158 @@
+import itertools
+import logging
+import queue
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Mapping, Optional, TextIO
+
+from app.core.config import settings
+from app.utils.serialization import dumps
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    Fields passed with `extra=` are included as top-level keys, so that records can be
+    filtered by them (`event`, `sid`, `job_id`, ...).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return dumps(entry).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records of high-volume events.
+
+    Records name their event with `extra={"event": ...}`. Events listed in `rates` keep one
+    record in every `1 / rate`, counted rather than random so that rates are exact; kept
+    records carry `sample_interval`, the number of events each stands for. Warnings and
+    errors are never dropped.
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        self.intervals = {
+            event: round(1 / rate) if rate > 0 else 0 for event, rate in rates.items()
+        }
+        self._counters: defaultdict[str, itertools.count] = defaultdict(itertools.count)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if not isinstance(event, str):
+            return True
+        interval = self.intervals.get(event)
+        if interval is None or interval == 1 or record.levelno >= logging.WARNING:
+            return True
+        if interval == 0:
+            return False
+        if next(self._counters[event]) % interval:
+            return False
+        record.sample_interval = interval
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the caller and drops records when the queue is full.
+
+    Records are prepared here, in the logging thread, so that the message is rendered with
+    the arguments' current values; the exception traceback is rendered too, and dropped so
+    that queued records do not keep frames alive.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(stream: Optional[TextIO] = None) -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Loggers only put records on the queue, so slow terminals or log collectors never block
+    the event loop. Levels come from `LOG_LEVEL` and the per-module `LOG_LEVELS`; records are
+    written as JSON lines, or as text if `LOG_FORMAT` is "text".
+
+    Args:
+        `stream`: Where records are written, standard output by default.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if settings.LOG_FORMAT == "text":
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(settings.LOG_QUEUE_SIZE)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    root.addHandler(_queue_handler)
+
+    levels = dict(settings.LOG_LEVELS)
+    if settings.DB_ECHO:
+        levels["sqlalchemy.engine"] = "INFO"
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Write out queued records and stop the background thread, if logging was configured.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
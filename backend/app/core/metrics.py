@@ -0,0 +1,389 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext, ExecutionContext
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label of requests that did not match any route, so that scans of random paths
+# cannot create unbounded numbers of series
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+HASH_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+# --- Metric Types --- #
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """
+    Base class of a metric family with a fixed set of label names.
+
+    Updates take a lock, as SQLAlchemy events and executor callbacks may run outside the
+    event loop thread; an uncontended lock costs well under a microsecond.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]: ...
+
+    @abstractmethod
+    def reset(self) -> None: ...
+
+
+class Counter(Metric):
+    """
+    A value that only goes up, such as a number of requests.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down, such as the number of requests in progress.
+    """
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+@dataclass
+class _HistogramSeries:
+    buckets: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Counts are kept per bucket and accumulated when rendering
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _HistogramSeries([0] * (len(self.bounds) + 1))
+            series.buckets[index] += 1
+            series.count += 1
+            series.total += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series.total if series else 0.0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            snapshot = [
+                (labels, list(series.buckets), series.count, series.total)
+                for labels, series in sorted(self._series.items())
+            ]
+        names = self.label_names + ("le",)
+        for labels, buckets, count, total in snapshot:
+            cumulative = 0
+            for bound, bucket in zip(self.bounds + (math.inf,), buckets):
+                cumulative += bucket
+                label_text = _format_labels(names, labels + (_format_value(bound),))
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    The set of metrics exposed by this process.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+        """
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """
+        Zero every metric. Only meant for tests.
+        """
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.register(
+    Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+)
+REQUEST_LATENCY = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests being handled.", ("method",))
+)
+REQUEST_DB_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Database queries executed per HTTP request.",
+        ("method", "route"),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_DB_TIME = registry.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent in database queries per HTTP request.",
+        ("method", "route"),
+        QUERY_TIME_BUCKETS,
+    )
+)
+DB_QUERIES = registry.register(
+    Counter("db_queries_total", "Database queries executed, inside requests or not.")
+)
+PASSWORD_HASH_WAIT = registry.register(
+    Histogram(
+        "password_hash_queue_seconds",
+        "Time password hashing jobs waited for a free worker.",
+        ("operation",),
+        HASH_BUCKETS,
+    )
+)
+PASSWORD_HASH_DURATION = registry.register(
+    Histogram(
+        "password_hash_duration_seconds",
+        "Time spent hashing or verifying a password.",
+        ("operation",),
+        HASH_BUCKETS,
+    )
+)
+
+
+# --- Database Query Tracking --- #
+@dataclass
+class QueryStats:
+    """
+    Database queries executed on behalf of the current request.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """
+    Return the query statistics of the request being handled, if any.
+    """
+    return _query_stats.get()
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERIES.inc()
+    # SQLAlchemy runs async drivers in a greenlet that shares the caller's context,
+    # so this sees the stats of the request that issued the query
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # A failed statement never reaches `after_cursor_execute`; drop its start time, which
+    # would otherwise stay on the connection for as long as it is pooled
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def instrument_engines() -> None:
+    """
+    Count and time the queries of every engine, sync or async, through cursor events.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+# --- Middleware --- #
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency, status and database queries of each request.
+
+    Requests are labelled with their route template (`/api/quizzes/{quiz_id}`) rather than
+    their path. A plain ASGI middleware rather than `BaseHTTPMiddleware`, which would add
+    a task and a memory stream per request and buffer streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Callable[[], Sequence[BaseRoute]]):
+        """
+        Args:
+            `app`: The wrapped application.
+            `routes`: Returns the application's routes, to map endpoints to route templates.
+        """
+        self.app = app
+        self._routes = routes
+        self._templates: dict[Callable, str] = {}
+
+    def _route_label(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        template = self._templates.get(endpoint)
+        if template is None:
+            # Routes are fixed once the app has started, so this runs once per endpoint
+            self._templates = {
+                route.endpoint: route.path
+                for route in self._routes()
+                if hasattr(route, "endpoint") and hasattr(route, "path")
+            }
+            template = self._templates.get(endpoint, UNMATCHED_ROUTE)
+        return template
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(method)
+            _query_stats.reset(token)
+            route = self._route_label(scope)
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUEST_DB_QUERIES.observe(stats.count, method, route)
+            REQUEST_DB_TIME.observe(stats.seconds, method, route)
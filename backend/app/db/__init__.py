@@ -1,4 +1,4 @@
-from .engine import async_engine, sync_engine
+from .engine import async_engine, dispose_engines, sync_engine
 from .init_db import init_db
 from .session import get_async_session, get_db
 from .utils import check_db_connection
@@ -6,6 +6,7 @@ from .utils import check_db_connection
 __all__ = [
     "async_engine",
     "sync_engine",
+    "dispose_engines",
     "get_db",
     "get_async_session",
     "check_db_connection",
@@ -1,6 +1,23 @@
 from app.db.engine import Base
 
 # Import all the models, so that Base has them before being imported by Alembic
+from app.models.analytics import PlayerQuizStats, PlayerStats, QuestionStats
+from app.models.game import Game, GameAnswer, GameEvent
+from app.models.generation import GenerationJob
+from app.models.quiz import Quiz, QuizComment, QuizRating
 from app.models.user import User
 
-__all__ = ["Base", "User"]
+__all__ = [
+    "Base",
+    "Game",
+    "GameAnswer",
+    "GameEvent",
+    "GenerationJob",
+    "PlayerQuizStats",
+    "PlayerStats",
+    "QuestionStats",
+    "Quiz",
+    "QuizComment",
+    "QuizRating",
+    "User",
+]
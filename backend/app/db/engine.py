@@ -1,4 +1,5 @@
 import logging
+import os
 
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
@@ -14,7 +15,7 @@ Base = declarative_base()
 # Async engine for FastAPI async endpoints
 async_engine: AsyncEngine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,  # Set to False in production
+    echo=settings.DB_ECHO,
     pool_pre_ping=True,
     pool_recycle=300,
 )
@@ -22,9 +23,27 @@ async_engine: AsyncEngine = create_async_engine(
 # Sync engine for legacy/sync operations
 sync_engine: Engine = create_engine(
     settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql"),
-    echo=True,  # Set to False in production
+    echo=settings.DB_ECHO,
     pool_pre_ping=True,
     pool_recycle=300,
 )
 
 logger.info("Database engines initialized successfully")
+
+
+def _reset_pools_after_fork() -> None:
+    # A forked worker must never use the connections of its parent: drop the inherited
+    # pools without closing them, so that each process starts with pools of its own
+    async_engine.sync_engine.dispose(close=False)
+    sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+async def dispose_engines() -> None:
+    """
+    Close every pooled connection of this process, on shutdown.
+    """
+    await async_engine.dispose()
+    sync_engine.dispose()
@@ -0,0 +1,254 @@
+"""
+Alembic operations that keep tables available while a migration runs.
+
+On PostgreSQL, `op.create_index`, `op.alter_column` and friends hold locks for as long as
+they scan or rewrite the table, and every query on that table queues behind them. For
+tables that already hold data, use these helpers instead; `python -m app.migration_lint`
+flags the locking operations.
+
+Changing a column (type, name, meaning) follows expand/contract, one deploy per step:
+    1. Expand: `add_column` a new nullable column; deploy code writing both columns.
+    2. `backfill_in_batches` the new column from the old one, then `add_not_null` and
+       `create_index_concurrently` as needed.
+    3. Deploy code reading the new column only.
+    4. Contract: `op.drop_column` the old column.
+
+Helpers committing their own transactions (marked below) commit the migration's earlier
+operations too, so keep them in migrations of their own.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.sql.elements import ColumnElement
+
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+_TIMEOUT = re.compile(r"\d+(ms|s|min)?")
+
+
+# --- Helper Functions --- #
+def is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def quote(name: str) -> str:
+    return op.get_context().dialect.identifier_preparer.quote(name)
+
+
+def set_lock_timeout(timeout: str = "5s") -> None:
+    """
+    Make the migration's statements give up when they wait `timeout` for a lock.
+
+    A statement waiting for a lock blocks every query queued behind it, so failing fast
+    (and retrying the deploy) beats stalling the application behind a long transaction.
+
+    Args:
+        `timeout`: PostgreSQL duration, such as "5s" or "500ms".
+    """
+    if not _TIMEOUT.fullmatch(timeout):
+        raise ValueError(f"Invalid lock timeout: {timeout!r}")
+    if is_postgresql():
+        op.execute(f"SET lock_timeout = '{timeout}'")
+
+
+# --- Indexes --- #
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[str], unique: bool = False, **kw: Any
+) -> None:
+    """
+    Create an index without blocking writes to the table. Commits its own transaction.
+
+    An earlier failed build leaves an invalid index behind; it is dropped and rebuilt, so a
+    failed migration can simply be re-run.
+
+    Args:
+        `index_name`: Name of the index.
+        `table_name`: Name of the indexed table.
+        `columns`: Indexed columns.
+        `unique`: Whether the index is unique.
+        `**kw`: Further `op.create_index` options, such as `postgresql_where`.
+    """
+    if not is_postgresql():
+        op.create_index(index_name, table_name, columns, unique=unique, **kw)
+        return
+
+    context = op.get_context()
+    with context.autocommit_block():
+        if not context.as_sql:
+            invalid = op.get_bind().scalar(
+                sa.text(
+                    "SELECT NOT i.indisvalid FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+                ),
+                {"name": index_name},
+            )
+            if invalid:
+                logger.warning(f"Rebuilding invalid index {index_name}")
+                op.drop_index(
+                    index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True
+                )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            unique=unique,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    Drop an index without blocking queries on the table. Commits its own transaction.
+    """
+    if not is_postgresql():
+        op.drop_index(index_name, table_name=table_name)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True
+        )
+
+
+# --- Columns and Constraints --- #
+def add_column(table_name: str, column: sa.Column) -> None:
+    """
+    Add a column without rewriting the table: it must be nullable or have a constant
+    server default.
+
+    Raises:
+        ValueError: If the column is NOT NULL without a server default, which fails on a
+            populated table.
+    """
+    if not column.nullable and column.server_default is None:
+        raise ValueError(
+            f"{column.name} must be nullable or have a server default; backfill it and "
+            "use add_not_null instead"
+        )
+    op.add_column(table_name, column)
+
+
+def add_not_null(table_name: str, column_name: str) -> None:
+    """
+    Make a column NOT NULL without scanning the table under an exclusive lock. Commits its
+    own transactions.
+
+    The rows are checked by validating a CHECK constraint, which lets reads and writes
+    continue; PostgreSQL 12+ then sets NOT NULL without a scan.
+
+    Raises:
+        sqlalchemy.exc.IntegrityError: If the column still holds nulls.
+    """
+    if not is_postgresql():
+        with op.batch_alter_table(table_name) as batch:
+            batch.alter_column(column_name, nullable=False)
+        return
+
+    constraint = f"ck_{table_name}_{column_name}_not_null"
+    with op.get_context().autocommit_block():
+        op.create_check_constraint(
+            constraint, table_name, f"{quote(column_name)} IS NOT NULL", postgresql_not_valid=True
+        )
+        op.execute(f"ALTER TABLE {quote(table_name)} VALIDATE CONSTRAINT {quote(constraint)}")
+        op.alter_column(table_name, column_name, nullable=False)
+        op.drop_constraint(constraint, table_name, type_="check")
+
+
+def add_foreign_key(
+    constraint_name: str,
+    source_table: str,
+    referent_table: str,
+    local_cols: Sequence[str],
+    remote_cols: Sequence[str],
+    **kw: Any,
+) -> None:
+    """
+    Add a foreign key without blocking writes while existing rows are checked. Commits its
+    own transactions.
+    """
+    if not is_postgresql():
+        op.create_foreign_key(
+            constraint_name, source_table, referent_table, list(local_cols), list(remote_cols), **kw
+        )
+        return
+    with op.get_context().autocommit_block():
+        op.create_foreign_key(
+            constraint_name,
+            source_table,
+            referent_table,
+            list(local_cols),
+            list(remote_cols),
+            postgresql_not_valid=True,
+            **kw,
+        )
+        op.execute(
+            f"ALTER TABLE {quote(source_table)} VALIDATE CONSTRAINT {quote(constraint_name)}"
+        )
+
+
+# --- Backfills --- #
+def backfill_in_batches(
+    table_name: str,
+    values: dict[str, Union[ColumnElement, Any]],
+    where: Union[str, ColumnElement],
+    key: str = "id",
+    batch_size: int = 1000,
+    pause_seconds: float = 0.1,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Update the rows matching `where` in batches of `batch_size`, each committed on its own,
+    so no lock is held for longer than one batch. Commits its own transactions.
+
+    `where` must stop matching a row once it is backfilled, such as "new_col IS NULL": an
+    interrupted backfill then resumes where it stopped when the migration is re-run. Batches
+    walk the table in `key` order, so rows the update leaves matching are not revisited.
+
+    Args:
+        `table_name`: Name of the table.
+        `values`: New values by column, as SQL expressions such as `sa.column("old_col")`
+            or literals.
+        `where`: SQL condition selecting the rows still to backfill.
+        `key`: Unique, indexed column to batch by.
+        `batch_size`: Rows updated per transaction.
+        `pause_seconds`: Pause between batches, leaving the database time for other work
+            and replicas time to catch up.
+        `max_batches`: Stop after this many batches, for backfills spread over deploys.
+
+    Returns:
+        The number of rows updated.
+    """
+    table = sa.table(table_name, sa.column(key), *(sa.column(name) for name in values))
+    condition = sa.text(where) if isinstance(where, str) else where
+    key_column = table.c[key]
+
+    updated = batches = 0
+    last_key = None
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while max_batches is None or batches < max_batches:
+            select = sa.select(key_column).where(condition).order_by(key_column).limit(batch_size)
+            if last_key is not None:
+                select = select.where(key_column > last_key)
+            keys = bind.execute(select).scalars().all()
+            if not keys:
+                break
+            # The condition is repeated, as rows may have changed since they were selected
+            result = bind.execute(
+                table.update().where(key_column.in_(keys), condition).values(values)
+            )
+            updated += result.rowcount
+            batches += 1
+            last_key = keys[-1]
+            logger.info(f"Backfilled {updated} rows of {table_name}")
+            if len(keys) < batch_size:
+                break
+            time.sleep(pause_seconds)
+    return updated
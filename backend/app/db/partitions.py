@@ -0,0 +1,273 @@
+"""
+Monthly partitions of the game history tables.
+
+On PostgreSQL, `game_answers` is range partitioned by `game_started_at` and `game_events` by
+`occurred_at`, one partition per month, named like "game_answers_p2026_10":
+- Queries filtering on the partition key only scan the matching months (partition pruning),
+  so they stay fast however much history accumulates.
+- Expired history is removed by detaching and dropping whole partitions, which takes no row
+  locks and leaves no dead rows to vacuum, unlike a bulk DELETE.
+
+There is no default partition, so inserts fail for months without a partition.
+`maintain_partitions` creates `PARTITION_PREMAKE_MONTHS` months ahead and drops the months
+past each table's retention. Each worker runs it at startup and every
+`PARTITION_MAINTENANCE_INTERVAL_SECONDS`. It can also be run by hand (from `backend/`):
+    python -m app.db.partitions [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Mapping, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from alembic import op
+from app.core.config import settings
+
+from .engine import async_engine
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock held while maintaining, so that workers starting together take turns
+MAINTENANCE_LOCK = "doqu:partition-maintenance"
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """
+    Attributes:
+        `name` (str): Name of the partitioned table.
+        `column` (str): Timestamp column the table is partitioned by.
+        `retention_months` (int): Full months kept before the current one; 0 keeps all.
+    """
+
+    name: str
+    column: str
+    retention_months: int
+
+
+@dataclass
+class PartitionPlan:
+    """
+    Attributes:
+        `create` (list[datetime]): First instants of the months to create partitions for.
+        `drop` (list[str]): Names of the expired partitions.
+    """
+
+    create: list[datetime] = field(default_factory=list)
+    drop: list[str] = field(default_factory=list)
+
+
+def partitioned_tables() -> list[PartitionedTable]:
+    """
+    Return the partitioned tables with their configured retention.
+    """
+    return [
+        PartitionedTable("game_answers", "game_started_at", settings.GAME_ANSWERS_RETENTION_MONTHS),
+        PartitionedTable("game_events", "occurred_at", settings.GAME_EVENTS_RETENTION_MONTHS),
+    ]
+
+
+# --- Months --- #
+def month_start(moment: datetime) -> datetime:
+    """
+    Return the first instant of the UTC month containing `moment`.
+    """
+    moment = moment.astimezone(timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Return the first instant of the month `months` after `month`, which must be one.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_p{month:%Y_%m}"
+
+
+def partition_month(table_name: str, name: str) -> Optional[datetime]:
+    """
+    Return the month a partition of `table_name` holds, or None if `name` is not one.
+    """
+    match = re.fullmatch(rf"{re.escape(table_name)}_p(\d{{4}})_(\d{{2}})", name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+def create_partition_sql(table_name: str, month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, month)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def plan_partitions(
+    table: PartitionedTable, existing: Sequence[str], now: datetime, premake_months: int
+) -> PartitionPlan:
+    """
+    Decide which partitions of a table to create and drop.
+
+    Args:
+        `table`: The partitioned table.
+        `existing`: Names of its current partitions.
+        `now`: The current time.
+        `premake_months`: Months after the current one to create partitions for.
+
+    Returns:
+        PartitionPlan: The missing months up to `premake_months` ahead, and the partitions
+            of months before the retention period.
+    """
+    current = month_start(now)
+    months = {
+        month: name for name in existing if (month := partition_month(table.name, name)) is not None
+    }
+    plan = PartitionPlan()
+    for offset in range(premake_months + 1):
+        month = add_months(current, offset)
+        if month not in months:
+            plan.create.append(month)
+    if table.retention_months:
+        oldest_kept = add_months(current, -table.retention_months)
+        plan.drop = [name for month, name in sorted(months.items()) if month < oldest_kept]
+    return plan
+
+
+# --- Maintenance --- #
+async def _existing_partitions(connection: AsyncConnection, table_name: str) -> dict[str, bool]:
+    # Maps each partition to whether an interrupted DETACH ... CONCURRENTLY left it pending
+    result = await connection.execute(
+        text(
+            "SELECT c.relname, i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table_name},
+    )
+    return {name: bool(pending) for name, pending in result.all()}
+
+
+def maintenance_statements(
+    table: PartitionedTable, existing: Mapping[str, bool], now: datetime
+) -> list[str]:
+    """
+    Return the statements creating and dropping the partitions planned for a table.
+
+    Expired partitions are detached concurrently (PostgreSQL 14+), which only waits for
+    queries already using them, then dropped.
+    """
+    plan = plan_partitions(table, list(existing), now, settings.PARTITION_PREMAKE_MONTHS)
+    statements = [create_partition_sql(table.name, month) for month in plan.create]
+    for name in plan.drop:
+        mode = "FINALIZE" if existing[name] else "CONCURRENTLY"
+        statements.append(f"ALTER TABLE {table.name} DETACH PARTITION {name} {mode}")
+        statements.append(f"DROP TABLE {name}")
+    return statements
+
+
+async def maintain_partitions(
+    engine: Optional[AsyncEngine] = None, now: Optional[datetime] = None, dry_run: bool = False
+) -> list[str]:
+    """
+    Create the upcoming partitions of every partitioned table and drop the expired ones.
+
+    Does nothing off PostgreSQL, or while another process is maintaining the partitions.
+
+    Args:
+        `engine`: Engine to use, defaults to the application's.
+        `now`: The current time, defaults to now.
+        `dry_run`: Only return the statements, without running them.
+
+    Returns:
+        The statements run, or that would be run with `dry_run`.
+    """
+    engine = engine or async_engine
+    if engine.dialect.name != "postgresql":
+        return []
+    now = now or datetime.now(timezone.utc)
+
+    executed: list[str] = []
+    async with engine.connect() as connection:
+        # DETACH PARTITION ... CONCURRENTLY cannot run inside a transaction
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        lock = {"name": MAINTENANCE_LOCK}
+        if not await connection.scalar(text("SELECT pg_try_advisory_lock(hashtext(:name))"), lock):
+            logger.info("Partitions are being maintained by another process")
+            return []
+        try:
+            for table in partitioned_tables():
+                existing = await _existing_partitions(connection, table.name)
+                for statement in maintenance_statements(table, existing, now):
+                    if not dry_run:
+                        logger.info(f"Partition maintenance: {statement}")
+                        await connection.execute(text(statement))
+                    executed.append(statement)
+        finally:
+            await connection.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), lock)
+    return executed
+
+
+async def run_partition_maintenance(interval: Optional[float] = None) -> None:
+    """
+    Maintain the partitions now and then periodically until cancelled.
+
+    Args:
+        `interval`: Seconds between runs, defaults to `PARTITION_MAINTENANCE_INTERVAL_SECONDS`.
+    """
+    interval = interval or settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception as e:
+            logger.error(f"Maintaining partitions failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# --- Migrations --- #
+def create_partitions(table_name: str, since: Optional[datetime] = None) -> None:
+    """
+    Create the partitions of a table from the month of `since` (or the current month)
+    through the premade months, in an Alembic migration.
+    """
+    current = month_start(datetime.now(timezone.utc))
+    month = min(month_start(since), current) if since else current
+    last = add_months(current, settings.PARTITION_PREMAKE_MONTHS)
+    while month <= last:
+        op.execute(create_partition_sql(table_name, month))
+        month = add_months(month, 1)
+
+
+# --- Command Line --- #
+async def _run(dry_run: bool) -> list[str]:
+    try:
+        return await maintain_partitions(dry_run=dry_run)
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Create upcoming and drop expired partitions of the game history tables."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print the statements without running them"
+    )
+    args = parser.parse_args(argv)
+
+    for statement in asyncio.run(_run(args.dry_run)):
+        print(f"{statement};")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import AsyncContextManager, AsyncGenerator, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -27,5 +27,13 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """
+    FastAPI dependency for the session factory, for work that outlives the request, such as
+    a streamed response body, and so cannot use the request's session.
+    """
+    return AsyncSessionLocal
+
+
 # Alias for backward compatibility
 get_db = get_async_session
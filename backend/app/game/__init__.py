@@ -0,0 +1,12 @@
+# Game runtime module initialization
+from .pack import GamePack, compile_game_pack, get_cached_game_pack, get_game_pack
+from .teams import TeamScoreboard, TeamStanding
+
+__all__ = [
+    "GamePack",
+    "compile_game_pack",
+    "get_game_pack",
+    "get_cached_game_pack",
+    "TeamScoreboard",
+    "TeamStanding",
+]
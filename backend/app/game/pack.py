@@ -0,0 +1,215 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from app.models.quiz import QuestionType, QuizContent
+from app.utils.serialization import dumps
+
+# Maximum number of compiled packs kept in memory. Each pack is shared by every room
+# playing the same quiz version, so this only needs to cover the quizzes live at once.
+PACK_CACHE_SIZE = 256
+
+# Points awarded for a correct answer decay linearly to this fraction of the full value
+# as the time limit runs out.
+MIN_POINTS_FRACTION = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class GamePack:
+    """
+    Immutable, precompiled form of a quiz version used while a game is running.
+
+    Attributes:
+        `content_hash` (str): SHA-256 of the canonical quiz content; identifies the version.
+        `title` (str): Quiz title.
+        `question_payloads` (tuple[bytes, ...]): Pre-encoded JSON payload for each question,
+            without the correct answer, ready to be sent to every player as-is.
+        `answer_keys` (Mapping[tuple[int, str], int]): Index of `(question_index, answer)`
+            pairs for correct answers, mapped to the question's full points.
+        `point_tables` (tuple[tuple[int, ...], ...]): For each question, the points awarded
+            for a correct answer given within each elapsed second of the time limit.
+        `total_points` (int): Maximum achievable score.
+    """
+
+    content_hash: str
+    title: str
+    question_payloads: tuple[bytes, ...]
+    answer_keys: Mapping[tuple[int, str], int]
+    point_tables: tuple[tuple[int, ...], ...]
+    total_points: int
+
+    @property
+    def question_count(self) -> int:
+        return len(self.question_payloads)
+
+    def is_correct(self, question_index: int, answer: str) -> bool:
+        """
+        Check an answer against the answer key in O(1).
+
+        Args:
+            `question_index`: Zero-based index of the question.
+            `answer`: The answer submitted by the player.
+
+        Returns:
+            True if the answer is correct, False otherwise.
+        """
+        return (question_index, normalize_answer(answer)) in self.answer_keys
+
+    def score(self, question_index: int, answer: str, elapsed_ms: int) -> int:
+        """
+        Grade an answer and return the points it earns.
+
+        Args:
+            `question_index`: Zero-based index of the question.
+            `answer`: The answer submitted by the player.
+            `elapsed_ms`: Milliseconds between the question being shown and the answer.
+
+        Returns:
+            The points earned, 0 for wrong, late or out-of-range answers.
+        """
+        if not self.is_correct(question_index, answer):
+            return 0
+        table = self.point_tables[question_index]
+        second = max(elapsed_ms, 0) // 1000
+        if second >= len(table):
+            return 0
+        return table[second]
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    Normalize an answer so that grading ignores case and surrounding whitespace.
+    """
+    return answer.strip().casefold()
+
+
+def content_hash(content: QuizContent) -> str:
+    """
+    Compute a stable hash of the quiz content.
+
+    Args:
+        `content`: The quiz content to hash.
+
+    Returns:
+        Hex-encoded SHA-256 of the canonical JSON encoding of the content.
+    """
+    # Stays on the stdlib encoder: hashes are persisted, so the encoding must never change
+    canonical = json.dumps(
+        content.model_dump(mode="json"), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _build_point_table(points: int, time_limit_seconds: int) -> tuple[int, ...]:
+    if time_limit_seconds <= 1:
+        return (points,)
+    decay = points * (1 - MIN_POINTS_FRACTION) / (time_limit_seconds - 1)
+    return tuple(round(points - decay * second) for second in range(time_limit_seconds))
+
+
+def compile_game_pack(content: QuizContent, digest: str | None = None) -> GamePack:
+    """
+    Compile quiz content into an immutable `GamePack`.
+
+    Args:
+        `content`: The quiz content to compile.
+        `digest`: The content hash, if already computed.
+
+    Returns:
+        The compiled GamePack.
+    """
+    total = len(content.questions)
+    payloads: list[bytes] = []
+    answer_keys: dict[tuple[int, str], int] = {}
+    point_tables: list[tuple[int, ...]] = []
+
+    for index, question in enumerate(content.questions):
+        options = question.options
+        if question.question_type == QuestionType.TRUE_FALSE and not options:
+            options = ["true", "false"]
+
+        payload = {
+            "index": index,
+            "total": total,
+            "question_text": question.question_text,
+            "question_type": question.question_type.value,
+            "options": options,
+            "points": question.points,
+            "time_limit_seconds": question.time_limit_seconds,
+        }
+        payloads.append(dumps(payload))
+        answer_keys[(index, normalize_answer(question.correct_answer))] = question.points
+        point_tables.append(_build_point_table(question.points, question.time_limit_seconds))
+
+    return GamePack(
+        content_hash=digest or content_hash(content),
+        title=content.title,
+        question_payloads=tuple(payloads),
+        answer_keys=MappingProxyType(answer_keys),
+        point_tables=tuple(point_tables),
+        total_points=sum(question.points for question in content.questions),
+    )
+
+
+# --- Pack Cache --- #
+_pack_cache: "OrderedDict[str, GamePack]" = OrderedDict()
+_pack_cache_lock = threading.Lock()
+
+
+def get_game_pack(content: QuizContent) -> GamePack:
+    """
+    Return the shared `GamePack` for the quiz content, compiling it on first use.
+
+    Packs are cached by content hash, so every room playing the same quiz version
+    shares a single compiled pack.
+
+    Args:
+        `content`: The quiz content to compile.
+
+    Returns:
+        The cached or newly compiled GamePack.
+    """
+    digest = content_hash(content)
+    pack = get_cached_game_pack(digest)
+    if pack is not None:
+        return pack
+
+    pack = compile_game_pack(content, digest)
+    with _pack_cache_lock:
+        # Another caller may have compiled the same version in the meantime; keep theirs
+        existing = _pack_cache.get(digest)
+        if existing is not None:
+            return existing
+        _pack_cache[digest] = pack
+        if len(_pack_cache) > PACK_CACHE_SIZE:
+            _pack_cache.popitem(last=False)
+    return pack
+
+
+def get_cached_game_pack(digest: str) -> GamePack | None:
+    """
+    Look up a compiled pack by content hash without compiling.
+
+    Args:
+        `digest`: The content hash of the quiz version.
+
+    Returns:
+        The cached GamePack, or None if it is not in the cache.
+    """
+    with _pack_cache_lock:
+        pack = _pack_cache.get(digest)
+        if pack is not None:
+            _pack_cache.move_to_end(digest)
+        return pack
+
+
+def clear_game_pack_cache() -> None:
+    """
+    Drop every cached pack.
+    """
+    with _pack_cache_lock:
+        _pack_cache.clear()
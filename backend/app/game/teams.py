@@ -0,0 +1,326 @@
+from dataclasses import dataclass
+from typing import Hashable, Iterable, Sequence
+
+import numpy as np
+
+# Initial number of player slots; the arrays double whenever they fill up
+INITIAL_CAPACITY = 64
+
+# Team index of a free slot or of a player not on any team
+NO_TEAM = -1
+
+
+@dataclass(frozen=True, slots=True)
+class TeamStanding:
+    """
+    A team's place on the scoreboard.
+
+    Attributes:
+        `team` (int): Zero-based team index.
+        `members` (int): Number of players on the team.
+        `total` (int): Sum of the members' scores.
+        `average` (float): Mean score per member, 0 for an empty team.
+        `rank` (int): One-based rank by average, teams with equal averages sharing a rank.
+    """
+
+    team: int
+    members: int
+    total: int
+    average: float
+    rank: int
+
+
+def competition_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    Rank scores from highest to lowest, giving equal scores the same rank ("1, 2, 2, 4").
+
+    Args:
+        `scores`: One score per entry.
+
+    Returns:
+        The one-based rank of each entry.
+    """
+    ascending = np.sort(scores)
+    # An entry's rank is one more than the number of strictly higher scores
+    return len(scores) - np.searchsorted(ascending, scores, side="right") + 1
+
+
+def balanced_counts(sizes: np.ndarray, count: int) -> np.ndarray:
+    """
+    Work out how many new players each team gets so that team sizes end up as even as possible.
+
+    Smaller teams are filled first; no player is moved between teams.
+
+    Args:
+        `sizes`: Current size of each team.
+        `count`: Number of players to distribute.
+
+    Returns:
+        The number of new players for each team.
+    """
+    ordered = np.sort(sizes)
+    filled = np.cumsum(ordered)
+    # The `k` smallest teams can all be raised to `level[k - 1]` with the players available;
+    # the fill level is the highest one that does not exceed the next team's size
+    teams = np.arange(1, len(sizes) + 1)
+    levels = (filled + count) // teams
+    k = int(np.nonzero(levels >= ordered)[0][-1]) + 1
+    level = int(levels[k - 1])
+
+    counts: np.ndarray = np.maximum(level - sizes, 0)
+    # Whatever is left over is one each for the teams at the level with the lowest index
+    leftover = count - int(counts.sum())
+    at_level = np.nonzero(sizes + counts == level)[0]
+    counts[at_level[:leftover]] += 1
+    return counts
+
+
+class TeamScoreboard:
+    """
+    Array-backed scores and team membership for a Team Mode room.
+
+    Each player occupies a slot in a set of parallel NumPy arrays holding their score and
+    team index, while per-team totals and sizes are kept up to date incrementally. Scoring a
+    whole reveal is a single `bincount` over the answering players, and averages and ranks
+    are vectorized reductions over the teams, so no per-reveal work walks the player list in
+    Python.
+
+    Not thread-safe; a room's scoreboard is only used from the event loop.
+    """
+
+    def __init__(self, team_count: int, capacity: int = INITIAL_CAPACITY):
+        """
+        Args:
+            `team_count`: Number of teams in the room.
+            `capacity`: Number of player slots to allocate up front.
+
+        Raises:
+            ValueError: If `team_count` is less than 1.
+        """
+        if team_count < 1:
+            raise ValueError("A team game needs at least one team")
+        capacity = max(capacity, 1)
+        self.team_count = team_count
+        self._slots: dict[Hashable, int] = {}
+        self._free: list[int] = []
+        self._used = 0
+        self._scores = np.zeros(capacity, dtype=np.int64)
+        self._teams = np.full(capacity, NO_TEAM, dtype=np.int32)
+        self._team_totals = np.zeros(team_count, dtype=np.int64)
+        self._team_sizes = np.zeros(team_count, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, player_id: Hashable) -> bool:
+        return player_id in self._slots
+
+    # --- Membership --- #
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._scores)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        scores = np.zeros(capacity, dtype=np.int64)
+        teams = np.full(capacity, NO_TEAM, dtype=np.int32)
+        used = self._used
+        scores[:used] = self._scores[:used]
+        teams[:used] = self._teams[:used]
+        self._scores, self._teams = scores, teams
+
+    def _allocate(self, count: int) -> np.ndarray:
+        reused = [self._free.pop() for _ in range(min(count, len(self._free)))]
+        fresh = count - len(reused)
+        self._grow(self._used + fresh)
+        slots = np.concatenate(
+            [np.array(reused, dtype=np.int64), np.arange(self._used, self._used + fresh)]
+        )
+        self._used += fresh
+        return slots
+
+    def add_players(self, player_ids: Sequence[Hashable]) -> np.ndarray:
+        """
+        Add players to the room, auto-assigning them so that team sizes stay balanced.
+
+        Players fill the smallest teams first, in the order given, alternating between teams
+        of equal size. Callers wanting random teams shuffle `player_ids` first.
+
+        Args:
+            `player_ids`: Players to add.
+
+        Returns:
+            The team index assigned to each player.
+
+        Raises:
+            ValueError: If a player is already in the room or listed twice.
+        """
+        if len(set(player_ids)) != len(player_ids) or any(p in self._slots for p in player_ids):
+            raise ValueError("Player is already in the room")
+        if not player_ids:
+            return np.zeros(0, dtype=np.int32)
+
+        counts = balanced_counts(self._team_sizes, len(player_ids))
+        teams = np.repeat(np.arange(self.team_count, dtype=np.int32), counts)
+        # Each new player's position within its team, so that teams take turns
+        positions = np.arange(len(teams)) - np.repeat(np.cumsum(counts) - counts, counts)
+        teams = teams[np.lexsort((teams, self._team_sizes[teams] + positions))]
+        self._insert(player_ids, teams)
+        return teams
+
+    def add_player(self, player_id: Hashable, team: int | None = None) -> int:
+        """
+        Add a player to a chosen team, or to the smallest team if none is given.
+
+        Args:
+            `player_id`: The player to add.
+            `team`: Team index to join.
+
+        Returns:
+            The player's team index.
+
+        Raises:
+            ValueError: If the player is already in the room or the team does not exist.
+        """
+        if player_id in self._slots:
+            raise ValueError("Player is already in the room")
+        if team is None:
+            # Same choice `balanced_counts` makes for one player: the first smallest team
+            team = int(np.argmin(self._team_sizes))
+        elif not 0 <= team < self.team_count:
+            raise ValueError("No such team")
+        self._insert([player_id], np.array([team], dtype=np.int32))
+        return team
+
+    def _insert(self, player_ids: Sequence[Hashable], teams: np.ndarray) -> None:
+        slots = self._allocate(len(player_ids))
+        self._slots.update(zip(player_ids, slots.tolist()))
+        self._scores[slots] = 0
+        self._teams[slots] = teams
+        self._team_sizes += np.bincount(teams, minlength=self.team_count)
+
+    def remove_player(self, player_id: Hashable) -> None:
+        """
+        Remove a player from the room. Their points leave the team total with them.
+
+        Args:
+            `player_id`: The player to remove.
+
+        Raises:
+            KeyError: If the player is not in the room.
+        """
+        slot = self._slots.pop(player_id)
+        team = self._teams[slot]
+        self._team_sizes[team] -= 1
+        self._team_totals[team] -= self._scores[slot]
+        self._scores[slot] = 0
+        self._teams[slot] = NO_TEAM
+        self._free.append(slot)
+
+    def team_of(self, player_id: Hashable) -> int:
+        """
+        Return the team index of a player.
+
+        Raises:
+            KeyError: If the player is not in the room.
+        """
+        return int(self._teams[self._slots[player_id]])
+
+    # --- Scoring --- #
+    def award(self, player_id: Hashable, points: int) -> None:
+        """
+        Add points to a player and their team.
+
+        Raises:
+            KeyError: If the player is not in the room.
+        """
+        slot = self._slots[player_id]
+        self._scores[slot] += points
+        self._team_totals[self._teams[slot]] += points
+
+    def award_many(self, player_ids: Iterable[Hashable], points: Iterable[int]) -> None:
+        """
+        Add the points of a whole reveal at once.
+
+        Args:
+            `player_ids`: Players who scored.
+            `points`: Points for each player, in the same order.
+
+        Raises:
+            KeyError: If a player is not in the room.
+        """
+        slots = np.fromiter((self._slots[p] for p in player_ids), dtype=np.int64)
+        gained = np.fromiter(points, dtype=np.int64, count=len(slots))
+        # Players are unique per reveal, but `add.at` keeps repeated slots correct anyway
+        np.add.at(self._scores, slots, gained)
+        self._team_totals += np.bincount(
+            self._teams[slots], weights=gained, minlength=self.team_count
+        ).astype(np.int64)
+
+    def score_of(self, player_id: Hashable) -> int:
+        """
+        Return a player's score.
+
+        Raises:
+            KeyError: If the player is not in the room.
+        """
+        return int(self._scores[self._slots[player_id]])
+
+    # --- Standings --- #
+    @property
+    def team_totals(self) -> np.ndarray:
+        return self._team_totals.copy()
+
+    @property
+    def team_sizes(self) -> np.ndarray:
+        return self._team_sizes.copy()
+
+    def team_averages(self) -> np.ndarray:
+        """
+        Return each team's mean score per member, 0 for empty teams.
+
+        Averages rather than totals are what teams are ranked by, so that a larger team
+        does not win just by having more players.
+        """
+        averages = np.zeros(self.team_count, dtype=np.float64)
+        np.divide(self._team_totals, self._team_sizes, out=averages, where=self._team_sizes > 0)
+        return averages
+
+    def team_ranks(self) -> np.ndarray:
+        """
+        Return each team's one-based rank by average score.
+        """
+        return competition_ranks(self.team_averages())
+
+    def standings(self) -> list[TeamStanding]:
+        """
+        Return every team's standing, best first.
+        """
+        averages = self.team_averages()
+        ranks = competition_ranks(averages)
+        order = np.lexsort((np.arange(self.team_count), ranks))
+        return [
+            TeamStanding(
+                team=int(team),
+                members=int(self._team_sizes[team]),
+                total=int(self._team_totals[team]),
+                average=float(averages[team]),
+                rank=int(ranks[team]),
+            )
+            for team in order
+        ]
+
+    def rebuild_totals(self) -> None:
+        """
+        Recompute team totals and sizes from the per-player arrays.
+
+        The incremental totals never drift, so this is only needed after editing the player
+        arrays directly; it also serves as a consistency check in tests.
+        """
+        used = self._used
+        teams = self._teams[:used]
+        members = teams != NO_TEAM
+        self._team_sizes = np.bincount(teams[members], minlength=self.team_count).astype(np.int64)
+        self._team_totals = np.bincount(
+            teams[members], weights=self._scores[:used][members], minlength=self.team_count
+        ).astype(np.int64)
@@ -0,0 +1,10 @@
+# Document ingestion module initialization
+from .chunking import chunk_text
+from .extract import UnsupportedDocumentError, detect_format, iter_document_text
+
+__all__ = [
+    "UnsupportedDocumentError",
+    "chunk_text",
+    "detect_format",
+    "iter_document_text",
+]
@@ -0,0 +1,57 @@
+import re
+from typing import Iterable, Iterator
+
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n\s*(?:\n\s*)+")
+
+# Preferred places to end a chunk, best first
+_BREAKS = ("\n\n", ". ", "? ", "! ", "\n", " ")
+
+
+def _clean(text: str) -> str:
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+
+def _split_point(text: str, start: int, size: int) -> int:
+    # Cut at the latest natural break in the second half of the window, so chunks stay
+    # between half and the full target size
+    end = start + size
+    for separator in _BREAKS:
+        cut = text.rfind(separator, start + size // 2, end)
+        if cut >= 0:
+            return cut + len(separator)
+    return end
+
+
+def chunk_text(pieces: Iterable[str], size: int) -> Iterator[str]:
+    """
+    Group a stream of text into chunks of about `size` characters, ending at paragraph or
+    sentence boundaries where possible.
+
+    Only the text of the chunk being built is held in memory, so this works on documents
+    of any length. Whitespace is normalized and empty chunks are skipped.
+
+    Args:
+        `pieces`: Consecutive pieces of text, e.g. from `iter_document_text`.
+        `size`: Target number of characters per chunk.
+
+    Yields:
+        str: The chunks, in document order.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        start = 0
+        while len(buffer) - start >= size:
+            cut = _split_point(buffer, start, size)
+            chunk = _clean(buffer[start:cut])
+            if chunk:
+                yield chunk
+            start = cut
+        buffer = buffer[start:]
+
+    chunk = _clean(buffer)
+    if chunk:
+        yield chunk
@@ -0,0 +1,281 @@
+import codecs
+import mmap
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# Bytes decoded per step when reading plain text
+TEXT_SLICE_SIZE = 1024 * 1024
+
+# Largest decompressed PDF stream that is parsed; bigger streams are cut at this size
+MAX_PDF_STREAM_SIZE = 64 * 1024 * 1024
+
+# How far back from a `stream` keyword to look for the stream's dictionary
+PDF_HEADER_WINDOW = 2048
+
+_WORD = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_BODY = "word/document.xml"
+
+
+class UnsupportedDocumentError(ValueError):
+    """
+    Raised when a file is not a PDF, DOCX or plain text document, or cannot be parsed.
+    """
+
+
+def detect_format(path: Path, filename: str = "") -> str:
+    """
+    Detect the format of a document from its leading bytes, falling back to its name.
+
+    Args:
+        `path`: Path of the document.
+        `filename`: Original file name, if known.
+
+    Returns:
+        "pdf", "docx" or "text".
+
+    Raises:
+        UnsupportedDocumentError: If the format is not supported.
+    """
+    with open(path, "rb") as file:
+        head = file.read(1024)
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                archive.getinfo(_DOCX_BODY)
+        except (zipfile.BadZipFile, KeyError):
+            raise UnsupportedDocumentError("Unsupported archive; expected a DOCX document")
+        return "docx"
+    if filename.lower().endswith((".txt", ".md", ".csv")) or _looks_like_text(head):
+        return "text"
+    raise UnsupportedDocumentError("Unsupported document format")
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[bytes | mmap.mmap]:
+    # Empty files cannot be memory-mapped
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_document_text(path: Path, filename: str = "") -> Iterator[str]:
+    """
+    Extract the text of a document incrementally.
+
+    Pieces are yielded as they are parsed, so a consumer that stops early never reads the
+    rest of the file, and memory use does not grow with the document size.
+
+    Args:
+        `path`: Path of the document.
+        `filename`: Original file name, if known.
+
+    Yields:
+        str: Consecutive pieces of the document's text.
+
+    Raises:
+        UnsupportedDocumentError: If the format is not supported or the file is corrupt.
+    """
+    kind = detect_format(path, filename)
+    if kind == "pdf":
+        yield from iter_pdf_text(path)
+    elif kind == "docx":
+        yield from iter_docx_text(path)
+    else:
+        yield from iter_plain_text(path)
+
+
+def iter_plain_text(path: Path) -> Iterator[str]:
+    """
+    Decode a UTF-8 text file slice by slice from a memory map.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    with _mapped(path) as data:
+        for start in range(0, len(data), TEXT_SLICE_SIZE):
+            stop = start + TEXT_SLICE_SIZE
+            yield decoder.decode(data[start:stop])
+    yield decoder.decode(b"", final=True)
+
+
+def iter_docx_text(path: Path) -> Iterator[str]:
+    """
+    Stream the paragraphs of a DOCX document, parsing its XML incrementally.
+
+    Parsed elements are discarded as soon as each top-level block of the body ends.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open(_DOCX_BODY) as document:
+            depth = 0
+            body = None
+            parts: list[str] = []
+            for event, element in ET.iterparse(document, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2:
+                        body = element
+                    continue
+                depth -= 1
+                tag = element.tag
+                if tag == _WORD + "t":
+                    parts.append(element.text or "")
+                elif tag == _WORD + "tab":
+                    parts.append("\t")
+                elif tag in (_WORD + "br", _WORD + "cr"):
+                    parts.append("\n")
+                elif tag == _WORD + "p":
+                    parts.append("\n")
+                    yield "".join(parts)
+                    parts = []
+                if depth == 2 and body is not None:
+                    body.clear()
+    except (zipfile.BadZipFile, ET.ParseError) as e:
+        raise UnsupportedDocumentError("The DOCX document is corrupt") from e
+
+
+# Tokens of PDF content streams that matter for text: strings, numbers inside TJ arrays,
+# array brackets, and the operators that show text or move to a new line
+_PDF_TOKEN = re.compile(
+    rb"\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]*>|-?(?:\d+\.?\d*|\.\d+)|\[|\]|T[dDJj*]|'|\"|BT|ET",
+    re.DOTALL,
+)
+_PDF_ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+_PDF_OCTAL = re.compile(rb"\\([0-7]{1,3})|\\(.)|\\\r?\n", re.DOTALL)
+_PDF_STREAM = re.compile(rb"(?<!end)stream\r?\n")
+_PDF_SKIPPED = re.compile(rb"/Subtype\s*/Image|/Length[123]\b|/Type\s*/(?:XRef|ObjStm|Metadata)")
+
+
+def _unescape_pdf_string(literal: bytes) -> bytes:
+    def replace(match: re.Match[bytes]) -> bytes:
+        if match.group(1):
+            return bytes([int(match.group(1), 8) & 0xFF])
+        if match.group(2):
+            return _PDF_ESCAPES.get(match.group(2)[0], match.group(2))
+        return b""
+
+    return _PDF_OCTAL.sub(replace, literal)
+
+
+def _decode_pdf_string(token: bytes) -> str:
+    if token.startswith(b"("):
+        raw = _unescape_pdf_string(token[1:-1])
+    else:
+        hex_digits = re.sub(rb"\s", b"", token[1:-1])
+        raw = bytes.fromhex((hex_digits + b"0" * (len(hex_digits) % 2)).decode())
+        # Two-byte glyph ids need the font's CMap to be read; skip anything unprintable
+        if any(byte < 32 for byte in raw):
+            return ""
+    return raw.decode("cp1252", errors="replace")
+
+
+def _content_stream_text(content: bytes) -> str:
+    parts: list[str] = []
+    in_text = False
+    in_array = False
+
+    def new_line() -> None:
+        if parts and parts[-1] != "\n":
+            parts.append("\n")
+
+    for match in _PDF_TOKEN.finditer(content):
+        token = match.group()
+        if token == b"BT":
+            in_text = True
+        elif token == b"ET":
+            in_text = False
+            new_line()
+        elif not in_text:
+            continue
+        elif token[:1] in b"(<":
+            parts.append(_decode_pdf_string(token))
+        elif token == b"[":
+            in_array = True
+        elif token == b"]":
+            in_array = False
+        elif token in (b"Td", b"TD", b"T*", b"'", b'"'):
+            new_line()
+        elif in_array and token[:1] in b"-.0123456789":
+            # Large negative adjustments inside TJ arrays separate words
+            if float(token) < -200:
+                parts.append(" ")
+    return "".join(parts)
+
+
+def _inflate(data: bytes | mmap.mmap, start: int, end: int) -> bytes:
+    inflater = zlib.decompressobj()
+    output = bytearray()
+    for offset in range(start, end, TEXT_SLICE_SIZE):
+        stop = min(offset + TEXT_SLICE_SIZE, end)
+        chunk = data[offset:stop]
+        output += inflater.decompress(chunk, MAX_PDF_STREAM_SIZE - len(output))
+        if len(output) >= MAX_PDF_STREAM_SIZE or inflater.eof:
+            break
+    return bytes(output)
+
+
+def iter_pdf_text(path: Path) -> Iterator[str]:
+    """
+    Extract text from the content streams of a PDF, one stream at a time.
+
+    The file is memory-mapped, so only the stream being decoded is held in memory. This is
+    a lightweight extractor for text-based PDFs: it reads uncompressed and Flate-compressed
+    content streams and decodes strings as WinAnsi text. Scanned pages and fonts that need
+    a CMap produce no text.
+    """
+    with _mapped(path) as data:
+        position = 0
+        while match := _PDF_STREAM.search(data, position):
+            start = match.end()
+            end = data.find(b"endstream", start)
+            if end < 0:
+                break
+            position = end + len(b"endstream")
+
+            header_end = match.start()
+            header_start = max(0, header_end - PDF_HEADER_WINDOW)
+            header = data[header_start:header_end]
+            object_start = header.rfind(b"obj")
+            if object_start >= 0:
+                header = header[object_start:]
+            if _PDF_SKIPPED.search(header):
+                continue
+            if b"/FlateDecode" in header:
+                try:
+                    content = _inflate(data, start, end)
+                except zlib.error:
+                    continue
+            elif b"/Filter" in header:
+                continue
+            else:
+                content = data[start:end]
+
+            text = _content_stream_text(content)
+            if text.strip():
+                yield text
@@ -1,14 +1,31 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 import asyncpg  # type: ignore
-from fastapi import FastAPI, HTTPException
+import socketio  # type: ignore
+from fastapi import APIRouter, FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import OperationalError
 
-from app.api import auth, user
+from app.api import auth, game, generation, leaderboard, quiz, user
+from app.core import metrics
 from app.core.config import settings
-from app.db import check_db_connection, init_db
+from app.core.logging import configure_logging, shutdown_logging
+from app.db import check_db_connection, dispose_engines, init_db, partitions
+from app.services import (
+    auth_service,
+    export_service,
+    generation_service,
+    google_auth,
+    quiz_stats_service,
+    token_service,
+)
+from app.utils.serialization import FastJSONResponse
+from app.websocket.handlers import create_sio
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -26,47 +43,116 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         None: This context manager does not produce any values.
     """
-
-    print("Creating tables and initializing DB...")
+    configure_logging()
+    logger.info("Creating tables and initializing DB...")
     try:
         await init_db()
-        print("Database initialized and tables created!")
+        logger.info("Database initialized and tables created!")
     except (OperationalError, asyncpg.exceptions.ConnectionDoesNotExistError, OSError) as e:
-        print(
-            "\n🛑 ERROR: COULD NOT CONNECT TO THE DATABASE. Is your Postgres container running?\n"
+        logger.error(
+            "COULD NOT CONNECT TO THE DATABASE. Is your Postgres container running?",
+            extra={"error": str(e)},
         )
-        print(f"Error details: {e}\n")
-    yield
-    # Shutdown logic here if needed
-    print("FastAPI application has shutdown.")
-
-
-app = FastAPI(
-    title="Doqu API", description="Real-time quiz platform API", version="1.0.0", lifespan=lifespan
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth.router, prefix="/api")
-app.include_router(user.router, prefix="/api")
-
 
-@app.get("/")
+    counter_flusher = asyncio.create_task(quiz_stats_service.run_counter_flusher())
+    revocation_sync = asyncio.create_task(token_service.run_revocation_sync())
+    partition_maintenance = asyncio.create_task(partitions.run_partition_maintenance())
+    await generation_service.generation_queue.start(settings.GENERATION_WORKERS)
+    yield
+    await generation_service.generation_queue.stop()
+    counter_flusher.cancel()
+    revocation_sync.cancel()
+    partition_maintenance.cancel()
+    with suppress(asyncio.CancelledError):
+        await counter_flusher
+    with suppress(asyncio.CancelledError):
+        await revocation_sync
+    with suppress(asyncio.CancelledError):
+        await partition_maintenance
+    await asyncio.to_thread(export_service.shutdown_export_pool)
+    await asyncio.to_thread(auth_service.shutdown_hash_pool)
+    await google_auth.google_key_cache.close()
+    await dispose_engines()
+    logger.info("FastAPI application has shutdown.")
+    shutdown_logging()
+
+
+# --- Service Routes --- #
+service_router = APIRouter()
+
+
+@service_router.get("/")
 async def root() -> dict[str, str]:
     return {"message": "Welcome to Doqu API", "version": "1.0.0"}
 
 
-@app.get("/health")
+@service_router.get("/metrics", include_in_schema=False)
+async def read_metrics() -> Response:
+    """
+    Expose the request, database and password hashing metrics of this process in the
+    Prometheus text format.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@service_router.get("/health")
 async def health_check() -> dict[str, str]:
     if await check_db_connection():
         return {"status": "ok", "database_connection": "successful"}
     else:
         raise HTTPException(status_code=503, detail="Database connection failed")
+
+
+# --- Application Factory --- #
+def create_app() -> FastAPI:
+    """
+    Build the API application.
+
+    Called once per process, by the import of this module. gunicorn workers import it after
+    they are forked (see `gunicorn.conf.py`), so that the Socket.IO server and everything
+    started in the lifespan belong to that worker. With `--preload` the app is built once
+    before forking instead, and only the lifespan runs per worker. Database pools are reset
+    in forked processes by `app.db.engine`.
+
+    Returns:
+        The FastAPI application, serving Socket.IO at `/socket.io`.
+    """
+    app = FastAPI(
+        title="Doqu API",
+        description="Real-time quiz platform API",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Record request metrics, outermost so that the latency covers every other middleware
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engines()
+        app.add_middleware(metrics.MetricsMiddleware, routes=lambda: app.routes)
+
+    # Include routers
+    app.include_router(auth.router, prefix="/api")
+    app.include_router(user.router, prefix="/api")
+    app.include_router(quiz.router, prefix="/api")
+    app.include_router(game.router, prefix="/api")
+    app.include_router(generation.router, prefix="/api")
+    app.include_router(leaderboard.router, prefix="/api")
+    app.include_router(service_router)
+
+    app.mount("/socket.io", socketio.ASGIApp(create_sio(), socketio_path=""))
+    return app
+
+
+# Application for `uvicorn app.main:app`, gunicorn and the tests
+app = create_app()
@@ -0,0 +1,256 @@
+"""
+Flag operations in new Alembic migrations that lock populated tables.
+
+Usage (from `backend/`):
+    python -m app.migration_lint
+
+Only `upgrade()` of revisions after `BASELINE_REVISION` is checked, and operations on tables
+created earlier in the same `upgrade()` are allowed, as those tables are still empty. Add a
+`# migration-lint: ignore` comment to an operation known to be safe, such as one on a
+table that stays small.
+"""
+
+import argparse
+import ast
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+# Migrations up to this one predate the check
+BASELINE_REVISION = "b7d3f0a2c614"
+VERSIONS_DIR = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+IGNORE_COMMENT = "migration-lint: ignore"
+
+# Raw SQL passed to `op.execute`, with the reason it locks
+_SQL_RULES = [
+    (
+        re.compile(r"\bCREATE\s+(UNIQUE\s+)?INDEX\b(?!\s+CONCURRENTLY)", re.IGNORECASE),
+        "CREATE INDEX blocks writes while the index builds; use create_index_concurrently",
+    ),
+    (
+        re.compile(r"\bALTER\s+COLUMN\b.*\bTYPE\b", re.IGNORECASE | re.DOTALL),
+        "changing a column type rewrites the table; add a new column and backfill it",
+    ),
+    (
+        re.compile(r"\bSET\s+NOT\s+NULL\b", re.IGNORECASE),
+        "SET NOT NULL scans the table under an exclusive lock; use add_not_null",
+    ),
+    (
+        re.compile(r"^\s*UPDATE\b", re.IGNORECASE),
+        "updating a whole table locks its rows in one transaction; use backfill_in_batches",
+    ),
+]
+
+
+@dataclass(frozen=True)
+class Finding:
+    """
+    Attributes:
+        `path` (Path): The migration file.
+        `line` (int): Line of the operation.
+        `operation` (str): The `op` method called.
+        `message` (str): Why the operation locks, and what to use instead.
+    """
+
+    path: Path
+    line: int
+    operation: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: op.{self.operation}: {self.message}"
+
+
+# --- Helper Functions --- #
+def _keyword(call: ast.Call, name: str) -> Optional[ast.expr]:
+    return next((kw.value for kw in call.keywords if kw.arg == name), None)
+
+
+def _is_true(node: Optional[ast.expr]) -> bool:
+    return isinstance(node, ast.Constant) and node.value is True
+
+
+def _is_false(node: Optional[ast.expr]) -> bool:
+    return isinstance(node, ast.Constant) and node.value is False
+
+
+def _string_arg(call: ast.Call, position: int, name: str) -> Optional[str]:
+    node = call.args[position] if len(call.args) > position else _keyword(call, name)
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def _op_calls(function: ast.FunctionDef) -> Iterator[tuple[str, ast.Call]]:
+    # Walks in source order, so tables are created before the operations using them
+    calls = [
+        node
+        for node in ast.walk(function)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "op"
+    ]
+    for call in sorted(calls, key=lambda call: (call.lineno, call.col_offset)):
+        assert isinstance(call.func, ast.Attribute)
+        yield call.func.attr, call
+
+
+def check_operation(operation: str, call: ast.Call) -> Optional[str]:
+    """
+    Return why an `op` call locks a populated table, or None if it does not.
+    """
+    if operation == "create_index" and not _is_true(_keyword(call, "postgresql_concurrently")):
+        return "blocks writes while the index builds; use create_index_concurrently"
+    if operation == "alter_column":
+        if _keyword(call, "type_") is not None:
+            return "rewrites the table; add a new column and backfill it (expand/contract)"
+        if _is_false(_keyword(call, "nullable")):
+            return "scans the table under an exclusive lock; use add_not_null"
+    if operation == "add_column" and len(call.args) > 1 and isinstance(call.args[1], ast.Call):
+        column = call.args[1]
+        if _is_false(_keyword(column, "nullable")) and not _keyword(column, "server_default"):
+            return (
+                "a NOT NULL column without a default fails on populated tables; add it "
+                "nullable, backfill it and use add_not_null"
+            )
+    if operation == "create_foreign_key" and not _is_true(_keyword(call, "postgresql_not_valid")):
+        return "checks every row while blocking writes; use add_foreign_key"
+    if operation == "create_check_constraint" and not _is_true(
+        _keyword(call, "postgresql_not_valid")
+    ):
+        return "checks every row under an exclusive lock; add it NOT VALID, then validate it"
+    if operation in ("create_unique_constraint", "create_primary_key"):
+        return "builds an index while blocking writes; create a unique index concurrently first"
+    if operation == "execute" and call.args:
+        sql = call.args[0]
+        if isinstance(sql, ast.Constant) and isinstance(sql.value, str):
+            for pattern, message in _SQL_RULES:
+                if pattern.search(sql.value):
+                    return message
+    return None
+
+
+# Position and keyword name of the table argument of operations that take one
+_TABLE_ARGUMENT = {
+    "create_index": (1, "table_name"),
+    "alter_column": (0, "table_name"),
+    "add_column": (0, "table_name"),
+    "create_foreign_key": (1, "source_table"),
+    "create_check_constraint": (1, "table_name"),
+    "create_unique_constraint": (1, "table_name"),
+    "create_primary_key": (1, "table_name"),
+}
+
+
+def lint_source(source: str, path: Path) -> list[Finding]:
+    """
+    Lint the `upgrade()` of one migration.
+
+    Args:
+        `source`: The migration's source code.
+        `path`: The migration's path, for the findings.
+
+    Returns:
+        The locking operations, in source order.
+    """
+    tree = ast.parse(source, filename=str(path))
+    lines = source.splitlines()
+    upgrade = next(
+        (
+            node
+            for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name == "upgrade"
+        ),
+        None,
+    )
+    if upgrade is None:
+        return []
+
+    created_tables: set[str] = set()
+    findings = []
+    for operation, call in _op_calls(upgrade):
+        if operation == "create_table":
+            table = _string_arg(call, 0, "table_name")
+            if table:
+                created_tables.add(table)
+            continue
+        table_argument = _TABLE_ARGUMENT.get(operation)
+        if table_argument and _string_arg(call, *table_argument) in created_tables:
+            continue
+        message = check_operation(operation, call)
+        first, last = call.lineno - 1, call.end_lineno or call.lineno
+        ignored = any(IGNORE_COMMENT in line for line in lines[first:last])
+        if message and not ignored:
+            findings.append(Finding(path, call.lineno, operation, message))
+    return findings
+
+
+def _assigned_string(tree: ast.Module, name: str) -> Optional[str]:
+    for node in tree.body:
+        targets: list[ast.expr]
+        if isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        elif isinstance(node, ast.Assign):
+            targets = node.targets
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == name for target in targets):
+            value = node.value
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                return value.value
+    return None
+
+
+def new_migrations(versions_dir: Path, baseline: Optional[str]) -> list[Path]:
+    """
+    List the migrations that are not the baseline revision or one of its ancestors.
+    """
+    parents: dict[str, Optional[str]] = {}
+    paths: dict[str, Path] = {}
+    for path in sorted(versions_dir.glob("*.py")):
+        tree = ast.parse(path.read_text(), filename=str(path))
+        revision = _assigned_string(tree, "revision")
+        if revision:
+            parents[revision] = _assigned_string(tree, "down_revision")
+            paths[revision] = path
+
+    grandfathered = set()
+    revision = baseline
+    while revision is not None and revision in parents:
+        grandfathered.add(revision)
+        revision = parents[revision]
+    return [path for revision, path in paths.items() if revision not in grandfathered]
+
+
+def lint_migrations(
+    versions_dir: Path = VERSIONS_DIR, baseline: Optional[str] = BASELINE_REVISION
+) -> list[Finding]:
+    """
+    Lint every migration after the baseline revision.
+    """
+    findings = []
+    for path in new_migrations(versions_dir, baseline):
+        findings.extend(lint_source(path.read_text(), path))
+    return findings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag locking operations in migrations.")
+    parser.add_argument("--versions", type=Path, default=VERSIONS_DIR)
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_REVISION,
+        help="last revision exempt from the check; 'none' to check every migration",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None if args.baseline.lower() == "none" else args.baseline
+    findings = lint_migrations(args.versions, baseline)
+    for finding in findings:
+        print(finding)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,24 @@
 from sqlmodel import SQLModel
 
-from .user import User
+from .analytics import PlayerQuizStats, PlayerStats, QuestionStats
+from .game import Game, GameAnswer, GameEvent
+from .generation import GenerationJob
+from .quiz import Quiz, QuizComment, QuizRating
+from .user import RefreshToken, TokenRevocation, User
 
 __all__ = [
+    "Game",
+    "GameAnswer",
+    "GameEvent",
+    "GenerationJob",
+    "PlayerQuizStats",
+    "PlayerStats",
+    "QuestionStats",
+    "Quiz",
+    "QuizComment",
+    "QuizRating",
+    "RefreshToken",
+    "TokenRevocation",
     "User",
 ]
 
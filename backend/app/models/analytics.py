@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import JSON, Column, DateTime, Index
+from sqlmodel import Field, SQLModel
+
+
+# --- SQLModel Tables --- #
+class QuestionStats(SQLModel, table=True):
+    """
+    Rollup of every recorded answer to one question of one quiz version.
+
+    Stores sufficient statistics rather than final metrics, so each finished game can be
+    merged in by addition. `score_*` sums pair each answer's correctness with the player's
+    score fraction in that game, for the point-biserial discrimination index.
+    """
+
+    __tablename__ = "question_stats"
+
+    quiz_id: uuid.UUID = Field(foreign_key="quizzes.id", primary_key=True)
+    content_hash: str = Field(primary_key=True)
+    question_index: int = Field(primary_key=True)
+    attempts: int = Field(default=0, nullable=False)
+    correct: int = Field(default=0, nullable=False)
+    time_sum_ms: float = Field(default=0.0, nullable=False)
+    time_sq_sum_ms: float = Field(default=0.0, nullable=False)
+    score_sum: float = Field(default=0.0, nullable=False)
+    score_sq_sum: float = Field(default=0.0, nullable=False)
+    score_correct_sum: float = Field(default=0.0, nullable=False)
+    time_histogram: list[int] = Field(
+        default_factory=list, sa_column=Column(JSON(), nullable=False)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class PlayerQuizStats(SQLModel, table=True):
+    """
+    Rollup of one player's answers across every game of one quiz.
+
+    Also the quiz's all-time leaderboard, read in `total_points` order from its index.
+    """
+
+    __tablename__ = "player_quiz_stats"
+    __table_args__ = (
+        Index("ix_player_quiz_stats_quiz_id_total_points", "quiz_id", "total_points", "user_id"),
+    )
+
+    quiz_id: uuid.UUID = Field(foreign_key="quizzes.id", primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    games_played: int = Field(default=0, nullable=False)
+    answered: int = Field(default=0, nullable=False)
+    correct: int = Field(default=0, nullable=False)
+    total_points: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class PlayerStats(SQLModel, table=True):
+    """
+    Rollup of one player's answers across every game, backing the global leaderboard.
+
+    Equals the sum of the player's `PlayerQuizStats` rows; `leaderboard_service` can
+    rebuild it from them.
+    """
+
+    __tablename__ = "player_stats"
+    __table_args__ = (Index("ix_player_stats_total_points", "total_points", "user_id"),)
+
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    games_played: int = Field(default=0, nullable=False)
+    total_points: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+# --- Response Models --- #
+class QuestionAnalytics(BaseModel):
+    """
+    Pydantic model for the analytics of one question.
+
+    Attributes:
+        question_index (int): Zero-based index of the question.
+        attempts (int): Number of recorded answers.
+        difficulty (float): Fraction of correct answers; lower means harder.
+        discrimination (Optional[float]): Point-biserial correlation between answering
+            correctly and the player's game score; None when undefined.
+        mean_time_ms (float): Mean time to answer.
+        stddev_time_ms (float): Standard deviation of the time to answer.
+        median_time_ms (Optional[float]): Median time to answer, estimated from the histogram.
+        p90_time_ms (Optional[float]): 90th percentile of the time to answer, estimated.
+        time_histogram (list[int]): Answer counts per `time_bucket_edges_ms` bucket.
+    """
+
+    question_index: int
+    attempts: int
+    difficulty: float
+    discrimination: Optional[float]
+    mean_time_ms: float
+    stddev_time_ms: float
+    median_time_ms: Optional[float]
+    p90_time_ms: Optional[float]
+    time_histogram: list[int]
+
+
+class PlayerAnalytics(BaseModel):
+    """
+    Pydantic model for one player's accuracy on a quiz.
+    """
+
+    user_id: uuid.UUID
+    games_played: int
+    answered: int
+    accuracy: float
+    total_points: int
+
+
+class QuizAnalytics(BaseModel):
+    """
+    Pydantic model for the host dashboard analytics of a quiz's current version.
+    """
+
+    quiz_id: uuid.UUID
+    content_hash: str
+    time_bucket_edges_ms: list[int]
+    questions: list[QuestionAnalytics]
+    players: list[PlayerAnalytics]
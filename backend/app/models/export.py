@@ -0,0 +1,29 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PaperSize(str, Enum):
+    """
+    Supported worksheet paper sizes.
+    """
+
+    A4 = "a4"
+    LETTER = "letter"
+
+
+class WorksheetOptions(BaseModel):
+    """
+    Pydantic model for the formatting options of a printable worksheet.
+
+    Attributes:
+        paper (PaperSize): Page size, default is A4.
+        font_size (int): Body font size in points, between 9 and 16.
+        include_answers (bool): Whether to append an answer key, default is False.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    paper: PaperSize = PaperSize.A4
+    font_size: int = Field(default=11, ge=9, le=16)
+    include_answers: bool = False
@@ -0,0 +1,197 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from sqlalchemy import Column, DateTime, Index, String
+from sqlmodel import Field, SQLModel
+
+# Most answers accepted in one sync batch
+MAX_SYNC_BATCH_SIZE = 1000
+
+
+class SyncStatus(str, Enum):
+    """
+    Outcome of one synced answer.
+    """
+
+    ACCEPTED = "accepted"
+    DUPLICATE = "duplicate"
+    REJECTED = "rejected"
+
+
+class GameEventType(str, Enum):
+    """
+    Kind of a recorded game event.
+    """
+
+    STARTED = "started"
+    FINISHED = "finished"
+
+
+# --- SQLModel Tables --- #
+class Game(SQLModel, table=True):
+    """
+    Represents one play of a quiz, hosted by a user.
+
+    `content_hash` pins the quiz version being played, so the game keeps using the same
+    compiled `GamePack` even if the quiz is edited while it runs.
+    """
+
+    __tablename__ = "games"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    quiz_id: uuid.UUID = Field(foreign_key="quizzes.id", index=True, nullable=False)
+    host_id: uuid.UUID = Field(foreign_key="users.id", index=True, nullable=False)
+    content_hash: str = Field(nullable=False)
+    started_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    ended_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class GameAnswer(SQLModel, table=True):
+    """
+    Represents a player's graded answer to one question of a game.
+
+    Each player answers each question of a game at most once.
+
+    On PostgreSQL the table is partitioned by month of `game_started_at` (see
+    `app.db.partitions`), so a game's answers share a partition and queries filtering on
+    it only scan that month. Unique keys must include the partition key; as it is the same
+    for every answer of a game, they stay unique per game.
+    """
+
+    __tablename__ = "game_answers"
+    __table_args__ = (
+        Index(
+            "ix_game_answers_user_id_idempotency_key",
+            "user_id",
+            "idempotency_key",
+            "game_started_at",
+            unique=True,
+        ),
+        {"postgresql_partition_by": "RANGE (game_started_at)"},
+    )
+
+    game_id: uuid.UUID = Field(foreign_key="games.id", primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    question_index: int = Field(primary_key=True)
+    # Copy of `Game.started_at`, the partition key
+    game_started_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    )
+    answer: str = Field(nullable=False)
+    is_correct: bool = Field(nullable=False)
+    points: int = Field(nullable=False)
+    elapsed_ms: int = Field(nullable=False)
+    # Client-generated key of answers synced in bulk, so that retried syncs are recognized
+    idempotency_key: Optional[uuid.UUID] = Field(default=None, nullable=True)
+    answered_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class GameEvent(SQLModel, table=True):
+    """
+    Represents something that happened in a game, kept as the game's history.
+
+    On PostgreSQL the table is partitioned by month of `occurred_at` (see
+    `app.db.partitions`); old months are dropped whole.
+    """
+
+    __tablename__ = "game_events"
+    __table_args__ = {"postgresql_partition_by": "RANGE (occurred_at)"}
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    occurred_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), primary_key=True, nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    game_id: uuid.UUID = Field(foreign_key="games.id", index=True, nullable=False)
+    user_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id", nullable=True)
+    type: GameEventType = Field(sa_column=Column(String(16), nullable=False))
+
+
+# --- Request Models --- #
+class AnswerSubmit(BaseModel):
+    """
+    Pydantic model for submitting an answer to a question of a running game.
+    """
+
+    question_index: int = PydanticField(ge=0)
+    answer: str = PydanticField(max_length=500)
+    elapsed_ms: int = PydanticField(ge=0)
+
+
+class AnswerSyncItem(AnswerSubmit):
+    """
+    Pydantic model for one answer given offline, synced later in a batch.
+    """
+
+    idempotency_key: uuid.UUID
+    game_id: uuid.UUID
+
+
+class AnswerSyncBatch(BaseModel):
+    """
+    Pydantic model for a batch of answers given offline.
+    """
+
+    items: list[AnswerSyncItem] = PydanticField(min_length=1, max_length=MAX_SYNC_BATCH_SIZE)
+
+
+# --- Response Models --- #
+class GameRead(BaseModel):
+    """
+    Pydantic model for reading a game.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    quiz_id: uuid.UUID
+    host_id: uuid.UUID
+    content_hash: str
+    question_count: int
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+
+
+class AnswerResult(BaseModel):
+    """
+    Pydantic model for the grading result of a submitted answer.
+    """
+
+    question_index: int
+    is_correct: bool
+    points: int
+
+
+class AnswerSyncItemResult(BaseModel):
+    """
+    Pydantic model for the outcome of one synced answer.
+
+    Accepted and duplicate answers carry their grading; a duplicate was already stored by
+    an earlier sync with the same idempotency key. Rejected answers carry the reason.
+    """
+
+    idempotency_key: uuid.UUID
+    status: SyncStatus
+    is_correct: Optional[bool] = None
+    points: Optional[int] = None
+    error: Optional[str] = None
+
+
+class AnswerSyncResult(BaseModel):
+    """
+    Pydantic model for the outcome of a sync batch, in the order of the submitted items.
+    """
+
+    results: list[AnswerSyncItemResult]
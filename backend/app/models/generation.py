@@ -0,0 +1,127 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from sqlalchemy import JSON, Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+from app.models.quiz import QuestionType, QuizContent
+
+
+class JobStatus(str, Enum):
+    """
+    Lifecycle of a generation job.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+# --- SQLModel Tables --- #
+class GenerationJob(SQLModel, table=True):
+    """
+    Represents a request to generate a quiz with the AI model, processed in the background.
+
+    `prompt_hash` identifies the normalized request; a succeeded job doubles as the cached
+    result for every later request with the same hash.
+    """
+
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        Index("ix_generation_jobs_prompt_hash_status", "prompt_hash", "status"),
+        Index("ix_generation_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="users.id", index=True, nullable=False)
+    status: JobStatus = Field(
+        default=JobStatus.QUEUED, sa_column=Column(String(16), nullable=False)
+    )
+    prompt_hash: str = Field(nullable=False)
+    request: dict[str, Any] = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+    )
+    progress: int = Field(default=0, nullable=False)
+    message: Optional[str] = Field(default=None, nullable=True)
+    result: Optional[dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True),
+    )
+    error: Optional[str] = Field(default=None, nullable=True)
+    cached: bool = Field(default=False, nullable=False)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    started_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+# --- Request Models --- #
+class GenerationRequest(BaseModel):
+    """
+    Pydantic model for requesting an AI-generated quiz.
+
+    Attributes:
+        topic (str): What the quiz should be about.
+        source_text (Optional[str]): Reference material the questions must be based on.
+        question_count (int): Number of questions to generate, between 1 and 30.
+        question_type (Optional[QuestionType]): Restrict questions to one type; mixed if None.
+    """
+
+    topic: str = PydanticField(min_length=1, max_length=2000)
+    source_text: Optional[str] = PydanticField(default=None, max_length=100_000)
+    question_count: int = PydanticField(default=10, ge=1, le=30)
+    question_type: Optional[QuestionType] = None
+
+
+# --- Response Models --- #
+class GenerationJobRead(BaseModel):
+    """
+    Pydantic model for polling a generation job.
+
+    `result` holds the generated quiz once the job has succeeded; it can be saved as is
+    through the quiz creation endpoint.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    status: JobStatus
+    progress: int
+    message: Optional[str] = None
+    result: Optional[QuizContent] = None
+    error: Optional[str] = None
+    cached: bool
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class DocumentIngestionRead(BaseModel):
+    """
+    Pydantic model for the result of uploading a document to generate quizzes from.
+
+    Attributes:
+        filename (str): Name of the uploaded file.
+        size_bytes (int): Size of the uploaded file.
+        characters (int): Number of characters of text used for generation.
+        truncated (bool): Whether the document had more text than could be used.
+        jobs (list[GenerationJobRead]): One generation job per chunk of the document.
+    """
+
+    filename: str
+    size_bytes: int
+    characters: int
+    truncated: bool
+    jobs: list[GenerationJobRead]
@@ -0,0 +1,39 @@
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Most entries returned by one leaderboard request
+MAX_LEADERBOARD_SIZE = 100
+
+
+# --- Response Models --- #
+class LeaderboardEntry(BaseModel):
+    """
+    Pydantic model for one player's standing on a leaderboard.
+
+    Attributes:
+        rank (int): 1 for the most points; tied players share the best rank of the tie.
+        user_id (uuid.UUID): UUID of the player.
+        username (Optional[str]): The player's username; None if the user no longer exists.
+        total_points (int): Points scored across every counted game.
+    """
+
+    rank: int
+    user_id: uuid.UUID
+    username: Optional[str] = None
+    total_points: int
+
+
+class Leaderboard(BaseModel):
+    """
+    Pydantic model for the top of an all-time leaderboard.
+
+    Attributes:
+        quiz_id (Optional[uuid.UUID]): The quiz of a per-quiz leaderboard, None for the
+            global one.
+        entries (list[LeaderboardEntry]): The leading players, best first.
+    """
+
+    quiz_id: Optional[uuid.UUID] = None
+    entries: list[LeaderboardEntry]
@@ -0,0 +1,281 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+from pydantic import Field as PydanticField
+from pydantic import model_validator
+from sqlalchemy import DDL, JSON, Column, DateTime, Index, String, Text, event, inspect
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlmodel import Field, SQLModel
+
+from app.utils.pagination import CursorPage
+
+
+class QuestionType(str, Enum):
+    """
+    Supported question formats.
+    """
+
+    MULTIPLE_CHOICE = "multiple_choice"
+    TRUE_FALSE = "true_false"
+
+
+# --- SQLModel Tables --- #
+class Quiz(SQLModel, table=True):
+    """
+    Represents a quiz in the database.
+
+    Questions are stored as a JSON document validated by `QuizContent`. On PostgreSQL the
+    `search_vector` column is maintained by a trigger on every insert or update, and is
+    GIN-indexed for full-text search over titles, descriptions and question text.
+    """
+
+    __tablename__ = "quizzes"
+    __table_args__ = (
+        Index("ix_quizzes_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_quizzes_tags", "tags", postgresql_using="gin"),
+        Index("ix_quizzes_created_at_id", "created_at", "id"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="users.id", index=True, nullable=False)
+    title: str = Field(nullable=False)
+    description: Optional[str] = Field(default=None, nullable=True)
+    questions: list[dict[str, Any]] = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+    )
+    question_count: int = Field(default=0, nullable=False)
+    tags: list[str] = Field(
+        default_factory=list,
+        sa_column=Column(ARRAY(String()).with_variant(JSON(), "sqlite"), nullable=False),
+    )
+    is_public: bool = Field(default=True, nullable=False)
+    version: int = Field(default=1, nullable=False)
+
+    # Denormalized counters, maintained incrementally by `quiz_stats_service`
+    average_rating: float = Field(default=0.0, nullable=False, index=True)
+    rating_count: int = Field(default=0, nullable=False)
+    rating_total: int = Field(default=0, nullable=False)
+    play_count: int = Field(default=0, nullable=False)
+    comment_count: int = Field(default=0, nullable=False)
+
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True),
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+# Keeps `quizzes.search_vector` up to date on write. Mirrored in the Alembic migration
+# that creates the table, so databases built by `init_db` and by migrations match.
+QUIZ_SEARCH_VECTOR_FUNCTION = DDL("""
+    CREATE OR REPLACE FUNCTION quizzes_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT string_agg(q ->> 'question_text', ' ')
+                 FROM jsonb_array_elements(NEW.questions) AS q), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+QUIZ_SEARCH_VECTOR_TRIGGER = DDL("""
+    CREATE TRIGGER quizzes_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, questions ON quizzes
+    FOR EACH ROW EXECUTE FUNCTION quizzes_search_vector_update()
+    """)
+event.listen(
+    inspect(Quiz).local_table,
+    "after_create",
+    QUIZ_SEARCH_VECTOR_FUNCTION.execute_if(dialect="postgresql"),
+)
+event.listen(
+    inspect(Quiz).local_table,
+    "after_create",
+    QUIZ_SEARCH_VECTOR_TRIGGER.execute_if(dialect="postgresql"),
+)
+
+
+class QuizRating(SQLModel, table=True):
+    """
+    Represents a user's rating of a quiz, from 1 to 5. Each user rates a quiz at most once.
+    """
+
+    __tablename__ = "quiz_ratings"
+
+    quiz_id: uuid.UUID = Field(foreign_key="quizzes.id", primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    score: int = Field(nullable=False, ge=1, le=5)
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class QuizComment(SQLModel, table=True):
+    """
+    Represents a comment left on a quiz.
+    """
+
+    __tablename__ = "quiz_comments"
+    __table_args__ = (Index("ix_quiz_comments_quiz_id_created_at", "quiz_id", "created_at"),)
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    quiz_id: uuid.UUID = Field(foreign_key="quizzes.id", nullable=False)
+    user_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    body: str = Field(nullable=False)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+# --- Content Models --- #
+class QuestionContent(BaseModel):
+    """
+    Pydantic model for a single quiz question, including its correct answer.
+
+    Validates that the correct answer is one of the options for multiple choice questions
+    and is either "true" or "false" for true/false questions.
+    """
+
+    question_text: str = PydanticField(min_length=1)
+    question_type: QuestionType
+    options: list[str] = PydanticField(default_factory=list)
+    correct_answer: str
+    points: int = PydanticField(default=10, ge=0)
+    time_limit_seconds: int = PydanticField(default=20, gt=0, le=600)
+
+    @model_validator(mode="after")
+    def check_correct_answer(self) -> "QuestionContent":
+        if self.question_type == QuestionType.MULTIPLE_CHOICE:
+            if len(self.options) < 2:
+                raise ValueError("Multiple choice questions need at least two options")
+            if self.correct_answer not in self.options:
+                raise ValueError("correct_answer must be one of the options")
+        elif self.correct_answer.strip().lower() not in ("true", "false"):
+            raise ValueError("correct_answer must be 'true' or 'false'")
+        return self
+
+
+class QuizContent(BaseModel):
+    """
+    Pydantic model for the playable content of a quiz: its title, description and questions.
+
+    This is the unit that gets compiled into a `GamePack` when a game starts.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    title: str = PydanticField(min_length=1, max_length=200)
+    description: Optional[str] = None
+    questions: list[QuestionContent] = PydanticField(min_length=1)
+
+
+# --- Request Models --- #
+class QuizCreate(QuizContent):
+    """
+    Pydantic model for creating or replacing a quiz.
+    """
+
+    tags: list[str] = PydanticField(default_factory=list, max_length=20)
+    is_public: bool = True
+
+
+class QuizRatingCreate(BaseModel):
+    """
+    Pydantic model for rating a quiz.
+    """
+
+    score: int = PydanticField(ge=1, le=5)
+
+
+class QuizCommentCreate(BaseModel):
+    """
+    Pydantic model for commenting on a quiz.
+    """
+
+    body: str = PydanticField(min_length=1, max_length=2000)
+
+
+# --- Response Models --- #
+class QuizRead(QuizCreate):
+    """
+    Pydantic model for reading a full quiz, including its questions and answers.
+
+    Only returned to the quiz owner.
+    """
+
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    version: int
+    average_rating: float
+    rating_count: int
+    play_count: int
+    comment_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class QuizSummary(BaseModel):
+    """
+    Pydantic model for a quiz card on the community dashboard, without questions.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    title: str
+    description: Optional[str]
+    tags: list[str]
+    question_count: int
+    average_rating: float
+    rating_count: int
+    play_count: int
+    comment_count: int
+    created_at: datetime
+
+
+class QuizSearchPage(CursorPage[QuizSummary]):
+    """
+    Pydantic model for one page of quiz search results, best match first.
+    """
+
+
+class QuizRatingRead(BaseModel):
+    """
+    Pydantic model for reading a user's rating of a quiz.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    quiz_id: uuid.UUID
+    user_id: uuid.UUID
+    score: int
+    updated_at: datetime
+
+
+class QuizCommentRead(BaseModel):
+    """
+    Pydantic model for reading a quiz comment.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    quiz_id: uuid.UUID
+    user_id: uuid.UUID
+    body: str
+    created_at: datetime
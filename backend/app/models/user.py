@@ -30,6 +30,47 @@ class User(SQLModel, table=True):
     )  # lambda called independently for every row insertion
 
 
+class RefreshToken(SQLModel, table=True):
+    """
+    Represents a refresh token issued at login, stored as the SHA-256 hash of its secret.
+
+    Each use replaces the token with a new one of the same `family_id`. Presenting a token
+    that was already used revokes its whole family, as one of its holders must have stolen it.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", index=True, nullable=False)
+    family_id: uuid.UUID = Field(index=True, nullable=False)
+    token_hash: str = Field(unique=True, index=True, nullable=False)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    used_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    revoked_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class TokenRevocation(SQLModel, table=True):
+    """
+    Represents the revocation of a user's access tokens: those issued before `not_before`
+    are rejected.
+    """
+
+    __tablename__ = "token_revocations"
+
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    not_before: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+
+
 # --- Request Models --- #
 class UserCreate(BaseModel):
     """
@@ -88,13 +129,27 @@ class GoogleLogin(BaseModel):
     google_id_token: str
 
 
+class RefreshRequest(BaseModel):
+    """
+    Pydantic model for exchanging or revoking a `refresh_token`.
+    """
+
+    refresh_token: str
+
+
 class Token(BaseModel):
     """
     Pydantic model for authenticating users.
+
+    The short-lived `access_token` authenticates requests; the `refresh_token` is exchanged
+    at `/api/auth/refresh` for a new pair before the access token expires in `expires_in`
+    seconds.
     """
 
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class TokenData(BaseModel):
@@ -104,3 +159,4 @@ class TokenData(BaseModel):
 
     user_id: uuid.UUID
     email: EmailStr
+    issued_at: Optional[float] = None
@@ -0,0 +1,33 @@
+"""
+Recompute the global player totals from the per-quiz rollups and rewrite the Redis
+leaderboards from the database.
+
+Run it after Redis loses its data, after enabling `LEADERBOARD_REDIS_URL`, or whenever the
+leaderboards may have drifted (from `backend/`):
+    python -m app.rebuild_leaderboards
+"""
+
+import asyncio
+import sys
+
+from app.db import dispose_engines
+from app.db.session import AsyncSessionLocal
+from app.services import leaderboard_service
+
+
+async def rebuild() -> int:
+    try:
+        async with AsyncSessionLocal() as session:
+            return await leaderboard_service.rebuild_leaderboards(session)
+    finally:
+        await dispose_engines()
+
+
+def main() -> int:
+    boards = asyncio.run(rebuild())
+    print(f"Rebuilt player totals and {boards} Redis leaderboards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
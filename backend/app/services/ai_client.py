@@ -0,0 +1,194 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+import httpx
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.models.generation import GenerationRequest
+from app.models.quiz import QuestionType, QuizContent
+
+# Reports job progress as a percentage and a short status message
+ProgressCallback = Callable[[int, str], Awaitable[None]]
+
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+
+class GenerationError(Exception):
+    """
+    Raised when the model cannot produce a valid quiz.
+    """
+
+
+class QuizGenerator(Protocol):
+    """
+    Interface of the AI models that generate quizzes.
+    """
+
+    async def generate(
+        self, request: GenerationRequest, progress: ProgressCallback
+    ) -> QuizContent: ...
+
+
+def build_prompt(request: GenerationRequest) -> str:
+    """
+    Build the instructions sent to the model for a generation request.
+
+    Args:
+        `request`: The generation request.
+
+    Returns:
+        The prompt text.
+    """
+    if request.question_type == QuestionType.TRUE_FALSE:
+        kinds = 'only "true_false" questions'
+    elif request.question_type == QuestionType.MULTIPLE_CHOICE:
+        kinds = 'only "multiple_choice" questions with four options'
+    else:
+        kinds = '"multiple_choice" questions with four options and some "true_false" questions'
+
+    lines = [
+        f"Write a quiz with exactly {request.question_count} questions about: {request.topic}",
+        f"Use {kinds}.",
+        "Respond with a JSON object with the keys title, description and questions. Each "
+        "question has the keys question_text, question_type, options (empty for true_false), "
+        'correct_answer (one of the options, or "true" or "false") and points (10).',
+    ]
+    if request.source_text:
+        lines.append("Base every question only on the following material:")
+        lines.append(request.source_text)
+    return "\n".join(lines)
+
+
+def parse_quiz(text: str, request: GenerationRequest) -> QuizContent:
+    """
+    Validate the JSON quiz returned by a model.
+
+    Args:
+        `text`: The model's response.
+        `request`: The generation request, used to trim extra questions.
+
+    Returns:
+        QuizContent: The generated quiz.
+
+    Raises:
+        GenerationError: If the response is not a valid quiz.
+    """
+    try:
+        quiz = QuizContent.model_validate_json(text)
+    except ValidationError as e:
+        raise GenerationError(f"Model returned an invalid quiz: {e.error_count()} errors") from e
+    quiz.questions = quiz.questions[: request.question_count]
+    return quiz
+
+
+class GeminiQuizGenerator:
+    """
+    Generates quizzes with the Gemini API, requesting a JSON response.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.transport = transport
+
+    async def generate(self, request: GenerationRequest, progress: ProgressCallback) -> QuizContent:
+        body = {
+            "contents": [{"parts": [{"text": build_prompt(request)}]}],
+            "generationConfig": {"responseMimeType": "application/json"},
+        }
+        await progress(20, "Waiting for the model")
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+            try:
+                response = await client.post(
+                    GEMINI_URL.format(model=self.model),
+                    headers={"x-goog-api-key": self.api_key},
+                    json=body,
+                )
+            except httpx.HTTPError as e:
+                raise GenerationError(f"Model request failed: {type(e).__name__}") from e
+        if response.status_code != 200:
+            raise GenerationError(f"Model request failed with status {response.status_code}")
+
+        await progress(80, "Checking the generated quiz")
+        try:
+            text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+        except (ValueError, KeyError, IndexError) as e:
+            raise GenerationError("Model returned no content") from e
+        return parse_quiz(text, request)
+
+
+class FakeQuizGenerator:
+    """
+    Local stand-in for the model that builds predictable quizzes, for tests and development.
+
+    Attributes:
+        `calls` (int): Number of quizzes generated so far.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate(self, request: GenerationRequest, progress: ProgressCallback) -> QuizContent:
+        self.calls += 1
+        questions: list[dict[str, Any]] = []
+        for index in range(request.question_count):
+            await progress(10 + 80 * index // request.question_count, "Writing questions")
+            await asyncio.sleep(self.delay / request.question_count)
+            if request.question_type == QuestionType.TRUE_FALSE:
+                questions.append(
+                    {
+                        "question_text": f"Statement {index + 1} about {request.topic}",
+                        "question_type": "true_false",
+                        "correct_answer": "true" if index % 2 == 0 else "false",
+                    }
+                )
+            else:
+                questions.append(
+                    {
+                        "question_text": f"Question {index + 1} about {request.topic}",
+                        "question_type": "multiple_choice",
+                        "options": ["A", "B", "C", "D"],
+                        "correct_answer": "ABCD"[index % 4],
+                    }
+                )
+        quiz = {"title": request.topic[:200], "description": None, "questions": questions}
+        return parse_quiz(json.dumps(quiz), request)
+
+
+_generator: Optional[QuizGenerator] = None
+
+
+def get_quiz_generator() -> QuizGenerator:
+    """
+    Get the configured quiz generator, creating it on first use.
+
+    Raises:
+        GenerationError: If no AI provider is configured.
+    """
+    global _generator
+    if _generator is None:
+        if settings.AI_PROVIDER == "fake":
+            _generator = FakeQuizGenerator()
+        elif settings.AI_PROVIDER == "gemini" and settings.GOOGLE_API_KEY:
+            _generator = GeminiQuizGenerator(settings.GOOGLE_API_KEY, settings.AI_MODEL)
+        else:
+            raise GenerationError("AI generation is not configured")
+    return _generator
+
+
+def set_quiz_generator(generator: Optional[QuizGenerator]) -> None:
+    """
+    Replace the quiz generator, e.g. with a `FakeQuizGenerator` in tests. None resets it.
+    """
+    global _generator
+    _generator = generator
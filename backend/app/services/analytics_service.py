@@ -0,0 +1,435 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import select as select_columns
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, col, select
+
+from app.game.pack import GamePack
+from app.models.analytics import (
+    PlayerAnalytics,
+    PlayerQuizStats,
+    PlayerStats,
+    QuestionAnalytics,
+    QuestionStats,
+    QuizAnalytics,
+)
+from app.models.game import Game, GameAnswer
+
+# Upper edges of the time-to-answer histogram buckets; the last bucket holds slower answers
+TIME_BUCKET_EDGES_MS = np.array([1000, 2000, 3000, 5000, 7500, 10000, 15000, 20000, 30000])
+TIME_BUCKET_COUNT = len(TIME_BUCKET_EDGES_MS) + 1
+
+# Rows fetched per round trip when loading answers
+LOAD_BATCH_SIZE = 10_000
+
+# Players listed on the dashboard, most points first
+PLAYER_LIMIT = 100
+
+
+@dataclass
+class AnswerColumns:
+    """
+    Answers of one game, loaded column by column into NumPy arrays.
+
+    Attributes:
+        `user_ids`: Distinct player ids; `player` holds indices into this list.
+        `player`: Player index of each answer.
+        `question`: Question index of each answer.
+        `correct`: Whether each answer is correct.
+        `points`: Points earned by each answer.
+        `elapsed_ms`: Time taken by each answer.
+    """
+
+    user_ids: list[uuid.UUID]
+    player: np.ndarray
+    question: np.ndarray
+    correct: np.ndarray
+    points: np.ndarray
+    elapsed_ms: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.question)
+
+
+@dataclass
+class GameMetrics:
+    """
+    Per-question and per-player sums for one game, ready to be added to the rollups.
+    """
+
+    attempts: np.ndarray
+    correct: np.ndarray
+    time_sum_ms: np.ndarray
+    time_sq_sum_ms: np.ndarray
+    score_sum: np.ndarray
+    score_sq_sum: np.ndarray
+    score_correct_sum: np.ndarray
+    time_histogram: np.ndarray
+    player_answered: np.ndarray
+    player_correct: np.ndarray
+    player_points: np.ndarray
+
+
+# --- Loading --- #
+async def load_game_answers(session: AsyncSession, game: Game) -> AnswerColumns:
+    """
+    Load all answers of a game in columnar batches.
+
+    Rows are streamed `LOAD_BATCH_SIZE` at a time and each batch is transposed straight
+    into typed arrays, so no per-answer Python objects outlive their batch. Filtering on the
+    game's start time limits the scan to the partition holding its answers.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game`: The game.
+
+    Returns:
+        AnswerColumns: The answers of the game.
+    """
+    statement = (
+        select_columns(
+            col(GameAnswer.user_id),
+            col(GameAnswer.question_index),
+            col(GameAnswer.is_correct),
+            col(GameAnswer.points),
+            col(GameAnswer.elapsed_ms),
+        )
+        .where(col(GameAnswer.game_id) == game.id)
+        .where(col(GameAnswer.game_started_at) == game.started_at)
+        .execution_options(yield_per=LOAD_BATCH_SIZE)
+    )
+
+    users: list[np.ndarray] = []
+    questions: list[np.ndarray] = []
+    correct: list[np.ndarray] = []
+    points: list[np.ndarray] = []
+    elapsed: list[np.ndarray] = []
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        batch_users, batch_questions, batch_correct, batch_points, batch_elapsed = zip(*partition)
+        users.append(np.array([user_id.bytes for user_id in batch_users], dtype="S16"))
+        questions.append(np.array(batch_questions, dtype=np.int64))
+        correct.append(np.array(batch_correct, dtype=bool))
+        points.append(np.array(batch_points, dtype=np.int64))
+        elapsed.append(np.array(batch_elapsed, dtype=np.float64))
+
+    if not questions:
+        empty = np.empty(0, dtype=np.int64)
+        return AnswerColumns([], empty, empty, empty.astype(bool), empty, empty.astype(float))
+
+    distinct_users, player = np.unique(np.concatenate(users), return_inverse=True)
+    return AnswerColumns(
+        # NumPy strips trailing NUL bytes from S16 items, so pad them back
+        user_ids=[uuid.UUID(bytes=bytes(raw).ljust(16, b"\0")) for raw in distinct_users],
+        player=player.reshape(-1),
+        question=np.concatenate(questions),
+        correct=np.concatenate(correct),
+        points=np.concatenate(points),
+        elapsed_ms=np.concatenate(elapsed),
+    )
+
+
+# --- Metrics --- #
+def compute_game_metrics(answers: AnswerColumns, pack: GamePack) -> GameMetrics:
+    """
+    Reduce the answers of one game to per-question and per-player sums.
+
+    Every metric is a weighted `bincount` over the question or player index, so the cost
+    is a handful of passes over the arrays regardless of the number of players.
+
+    Args:
+        `answers`: The answers of the game.
+        `pack`: The compiled quiz version the game was played with.
+
+    Returns:
+        GameMetrics: Sums to merge into the rollup tables.
+    """
+    question_count = pack.question_count
+    in_range = (answers.question >= 0) & (answers.question < question_count)
+    question = answers.question[in_range]
+    correct = answers.correct[in_range].astype(np.float64)
+    elapsed = answers.elapsed_ms[in_range]
+    player = answers.player[in_range]
+    points = answers.points[in_range]
+    player_count = len(answers.user_ids)
+
+    def per_question(weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(question, weights=weights, minlength=question_count)
+
+    def per_player(weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(player, weights=weights, minlength=player_count)
+
+    player_points = per_player(points.astype(np.float64))
+    # Each answer is paired with its player's score fraction for the whole game
+    if pack.total_points:
+        score = player_points[player] / pack.total_points
+    else:
+        score = np.zeros_like(correct)
+    bucket = np.searchsorted(TIME_BUCKET_EDGES_MS, elapsed, side="right")
+    histogram = np.bincount(
+        question * TIME_BUCKET_COUNT + bucket, minlength=question_count * TIME_BUCKET_COUNT
+    ).reshape(question_count, TIME_BUCKET_COUNT)
+
+    return GameMetrics(
+        attempts=per_question(),
+        correct=per_question(correct),
+        time_sum_ms=per_question(elapsed),
+        time_sq_sum_ms=per_question(elapsed * elapsed),
+        score_sum=per_question(score),
+        score_sq_sum=per_question(score * score),
+        score_correct_sum=per_question(score * correct),
+        time_histogram=histogram,
+        player_answered=per_player(),
+        player_correct=per_player(correct),
+        player_points=player_points,
+    )
+
+
+def _histogram_quantile(histogram: np.ndarray, fraction: float) -> np.ndarray:
+    """
+    Estimate a quantile of each histogram row, interpolating linearly within buckets.
+
+    Rows without answers yield NaN; quantiles in the open last bucket yield its lower edge.
+    """
+    lower = np.concatenate(([0], TIME_BUCKET_EDGES_MS)).astype(np.float64)
+    upper = np.concatenate((TIME_BUCKET_EDGES_MS, [TIME_BUCKET_EDGES_MS[-1]])).astype(np.float64)
+
+    totals = histogram.sum(axis=1)
+    cumulative = np.cumsum(histogram, axis=1)
+    target = totals * fraction
+    bucket = np.argmax(cumulative >= target[:, None], axis=1)
+    rows = np.arange(len(histogram))
+    before = cumulative[rows, bucket] - histogram[rows, bucket]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        within = np.where(
+            histogram[rows, bucket] > 0, (target - before) / histogram[rows, bucket], 0
+        )
+    quantile = lower[bucket] + within * (upper[bucket] - lower[bucket])
+    return np.where(totals > 0, quantile, np.nan)
+
+
+def derive_question_analytics(rows: list[QuestionStats]) -> list[QuestionAnalytics]:
+    """
+    Turn question rollups into dashboard metrics, vectorized across all questions.
+
+    Args:
+        `rows`: Question rollups of one quiz version, in question order.
+
+    Returns:
+        The analytics of each question.
+    """
+    if not rows:
+        return []
+
+    n = np.array([row.attempts for row in rows], dtype=np.float64)
+    sx = np.array([row.correct for row in rows], dtype=np.float64)
+    sy = np.array([row.score_sum for row in rows])
+    sy2 = np.array([row.score_sq_sum for row in rows])
+    sxy = np.array([row.score_correct_sum for row in rows])
+    time_sum = np.array([row.time_sum_ms for row in rows])
+    time_sq_sum = np.array([row.time_sq_sum_ms for row in rows])
+    histogram = np.array(
+        [row.time_histogram or [0] * TIME_BUCKET_COUNT for row in rows], dtype=np.float64
+    )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        difficulty = np.where(n > 0, sx / n, 0.0)
+        mean_time = np.where(n > 0, time_sum / n, 0.0)
+        stddev_time = np.sqrt(np.maximum(np.where(n > 0, time_sq_sum / n, 0.0) - mean_time**2, 0))
+        # Point-biserial correlation from sums; correctness is 0/1 so sum(x^2) == sum(x)
+        denominator = np.sqrt(np.maximum((n * sx - sx**2) * (n * sy2 - sy**2), 0))
+        discrimination = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+    median = _histogram_quantile(histogram, 0.5)
+    p90 = _histogram_quantile(histogram, 0.9)
+
+    def optional(value: float) -> float | None:
+        return None if np.isnan(value) else round(float(value), 4)
+
+    return [
+        QuestionAnalytics(
+            question_index=row.question_index,
+            attempts=row.attempts,
+            difficulty=round(float(difficulty[i]), 4),
+            discrimination=optional(discrimination[i]),
+            mean_time_ms=round(float(mean_time[i]), 1),
+            stddev_time_ms=round(float(stddev_time[i]), 1),
+            median_time_ms=optional(median[i]),
+            p90_time_ms=optional(p90[i]),
+            time_histogram=[int(count) for count in histogram[i]],
+        )
+        for i, row in enumerate(rows)
+    ]
+
+
+# --- Rollups --- #
+async def _insert_missing(session: AsyncSession, rows: Sequence[SQLModel]) -> None:
+    """
+    Insert zeroed rollup rows, leaving those that already exist untouched.
+
+    Rows must be of one table and sorted by primary key, so that games finishing together
+    wait on each other's new rows in the same order instead of deadlocking.
+    """
+    if not rows:
+        return
+    connection = await session.connection()
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(type(rows[0])).values([row.model_dump() for row in rows])
+    await session.execute(statement.on_conflict_do_nothing())
+
+
+async def update_rollups(session: AsyncSession, game: Game, pack: GamePack) -> dict[uuid.UUID, int]:
+    """
+    Merge the answers of a finished game into the quiz's and the players' rollup tables.
+
+    Missing rollup rows are first inserted with ON CONFLICT DO NOTHING, so that games
+    finishing together for a new quiz version or player do not both insert them. The rows
+    are then locked in key order, added to, and written back without committing, so the
+    caller can commit them atomically with the end of the game.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game`: The finished game.
+        `pack`: The compiled quiz version the game was played with.
+
+    Returns:
+        The points each player scored in the game.
+    """
+    answers = await load_game_answers(session, game)
+    if not len(answers):
+        return {}
+    metrics = compute_game_metrics(answers, pack)
+    user_ids = sorted(answers.user_ids)
+    player_index = {user_id: index for index, user_id in enumerate(answers.user_ids)}
+    now = datetime.now(timezone.utc)
+
+    question_indices = [index for index in range(pack.question_count) if metrics.attempts[index]]
+    await _insert_missing(
+        session,
+        [
+            QuestionStats(
+                quiz_id=game.quiz_id,
+                content_hash=pack.content_hash,
+                question_index=index,
+                time_histogram=[0] * TIME_BUCKET_COUNT,
+                updated_at=now,
+            )
+            for index in question_indices
+        ],
+    )
+    question_statement = (
+        select(QuestionStats)
+        .where(QuestionStats.quiz_id == game.quiz_id)
+        .where(QuestionStats.content_hash == pack.content_hash)
+        .where(col(QuestionStats.question_index).in_(question_indices))
+        .order_by(col(QuestionStats.question_index))
+        .with_for_update()
+    )
+    for row in (await session.execute(question_statement)).scalars():
+        index = row.question_index
+        row.attempts += int(metrics.attempts[index])
+        row.correct += int(metrics.correct[index])
+        row.time_sum_ms += float(metrics.time_sum_ms[index])
+        row.time_sq_sum_ms += float(metrics.time_sq_sum_ms[index])
+        row.score_sum += float(metrics.score_sum[index])
+        row.score_sq_sum += float(metrics.score_sq_sum[index])
+        row.score_correct_sum += float(metrics.score_correct_sum[index])
+        row.time_histogram = (
+            np.asarray(row.time_histogram) + metrics.time_histogram[index]
+        ).tolist()
+        row.updated_at = now
+        session.add(row)
+
+    await _insert_missing(
+        session,
+        [
+            PlayerQuizStats(quiz_id=game.quiz_id, user_id=user_id, updated_at=now)
+            for user_id in user_ids
+        ],
+    )
+    player_statement = (
+        select(PlayerQuizStats)
+        .where(PlayerQuizStats.quiz_id == game.quiz_id)
+        .where(col(PlayerQuizStats.user_id).in_(user_ids))
+        .order_by(col(PlayerQuizStats.user_id))
+        .with_for_update()
+    )
+    for player in (await session.execute(player_statement)).scalars():
+        index = player_index[player.user_id]
+        player.games_played += 1
+        player.answered += int(metrics.player_answered[index])
+        player.correct += int(metrics.player_correct[index])
+        player.total_points += int(metrics.player_points[index])
+        player.updated_at = now
+        session.add(player)
+
+    await _insert_missing(
+        session, [PlayerStats(user_id=user_id, updated_at=now) for user_id in user_ids]
+    )
+    total_statement = (
+        select(PlayerStats)
+        .where(col(PlayerStats.user_id).in_(user_ids))
+        .order_by(col(PlayerStats.user_id))
+        .with_for_update()
+    )
+    points = {}
+    for total in (await session.execute(total_statement)).scalars():
+        points[total.user_id] = int(metrics.player_points[player_index[total.user_id]])
+        total.games_played += 1
+        total.total_points += points[total.user_id]
+        total.updated_at = now
+        session.add(total)
+    return points
+
+
+async def get_quiz_analytics(
+    session: AsyncSession, quiz_id: uuid.UUID, content_hash: str
+) -> QuizAnalytics:
+    """
+    Read the dashboard analytics of a quiz version from the rollup tables.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the quiz.
+        `content_hash`: Content hash of the quiz version.
+
+    Returns:
+        QuizAnalytics: Per-question metrics and per-player accuracy.
+    """
+    question_statement = (
+        select(QuestionStats)
+        .where(QuestionStats.quiz_id == quiz_id)
+        .where(QuestionStats.content_hash == content_hash)
+        .order_by(col(QuestionStats.question_index))
+    )
+    questions = list((await session.execute(question_statement)).scalars().all())
+
+    player_statement = (
+        select(PlayerQuizStats)
+        .where(PlayerQuizStats.quiz_id == quiz_id)
+        .order_by(col(PlayerQuizStats.total_points).desc(), col(PlayerQuizStats.user_id))
+        .limit(PLAYER_LIMIT)
+    )
+    players = (await session.execute(player_statement)).scalars().all()
+
+    return QuizAnalytics(
+        quiz_id=quiz_id,
+        content_hash=content_hash,
+        time_bucket_edges_ms=TIME_BUCKET_EDGES_MS.tolist(),
+        questions=derive_question_analytics(questions),
+        players=[
+            PlayerAnalytics(
+                user_id=player.user_id,
+                games_played=player.games_played,
+                answered=player.answered,
+                accuracy=round(player.correct / player.answered, 4) if player.answered else 0.0,
+                total_points=player.total_points,
+            )
+            for player in players
+        ],
+    )
@@ -1,23 +1,64 @@
+import asyncio
+import logging
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Callable, Mapping, Optional, Sequence, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from passlib.exc import MissingBackendError, UnknownHashError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
 from app.core.config import settings
 from app.models.user import TokenData, User
 from app.services.user_service import get_user_by_email
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+# --- Hashing Policy --- #
+def build_password_context(
+    scheme: str, options: Mapping[str, int], legacy_schemes: Sequence[str] = ()
+) -> CryptContext:
+    """
+    Build a password hashing policy.
+
+    New passwords are hashed with `scheme` and `options`. Hashes of a legacy scheme, or of
+    `scheme` with other cost parameters, still verify but are flagged for an update.
+
+    Args:
+        `scheme`: passlib scheme name, such as "bcrypt" or "argon2".
+        `options`: The scheme's cost parameters, such as {"rounds": 12}.
+        `legacy_schemes`: Schemes of existing hashes that must keep working.
+
+    Raises:
+        KeyError: If a scheme is unknown to passlib.
+    """
+    schemes = [scheme, *(legacy for legacy in legacy_schemes if legacy != scheme)]
+    scheme_options = {f"{scheme}__{name}": value for name, value in options.items()}
+    return CryptContext(schemes=schemes, default=scheme, deprecated="auto", **scheme_options)
+
+
 # Password hashing context
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_context = build_password_context(
+    settings.PASSWORD_HASH_SCHEME,
+    settings.PASSWORD_HASH_OPTIONS,
+    settings.PASSWORD_HASH_LEGACY_SCHEMES,
+)
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
 
 
 # --- Helper Functions --- #
 def hash_password(password: str) -> str:
     """
-    Hashes a plaintext password using the bcrypt algorithm.
+    Hashes a plaintext password with the configured scheme and cost.
 
     Args:
         `password`: The plaintext password to be hashed.
@@ -45,6 +86,92 @@ def verify_password(plaintext_password: str, hashed_password: str) -> bool:
         return False
 
 
+def verify_and_update_password(
+    plaintext_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if its hash is outdated, rehash it in the same call.
+
+    Args:
+        `plaintext_password`: The plain text password to verify
+        `hashed_password`: The stored hash
+
+    Returns:
+        Whether the password matches, and the new hash to store if the stored one uses a
+        legacy scheme or cost, otherwise None.
+    """
+    try:
+        valid, new_hash = password_context.verify_and_update(plaintext_password, hashed_password)
+    except (UnknownHashError, MissingBackendError, ValueError):
+        return False, None
+    return bool(valid), new_hash
+
+
+# --- Password Hashing Pool --- #
+def get_hash_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared pool of password hashing threads, starting it on first use.
+
+    bcrypt releases the GIL, so threads hash in parallel; the pool size caps how many
+    CPU cores logins and registrations can take at once.
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """
+    Stop the password hashing threads, if they were started.
+    """
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True, cancel_futures=True)
+        _hash_pool = None
+
+
+async def _run_in_hash_pool(operation: str, function: Callable[..., T], *args: str) -> T:
+    submitted = time.perf_counter()
+
+    def run() -> tuple[T, float, float]:
+        started = time.perf_counter()
+        result = function(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    result, waited, took = await asyncio.get_running_loop().run_in_executor(get_hash_pool(), run)
+    metrics.PASSWORD_HASH_WAIT.observe(waited, operation)
+    metrics.PASSWORD_HASH_DURATION.observe(took, operation)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the hashing pool, without blocking the event loop.
+    """
+    return await _run_in_hash_pool("hash", hash_password, password)
+
+
+async def verify_password_async(plaintext_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the hashing pool, without blocking the event loop.
+    """
+    return await _run_in_hash_pool("verify", verify_password, plaintext_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plaintext_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Run `verify_and_update_password` in the hashing pool, without blocking the event loop.
+    """
+    return await _run_in_hash_pool(
+        "verify", verify_and_update_password, plaintext_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     Create a JSON Web Token (JWT) for user authentication.
@@ -59,12 +186,14 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     """
     to_encode = data.copy()
 
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # Sub-second `iat`, compared with the user's revocation time
+    to_encode.update({"exp": expire, "iat": now.timestamp()})
 
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return str(encoded_jwt)
@@ -90,7 +219,15 @@ def get_data_from_token(token: str) -> TokenData | None:
         if user_id is None or email is None:
             return None
 
-        token_data = TokenData(user_id=uuid.UUID(user_id), email=email)
+        # Access tokens issued before refresh tokens have no `iat` and last for days, so they
+        # would outlive the revocation entries of a sign-out everywhere
+        issued_at, expires_at = verified_payload.get("iat"), verified_payload.get("exp")
+        if not isinstance(issued_at, (int, float)) or not isinstance(expires_at, (int, float)):
+            return None
+        if expires_at - issued_at > settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60:
+            return None
+
+        token_data = TokenData(user_id=uuid.UUID(user_id), email=email, issued_at=issued_at)
     except (JWTError, ValueError):
         return None
     return token_data
@@ -110,12 +247,19 @@ async def authenticate_user(session: AsyncSession, email: str, password: str) ->
         The authenticated User object if credentials are valid, otherwise None.
     """
     user = await get_user_by_email(session, email)
+    if not user or not password or not user.password:
+        return None
 
-    if (
-        not user
-        or not password
-        or not user.password
-        or not verify_password(password, user.password)
-    ):
+    valid, new_hash = await verify_and_update_password_async(password, user.password)
+    if not valid:
         return None
+    if new_hash is not None:
+        # Upgrade a legacy hash while the plaintext is at hand; a failure only delays it
+        user.password = new_hash
+        session.add(user)
+        try:
+            await session.commit()
+        except SQLAlchemyError:
+            await session.rollback()
+            logger.warning("Could not store the upgraded password hash", exc_info=True)
     return user
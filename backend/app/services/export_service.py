@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+from app.game.pack import content_hash
+from app.models.export import WorksheetOptions
+from app.models.quiz import QuestionType, QuizContent
+from app.utils.pdf import PAPER_SIZES, PdfWriter
+
+# Bump whenever the worksheet layout changes, so that cached files are rendered again
+WORKSHEET_LAYOUT_VERSION = 1
+
+# Size of the chunks streamed back to the client
+CHUNK_SIZE = 64 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_inflight: dict[str, "asyncio.Task[bytes]"] = {}
+
+
+# --- Rendering (runs in the worker processes) --- #
+def render_worksheet(content: dict[str, Any], options: dict[str, Any]) -> bytes:
+    """
+    Render a printable worksheet of a quiz.
+
+    Takes and returns plain data so that the arguments and result are cheap to pickle
+    between the API process and the export workers.
+
+    Args:
+        `content`: `QuizContent` of the quiz, dumped to a dict.
+        `options`: `WorksheetOptions`, dumped to a dict.
+
+    Returns:
+        The worksheet as a PDF file.
+    """
+    quiz = QuizContent.model_validate(content)
+    opts = WorksheetOptions.model_validate(options)
+    size = opts.font_size
+    pdf = PdfWriter(PAPER_SIZES[opts.paper.value])
+
+    pdf.paragraph(quiz.title, size + 7, bold=True)
+    if quiz.description:
+        pdf.space(size * 0.4)
+        pdf.paragraph(quiz.description, size)
+    pdf.space(size)
+    pdf.paragraph("Name", size)
+    pdf.rule(pdf.line_width * 0.5, height=size * 0.3)
+    pdf.space(size)
+
+    answer_key = []
+    for number, question in enumerate(quiz.questions, start=1):
+        if question.question_type == QuestionType.TRUE_FALSE:
+            choices = ["True", "False"]
+            correct = question.correct_answer.strip().capitalize()
+        else:
+            choices = question.options
+            correct = question.correct_answer
+        letters = [chr(ord("A") + index) for index in range(len(choices))]
+        answer_key.append(f"{number}. {letters[choices.index(correct)]}. {correct}")
+
+        pdf.ensure_space(size * 1.3 * (len(choices) + 2))
+        pdf.paragraph(
+            f"{number}. {question.question_text} ({question.points} pts)",
+            size,
+            bold=True,
+            keep_together=True,
+        )
+        for letter, choice in zip(letters, choices):
+            pdf.paragraph(f"{letter}.  {choice}", size, indent=size * 1.6)
+        pdf.space(size)
+
+    if opts.include_answers:
+        pdf.new_page()
+        pdf.paragraph("Answer Key", size + 4, bold=True)
+        pdf.space(size * 0.5)
+        for line in answer_key:
+            pdf.paragraph(line, size)
+
+    return pdf.to_bytes()
+
+
+# --- Process pool --- #
+def get_export_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared pool of export worker processes, starting it on first use.
+
+    Workers are spawned rather than forked, so they never inherit the event loop,
+    database connections or locks of the API process.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.EXPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_export_pool() -> None:
+    """
+    Stop the export worker processes, if they were started.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+# --- Disk cache --- #
+def worksheet_cache_key(digest: str, options: WorksheetOptions) -> str:
+    """
+    Compute the cache key of a worksheet from the quiz version and formatting options.
+
+    Args:
+        `digest`: Content hash of the quiz version.
+        `options`: Formatting options of the worksheet.
+
+    Returns:
+        A hex digest that is unique to the rendered output.
+    """
+    canonical = json.dumps(
+        [WORKSHEET_LAYOUT_VERSION, digest, options.model_dump(mode="json")],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _open_cached(path: Path) -> Optional[BinaryIO]:
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    # Refreshing the modification time on each hit makes pruning evict the least recently
+    # used; the open file stays readable even if the cache prunes it meanwhile
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return file
+
+
+def prune_export_cache(directory: Path, max_bytes: int) -> int:
+    """
+    Delete the least recently used cached exports until the cache fits in `max_bytes`.
+
+    Args:
+        `directory`: The cache directory.
+        `max_bytes`: Maximum total size of the cached files.
+
+    Returns:
+        The number of files deleted.
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".pdf"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def _store(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file and rename it, so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    prune_export_cache(path.parent, settings.EXPORT_CACHE_MAX_MB * 1024 * 1024)
+
+
+async def _render_to_cache(content: QuizContent, options: WorksheetOptions, path: Path) -> bytes:
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(
+        get_export_pool(),
+        render_worksheet,
+        content.model_dump(mode="json"),
+        options.model_dump(mode="json"),
+    )
+    await asyncio.to_thread(_store, path, data)
+    return data
+
+
+async def get_worksheet(content: QuizContent, options: WorksheetOptions) -> BinaryIO:
+    """
+    Get the worksheet PDF of a quiz version, rendering it only if it is not cached yet.
+
+    Concurrent requests for the same worksheet share a single render. The cached file is
+    opened in a thread, and rendered again if the cache pruned it in the meantime.
+
+    Args:
+        `content`: Content of the quiz version.
+        `options`: Formatting options of the worksheet.
+
+    Returns:
+        BinaryIO: The open PDF file, for `iter_file` to stream and close.
+    """
+    key = worksheet_cache_key(content_hash(content), options)
+    path = Path(settings.EXPORT_CACHE_DIR) / f"{key}.pdf"
+    file = await asyncio.to_thread(_open_cached, path)
+    if file is not None:
+        return file
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_render_to_cache(content, options, path))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so that one client disconnecting does not cancel the render for the others.
+    # The rendered bytes are served from memory, as the cache may already have pruned them
+    return io.BytesIO(await asyncio.shield(task))
+
+
+def iter_file(file: BinaryIO) -> Iterator[bytes]:
+    """
+    Read an open file in chunks, for streaming it as a response body, then close it.
+
+    Taking an already open file keeps the stream valid even if the cache prunes the file
+    while it is being sent.
+    """
+    with file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
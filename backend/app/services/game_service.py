@@ -0,0 +1,363 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.game.pack import GamePack, get_cached_game_pack, get_game_pack
+from app.models.game import (
+    AnswerSubmit,
+    AnswerSyncItem,
+    AnswerSyncItemResult,
+    Game,
+    GameAnswer,
+    GameEvent,
+    GameEventType,
+    SyncStatus,
+)
+from app.models.quiz import Quiz, QuizContent
+from app.services import analytics_service, leaderboard_service, quiz_stats_service
+
+
+class GameEndedError(Exception):
+    """
+    Raised when an answer is submitted to a game that has ended.
+    """
+
+
+async def get_game_by_id(session: AsyncSession, game_id: uuid.UUID) -> Game | None:
+    """
+    Retrieve a game from the database by its unique UUID.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game_id`: UUID of the game to retrieve.
+
+    Returns:
+        Game: The Game object if found, otherwise None.
+    """
+    return await session.get(Game, game_id)
+
+
+async def start_game(
+    session: AsyncSession, quiz: Quiz, host_id: uuid.UUID
+) -> tuple[Game, GamePack]:
+    """
+    Start a new game of a quiz.
+
+    The current quiz version is compiled into a shared `GamePack` (or taken from the pack
+    cache) and the game is pinned to it by content hash.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz`: The quiz to play.
+        `host_id`: UUID of the user hosting the game.
+
+    Returns:
+        The new Game object and its GamePack.
+    """
+    pack = get_game_pack(QuizContent.model_validate(quiz))
+    game = Game(quiz_id=quiz.id, host_id=host_id, content_hash=pack.content_hash)
+    event = GameEvent(
+        game_id=game.id, user_id=host_id, type=GameEventType.STARTED, occurred_at=game.started_at
+    )
+
+    session.add(game)
+    session.add(event)
+    await session.commit()
+    await session.refresh(game)
+    quiz_stats_service.record_play(quiz.id)
+    return game, pack
+
+
+async def get_game_pack_for_game(session: AsyncSession, game: Game) -> GamePack | None:
+    """
+    Return the compiled pack of the quiz version a game is pinned to.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game`: The game.
+
+    Returns:
+        The GamePack, or None if it was evicted from the cache and the quiz has since
+        been edited, so that version can no longer be compiled.
+    """
+    pack = get_cached_game_pack(game.content_hash)
+    if pack is not None:
+        return pack
+
+    quiz = await session.get(Quiz, game.quiz_id)
+    if quiz is None:
+        return None
+    pack = get_game_pack(QuizContent.model_validate(quiz))
+    return pack if pack.content_hash == game.content_hash else None
+
+
+async def submit_answer(
+    session: AsyncSession,
+    game: Game,
+    pack: GamePack,
+    user_id: uuid.UUID,
+    answer_in: AnswerSubmit,
+) -> GameAnswer:
+    """
+    Grade a player's answer against the game's answer key and store it.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game`: The running game.
+        `pack`: The compiled quiz version of the game.
+        `user_id`: UUID of the answering player.
+        `answer_in`: `AnswerSubmit` object containing the answer.
+
+    Returns:
+        GameAnswer: The stored, graded answer.
+
+    Raises:
+        GameEndedError: If the game has ended.
+        IntegrityError: If the player already answered this question.
+    """
+    # Share-lock the game until the answer is committed: a concurrent finish_game either
+    # waits and then merges this answer, or has ended the game by the time it is locked
+    statement = (
+        select(Game)
+        .where(Game.id == game.id)
+        .with_for_update(read=True)
+        .execution_options(populate_existing=True)
+    )
+    game = (await session.execute(statement)).scalar_one()
+    if game.ended_at is not None:
+        await session.rollback()
+        raise GameEndedError
+
+    points = pack.score(answer_in.question_index, answer_in.answer, answer_in.elapsed_ms)
+    answer = GameAnswer(
+        game_id=game.id,
+        user_id=user_id,
+        question_index=answer_in.question_index,
+        game_started_at=game.started_at,
+        answer=answer_in.answer,
+        is_correct=pack.is_correct(answer_in.question_index, answer_in.answer),
+        points=points,
+        elapsed_ms=answer_in.elapsed_ms,
+    )
+
+    session.add(answer)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise
+    await session.refresh(answer)
+    return answer
+
+
+async def finish_game(session: AsyncSession, game: Game, pack: GamePack) -> Game:
+    """
+    End a game and merge its answers into the analytics and leaderboard rollups.
+
+    The rollup update and the end of the game are committed together, so each game is
+    counted exactly once. The Redis leaderboards, if any, are updated after the commit.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `game`: The running game.
+        `pack`: The compiled quiz version of the game.
+
+    Returns:
+        Game: The finished Game object.
+    """
+    # Lock the game so that concurrent finish requests merge its answers only once
+    statement = (
+        select(Game)
+        .where(Game.id == game.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    game = (await session.execute(statement)).scalar_one()
+    if game.ended_at is not None:
+        return game
+
+    points = await analytics_service.update_rollups(session, game, pack)
+    game.ended_at = datetime.now(timezone.utc)
+    session.add(game)
+    session.add(GameEvent(game_id=game.id, type=GameEventType.FINISHED, occurred_at=game.ended_at))
+    await session.commit()
+    await leaderboard_service.record_game(game.quiz_id, points)
+    await session.refresh(game)
+    return game
+
+
+async def sync_answers(
+    session: AsyncSession, user_id: uuid.UUID, items: list[AnswerSyncItem]
+) -> list[AnswerSyncItemResult]:
+    """
+    Store a batch of answers given offline, grading each against its game's answer key.
+
+    All new answers are written by a single INSERT ... ON CONFLICT DO NOTHING, so retrying a
+    batch is safe. Answers whose idempotency key was already stored are reported as
+    duplicates with their original grading, even once the game has ended. A different
+    answer to an already answered question is rejected.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `user_id`: UUID of the player.
+        `items`: The answers, each with a client-generated idempotency key.
+
+    Returns:
+        The outcome of each item, in the order given.
+    """
+    results: dict[uuid.UUID, AnswerSyncItemResult] = {}
+
+    def reject(item: AnswerSyncItem, error: str) -> None:
+        results[item.idempotency_key] = AnswerSyncItemResult(
+            idempotency_key=item.idempotency_key, status=SyncStatus.REJECTED, error=error
+        )
+
+    def report_stored(
+        key: uuid.UUID, game_id: uuid.UUID, question_index: int, answer: GameAnswer | None
+    ) -> None:
+        if (
+            answer is not None
+            and answer.game_id == game_id
+            and answer.question_index == question_index
+        ):
+            results[key] = AnswerSyncItemResult(
+                idempotency_key=key,
+                status=SyncStatus.DUPLICATE,
+                is_correct=answer.is_correct,
+                points=answer.points,
+            )
+        else:
+            results[key] = AnswerSyncItemResult(
+                idempotency_key=key, status=SyncStatus.REJECTED, error="Question already answered"
+            )
+
+    # Share-lock the games until the answers are committed, as in `submit_answer`, so that
+    # no answer is stored after finish_game merged its game's answers into the rollups
+    statement = (
+        select(Game)
+        .where(col(Game.id).in_({item.game_id for item in items}))
+        .order_by(col(Game.id))
+        .with_for_update(read=True)
+        .execution_options(populate_existing=True)
+    )
+    games = {game.id: game for game in (await session.execute(statement)).scalars()}
+    packs = {
+        game_id: await get_game_pack_for_game(session, game) for game_id, game in games.items()
+    }
+
+    # Keys stored by an earlier attempt of the batch are duplicates whatever the state of the
+    # game now, so a retry after the game ended still gets the original grading
+    stored = await _get_stored_answers(
+        session,
+        user_id,
+        [item.idempotency_key for item in items],
+        {game.started_at for game in games.values()},
+    )
+
+    rows: list[dict] = []
+    seen_keys: set[uuid.UUID] = set()
+    seen_questions: set[tuple[uuid.UUID, int]] = set()
+    for item in items:
+        # Repeats of a key within the batch share the outcome of its first occurrence
+        if item.idempotency_key in seen_keys:
+            continue
+        seen_keys.add(item.idempotency_key)
+        game, pack = games.get(item.game_id), packs.get(item.game_id)
+        if item.idempotency_key in stored:
+            report_stored(
+                item.idempotency_key,
+                item.game_id,
+                item.question_index,
+                stored[item.idempotency_key],
+            )
+        elif game is None:
+            reject(item, "Game not found")
+        elif game.ended_at is not None:
+            reject(item, "Game has ended")
+        elif pack is None:
+            reject(item, "Quiz version expired")
+        elif item.question_index >= pack.question_count:
+            reject(item, "No such question")
+        elif (item.game_id, item.question_index) in seen_questions:
+            reject(item, "Question answered twice in this batch")
+        else:
+            seen_questions.add((item.game_id, item.question_index))
+            rows.append(
+                {
+                    "game_id": item.game_id,
+                    "user_id": user_id,
+                    "question_index": item.question_index,
+                    "game_started_at": game.started_at,
+                    "answer": item.answer,
+                    "is_correct": pack.is_correct(item.question_index, item.answer),
+                    "points": pack.score(item.question_index, item.answer, item.elapsed_ms),
+                    "elapsed_ms": item.elapsed_ms,
+                    "idempotency_key": item.idempotency_key,
+                    "answered_at": datetime.now(timezone.utc),
+                }
+            )
+
+    if rows:
+        connection = await session.connection()
+        insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+        insert_statement = (
+            insert(GameAnswer)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(col(GameAnswer.idempotency_key))
+        )
+        inserted = set((await session.execute(insert_statement)).scalars().all())
+
+        for row in rows:
+            if row["idempotency_key"] in inserted:
+                results[row["idempotency_key"]] = AnswerSyncItemResult(
+                    idempotency_key=row["idempotency_key"],
+                    status=SyncStatus.ACCEPTED,
+                    is_correct=row["is_correct"],
+                    points=row["points"],
+                )
+
+        # Rows that were not inserted conflict with answers stored since the lookup above,
+        # or with another key's answer to the same question
+        skipped = [row for row in rows if row["idempotency_key"] not in inserted]
+        if skipped:
+            stored = await _get_stored_answers(
+                session,
+                user_id,
+                [row["idempotency_key"] for row in skipped],
+                {row["game_started_at"] for row in skipped},
+            )
+            for row in skipped:
+                report_stored(
+                    row["idempotency_key"],
+                    row["game_id"],
+                    row["question_index"],
+                    stored.get(row["idempotency_key"]),
+                )
+    await session.commit()
+
+    return [results[item.idempotency_key] for item in items]
+
+
+async def _get_stored_answers(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    keys: list[uuid.UUID],
+    game_started_at: set[datetime],
+) -> dict[uuid.UUID, GameAnswer]:
+    # The start times only limit the lookup to the partitions of the games involved
+    if not keys or not game_started_at:
+        return {}
+    statement = (
+        select(GameAnswer)
+        .where(GameAnswer.user_id == user_id)
+        .where(col(GameAnswer.idempotency_key).in_(keys))
+        .where(col(GameAnswer.game_started_at).in_(game_started_at))
+    )
+    answers = (await session.execute(statement)).scalars()
+    return {answer.idempotency_key: answer for answer in answers if answer.idempotency_key}
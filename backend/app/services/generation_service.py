@@ -0,0 +1,397 @@
+import asyncio
+import hashlib
+import json
+import logging
+import unicodedata
+import uuid
+from collections import defaultdict
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.generation import (
+    GenerationJob,
+    GenerationJobRead,
+    GenerationRequest,
+    JobStatus,
+)
+from app.models.quiz import QuizContent
+from app.services.ai_client import GenerationError, ProgressCallback, get_quiz_generator
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompt changes, so that results of the old prompt are no longer reused
+PROMPT_VERSION = 1
+
+# Longest error message stored on a failed job
+MAX_ERROR_LENGTH = 500
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def prompt_hash(request: GenerationRequest) -> str:
+    """
+    Compute the cache key of a generation request.
+
+    Case, Unicode compatibility forms and whitespace are normalized, so trivially
+    different requests share a result. The model is part of the key.
+
+    Args:
+        `request`: The generation request.
+
+    Returns:
+        The hex SHA-256 of the normalized request.
+    """
+    canonical = json.dumps(
+        [
+            PROMPT_VERSION,
+            settings.AI_PROVIDER,
+            settings.AI_MODEL,
+            _normalize_text(request.topic),
+            _normalize_text(request.source_text),
+            request.question_count,
+            request.question_type.value if request.question_type else None,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# --- Progress notifications --- #
+class JobNotifier:
+    """
+    Wakes up the progress streams of a job in this process whenever the job changes.
+
+    Streams still re-read the job from the database on a timer, so they also follow jobs
+    run by workers in other processes.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: defaultdict[uuid.UUID, set[asyncio.Event]] = defaultdict(set)
+
+    def subscribe(self, job_id: uuid.UUID) -> asyncio.Event:
+        event = asyncio.Event()
+        self._listeners[job_id].add(event)
+        return event
+
+    def unsubscribe(self, job_id: uuid.UUID, event: asyncio.Event) -> None:
+        listeners = self._listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(event)
+            if not listeners:
+                del self._listeners[job_id]
+
+    def notify(self, job_id: uuid.UUID) -> None:
+        for event in self._listeners.get(job_id, ()):
+            event.set()
+
+
+job_notifier = JobNotifier()
+
+
+# --- Jobs --- #
+async def get_job(session: AsyncSession, job_id: uuid.UUID) -> Optional[GenerationJob]:
+    """
+    Retrieve a generation job by its ID, reloading it from the database.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `job_id`: UUID of the job.
+
+    Returns:
+        GenerationJob: The job if found, None otherwise.
+    """
+    return await session.get(GenerationJob, job_id, populate_existing=True)
+
+
+async def find_cached_result(session: AsyncSession, digest: str) -> Optional[QuizContent]:
+    """
+    Find the result of a recent succeeded job for the same normalized request.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `digest`: The `prompt_hash` of the request.
+
+    Returns:
+        QuizContent: The cached quiz, or None if there is none within the cache TTL.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.GENERATION_CACHE_TTL_HOURS)
+    statement = (
+        select(GenerationJob.result)
+        .where(GenerationJob.prompt_hash == digest)
+        .where(GenerationJob.status == JobStatus.SUCCEEDED)
+        .where(GenerationJob.created_at >= cutoff)
+        .order_by(col(GenerationJob.created_at).desc())
+        .limit(1)
+    )
+    result = (await session.execute(statement)).scalar_one_or_none()
+    return QuizContent.model_validate(result) if result is not None else None
+
+
+async def submit_job(
+    session: AsyncSession, owner_id: uuid.UUID, request: GenerationRequest
+) -> GenerationJob:
+    """
+    Create a generation job, completing it at once if an identical request was cached.
+
+    Jobs that are not cached are left queued; call `generation_queue.enqueue` afterwards.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `owner_id`: UUID of the requesting user.
+        `request`: The generation request.
+
+    Returns:
+        GenerationJob: The new job.
+    """
+    digest = prompt_hash(request)
+    job = GenerationJob(
+        owner_id=owner_id, prompt_hash=digest, request=request.model_dump(mode="json")
+    )
+    cached = await find_cached_result(session, digest)
+    if cached is not None:
+        now = datetime.now(timezone.utc)
+        job.status = JobStatus.SUCCEEDED
+        job.progress = 100
+        job.result = cached.model_dump(mode="json")
+        job.cached = True
+        job.started_at = job.finished_at = now
+
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+    return job
+
+
+async def requeue_stale_jobs(session: AsyncSession) -> list[uuid.UUID]:
+    """
+    Find jobs left queued, or running for too long, e.g. by a restarted worker process.
+
+    Stale running jobs are put back in the queue.
+
+    Args:
+        `session`: Async database session for executing queries.
+
+    Returns:
+        IDs of the queued jobs, oldest first.
+    """
+    stale = datetime.now(timezone.utc) - timedelta(seconds=2 * settings.GENERATION_TIMEOUT_SECONDS)
+    await session.execute(
+        update(GenerationJob)
+        .where(col(GenerationJob.status) == JobStatus.RUNNING)
+        .where(col(GenerationJob.started_at) < stale)
+        .values(status=JobStatus.QUEUED, progress=0, message=None)
+    )
+    await session.commit()
+    statement = (
+        select(GenerationJob.id)
+        .where(GenerationJob.status == JobStatus.QUEUED)
+        .order_by(col(GenerationJob.created_at))
+    )
+    return list((await session.execute(statement)).scalars().all())
+
+
+async def stream_job_events(
+    job_id: uuid.UUID,
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]] = AsyncSessionLocal,
+) -> AsyncIterator[str]:
+    """
+    Follow a job as Server-Sent Events until it succeeds or fails.
+
+    Each change is sent as an event named after the job status, carrying the job as JSON.
+    A comment is sent while nothing changes, so that proxies keep the connection open.
+
+    Args:
+        `job_id`: UUID of the job.
+        `session_factory`: Opens a session for each poll. The stream outlives the request,
+            so it cannot use the request's session.
+
+    Yields:
+        str: Encoded Server-Sent Events.
+    """
+    changed = job_notifier.subscribe(job_id)
+    try:
+        last = None
+        while True:
+            changed.clear()
+            # A short session per poll, so the stream holds no connection while it waits
+            async with session_factory() as session:
+                job = await get_job(session, job_id)
+                job_read = GenerationJobRead.model_validate(job) if job is not None else None
+            if job_read is None:
+                return
+            data = job_read.model_dump_json()
+            if data != last:
+                yield f"event: {job_read.status.value}\ndata: {data}\n\n"
+                last = data
+            else:
+                yield ": keep-alive\n\n"
+            if job_read.status in TERMINAL_STATUSES:
+                return
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    changed.wait(), timeout=settings.GENERATION_POLL_INTERVAL_SECONDS
+                )
+    finally:
+        job_notifier.unsubscribe(job_id, changed)
+
+
+# --- Workers --- #
+class GenerationQueue:
+    """
+    In-process job queue served by a fixed number of asyncio worker tasks.
+
+    Jobs are persisted in `generation_jobs`, so the queue only carries their IDs. A worker
+    claims a job with a conditional UPDATE, so each job runs once even if several
+    processes enqueue it. Identical requests running at the same time share one model call.
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncContextManager[AsyncSession]] = AsyncSessionLocal
+    ):
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue[uuid.UUID] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._inflight: dict[str, asyncio.Task[QuizContent]] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self, workers: int) -> None:
+        """
+        Start the worker tasks and enqueue the jobs left over by a previous run.
+        """
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+        try:
+            async with self.session_factory() as session:
+                job_ids = await requeue_stale_jobs(session)
+        except Exception:
+            logger.exception("Could not requeue pending generation jobs")
+            return
+        for job_id in job_ids:
+            self.enqueue(job_id)
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker tasks. Jobs they were running are requeued on the next start.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, job_id: uuid.UUID) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def join(self) -> None:
+        """
+        Wait until every enqueued job has been processed.
+        """
+        await self._queue.join()
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception:
+                logger.exception("Generation job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def run_job(self, job_id: uuid.UUID) -> None:
+        """
+        Claim and run a queued job, recording its progress and outcome.
+
+        Args:
+            `job_id`: UUID of the job.
+        """
+        async with self.session_factory() as session:
+            claimed = await session.execute(
+                update(GenerationJob)
+                .where(col(GenerationJob.id) == job_id)
+                .where(col(GenerationJob.status) == JobStatus.QUEUED)
+                .values(
+                    status=JobStatus.RUNNING,
+                    started_at=datetime.now(timezone.utc),
+                    progress=5,
+                    message="Started",
+                )
+            )
+            await session.commit()
+            if claimed.rowcount == 0:
+                return
+            job_notifier.notify(job_id)
+
+            job = await get_job(session, job_id)
+            if job is None:
+                # The job was deleted after it was claimed
+                return
+            request = GenerationRequest.model_validate(job.request)
+
+            async def report(progress: int, message: str) -> None:
+                job.progress, job.message = progress, message
+                session.add(job)
+                await session.commit()
+                job_notifier.notify(job_id)
+
+            try:
+                cached = await find_cached_result(session, job.prompt_hash)
+                if cached is not None:
+                    job.cached = True
+                    result = cached
+                else:
+                    result = await self._generate(job.prompt_hash, request, report)
+            except (GenerationError, asyncio.TimeoutError) as e:
+                job.status = JobStatus.FAILED
+                job.error = (str(e) or "Generation timed out")[:MAX_ERROR_LENGTH]
+            except Exception:
+                logger.exception("Generation job %s failed", job_id)
+                job.status = JobStatus.FAILED
+                job.error = "Generation failed"
+            else:
+                job.status = JobStatus.SUCCEEDED
+                job.result = result.model_dump(mode="json")
+                job.progress = 100
+                job.message = "Done"
+            job.finished_at = datetime.now(timezone.utc)
+            session.add(job)
+            await session.commit()
+            job_notifier.notify(job_id)
+
+    async def _generate(
+        self, digest: str, request: GenerationRequest, report: ProgressCallback
+    ) -> QuizContent:
+        task = self._inflight.get(digest)
+        if task is None:
+            generator = get_quiz_generator()
+            task = asyncio.create_task(
+                asyncio.wait_for(
+                    generator.generate(request, report),
+                    timeout=settings.GENERATION_TIMEOUT_SECONDS,
+                )
+            )
+            self._inflight[digest] = task
+            task.add_done_callback(lambda _: self._inflight.pop(digest, None))
+        else:
+            await report(10, "Waiting for an identical request")
+        # Shielded so that a cancelled worker does not cancel the call for the other jobs
+        return await asyncio.shield(task)
+
+
+# Shared queue for this process, started by the application lifespan
+generation_queue = GenerationQueue()
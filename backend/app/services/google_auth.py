@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+import httpx
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+ALGORITHM = "RS256"
+
+# Bounds of how long a fetched key set is trusted, whatever its cache headers say
+MIN_KEY_TTL_SECONDS = 60.0
+MAX_KEY_TTL_SECONDS = 24 * 60 * 60.0
+# Keys are refetched in the background once they are this close to expiring
+REFRESH_AHEAD_SECONDS = 5 * 60.0
+# Tokens signed with an unknown key only trigger a refetch this often, so that forged
+# key IDs cannot make every login call Google
+UNKNOWN_KEY_REFETCH_SECONDS = 30.0
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+class GoogleTokenError(Exception):
+    """
+    Raised when a Google ID token is invalid.
+    """
+
+
+class SigningKeysUnavailableError(GoogleTokenError):
+    """
+    Raised when Google's signing keys cannot be fetched and none are cached.
+    """
+
+
+@dataclass(frozen=True)
+class GoogleIdentity:
+    """
+    The verified claims of a Google ID token.
+
+    Attributes:
+        `sub` (str): The Google account ID.
+        `email` (str): The account's verified email address.
+        `name` (Optional[str]): The account's display name, if shared.
+    """
+
+    sub: str
+    email: str
+    name: Optional[str] = None
+
+
+def cache_lifetime(headers: httpx.Headers) -> float:
+    """
+    Work out how long a response may be cached from its `Cache-Control` and `Expires`
+    headers, minus its `Age`, clamped to the trusted bounds.
+    """
+    lifetime: Optional[float] = None
+    match = _MAX_AGE.search(headers.get("cache-control", ""))
+    if match:
+        lifetime = float(match.group(1)) - float(headers.get("age", "0") or 0)
+    elif "expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["expires"]).timestamp()
+            lifetime = expires - time.time()
+        except (TypeError, ValueError):
+            lifetime = None
+    if lifetime is None:
+        return MIN_KEY_TTL_SECONDS
+    return min(max(lifetime, MIN_KEY_TTL_SECONDS), MAX_KEY_TTL_SECONDS)
+
+
+class SigningKeyCache:
+    """
+    In-memory cache of a JSON Web Key Set, such as Google's token signing keys.
+
+    Keys are parsed once per fetch, so verifying a token costs only the signature check.
+    The set is kept for as long as its cache headers allow and refetched in the background
+    shortly before it expires. When a fetch is needed, concurrent callers share a single
+    request. If a refresh fails, the previous keys are kept until a later refresh succeeds.
+
+    Only used from the event loop, so it needs no locking.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 5.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            `url`: URL of the JSON Web Key Set.
+            `timeout`: Time limit of one fetch, in seconds.
+            `transport`: HTTP transport, to serve the keys from a stub in tests.
+            `clock`: Monotonic clock, replaceable in tests.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.transport = transport
+        self._clock = clock
+        self._keys: dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._fetched_at: Optional[float] = None
+        self._fetch: Optional[asyncio.Task[None]] = None
+        self.fetch_count = 0
+
+    async def get_key(self, kid: str) -> Key:
+        """
+        Return the key with the given ID, fetching the key set if needed.
+
+        Raises:
+            GoogleTokenError: If no key has that ID.
+            SigningKeysUnavailableError: If the key set cannot be fetched.
+        """
+        now = self._clock()
+        if now >= self._expires_at:
+            await self._refresh()
+        elif kid not in self._keys and self._may_refetch_unknown(now):
+            # Keys are rotated: a new key may be used before our copy expires
+            await self._refresh()
+        elif now >= self._expires_at - REFRESH_AHEAD_SECONDS:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise GoogleTokenError("Token is signed with an unknown key")
+        return key
+
+    def _may_refetch_unknown(self, now: float) -> bool:
+        return self._fetched_at is None or now - self._fetched_at >= UNKNOWN_KEY_REFETCH_SECONDS
+
+    def _start_fetch(self) -> "asyncio.Task[None]":
+        if self._fetch is None:
+            self._fetch = asyncio.create_task(self._fetch_keys())
+            self._fetch.add_done_callback(self._fetch_done)
+        return self._fetch
+
+    def _fetch_done(self, task: "asyncio.Task[None]") -> None:
+        self._fetch = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Could not refresh signing keys", exc_info=task.exception())
+
+    async def _refresh(self) -> None:
+        # Shielded so that a cancelled login does not cancel the fetch others wait on
+        try:
+            await asyncio.shield(self._start_fetch())
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            if not self._keys:
+                raise SigningKeysUnavailableError("Could not fetch signing keys") from e
+
+    def _refresh_in_background(self) -> None:
+        self._start_fetch()
+
+    async def _fetch_keys(self) -> None:
+        self.fetch_count += 1
+        self._fetched_at = self._clock()
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        keys = {
+            key_data["kid"]: jwk.construct(key_data, key_data.get("alg", ALGORITHM))
+            for key_data in response.json()["keys"]
+            if key_data.get("use", "sig") == "sig"
+        }
+        self._keys = keys
+        self._expires_at = self._clock() + cache_lifetime(response.headers)
+
+    async def close(self) -> None:
+        """
+        Wait for a fetch in progress, so that none is left running on shutdown.
+        """
+        if self._fetch is not None:
+            await asyncio.gather(self._fetch, return_exceptions=True)
+
+
+async def verify_google_id_token(
+    token: str, client_id: str, key_cache: SigningKeyCache
+) -> GoogleIdentity:
+    """
+    Verify a Google ID token and return the identity it asserts.
+
+    Checks the signature, audience, issuer, expiry and that the email is verified.
+
+    Args:
+        `token`: The ID token from Google Sign-In.
+        `client_id`: Our OAuth client ID, which the token must be issued for.
+        `key_cache`: Cache of Google's signing keys.
+
+    Returns:
+        GoogleIdentity: The verified identity.
+
+    Raises:
+        GoogleTokenError: If the token is invalid, or keys cannot be fetched.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise GoogleTokenError("Malformed token") from e
+    if header.get("alg") != ALGORITHM or not header.get("kid"):
+        raise GoogleTokenError("Unexpected token algorithm or key")
+
+    key = await key_cache.get_key(header["kid"])
+    try:
+        claims: dict[str, Any] = jwt.decode(
+            token,
+            key,
+            algorithms=[ALGORITHM],
+            audience=client_id,
+            issuer=GOOGLE_ISSUERS,
+            options={"verify_at_hash": False},
+        )
+    except JWTError as e:
+        raise GoogleTokenError(str(e)) from e
+
+    if not claims.get("sub") or not claims.get("email"):
+        raise GoogleTokenError("Token has no subject or email")
+    if claims.get("email_verified") not in (True, "true"):
+        raise GoogleTokenError("Email address is not verified")
+    return GoogleIdentity(sub=claims["sub"], email=claims["email"], name=claims.get("name"))
+
+
+# Shared cache for this process
+google_key_cache = SigningKeyCache(settings.GOOGLE_CERTS_URL)
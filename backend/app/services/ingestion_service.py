@@ -0,0 +1,165 @@
+import asyncio
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.ingestion import chunk_text, iter_document_text
+from app.models.generation import (
+    DocumentIngestionRead,
+    GenerationJobRead,
+    GenerationRequest,
+    JobStatus,
+)
+from app.models.quiz import QuestionType
+from app.services import generation_service
+
+# Bytes read from the upload per step while spooling it to disk
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class DocumentTooLargeError(Exception):
+    """
+    Raised when an uploaded document exceeds `INGESTION_MAX_UPLOAD_MB`.
+    """
+
+
+@dataclass
+class ExtractedDocument:
+    """
+    Generation-sized chunks of a document's text.
+    """
+
+    chunks: list[str]
+    truncated: bool
+
+    @property
+    def characters(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int) -> tuple[Path, int]:
+    """
+    Copy an upload to a temporary file in fixed-size chunks.
+
+    The caller owns the returned file and must delete it.
+
+    Args:
+        `upload`: The uploaded file.
+        `max_bytes`: Largest accepted size.
+
+    Returns:
+        The path of the temporary file and its size in bytes.
+
+    Raises:
+        DocumentTooLargeError: If the upload is larger than `max_bytes`.
+    """
+    fd, name = tempfile.mkstemp(prefix="doqu-upload-")
+    path = Path(name)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as file:
+            while chunk := await upload.read(SPOOL_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise DocumentTooLargeError
+                await asyncio.to_thread(file.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path, size
+
+
+def extract_chunks(
+    path: Path, filename: str, chunk_chars: int, max_chunks: int
+) -> ExtractedDocument:
+    """
+    Extract a document's text and split it into chunks, reading no more than needed.
+
+    Args:
+        `path`: Path of the document.
+        `filename`: Original file name.
+        `chunk_chars`: Target size of each chunk.
+        `max_chunks`: Most chunks to return.
+
+    Returns:
+        ExtractedDocument: The chunks, and whether text was left over.
+
+    Raises:
+        UnsupportedDocumentError: If the format is not supported or the file is corrupt.
+    """
+    chunks = list(
+        islice(chunk_text(iter_document_text(path, filename), chunk_chars), max_chunks + 1)
+    )
+    return ExtractedDocument(chunks=chunks[:max_chunks], truncated=len(chunks) > max_chunks)
+
+
+async def ingest_document(
+    session: AsyncSession,
+    owner_id: uuid.UUID,
+    upload: UploadFile,
+    topic: Optional[str],
+    questions_per_chunk: int,
+    question_type: Optional[QuestionType],
+) -> DocumentIngestionRead:
+    """
+    Turn an uploaded document into one quiz generation job per chunk of its text.
+
+    The upload is spooled to disk and parsed incrementally in a worker thread, so memory
+    use stays bounded however large the document is.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `owner_id`: UUID of the uploading user.
+        `upload`: The uploaded document.
+        `topic`: What the quizzes are about; defaults to the file name.
+        `questions_per_chunk`: Number of questions to generate from each chunk.
+        `question_type`: Restrict questions to one type; mixed if None.
+
+    Returns:
+        DocumentIngestionRead: The extraction summary and the submitted jobs.
+
+    Raises:
+        DocumentTooLargeError: If the upload is too large.
+        UnsupportedDocumentError: If the format is not supported or the file is corrupt.
+    """
+    filename = upload.filename or "document"
+    path, size = await spool_upload(upload, settings.INGESTION_MAX_UPLOAD_MB * 1024 * 1024)
+    try:
+        document = await asyncio.to_thread(
+            extract_chunks,
+            path,
+            filename,
+            settings.INGESTION_CHUNK_CHARS,
+            settings.INGESTION_MAX_CHUNKS,
+        )
+    finally:
+        path.unlink(missing_ok=True)
+
+    jobs = []
+    for chunk in document.chunks:
+        request = GenerationRequest(
+            topic=topic or Path(filename).stem or "document",
+            source_text=chunk,
+            question_count=questions_per_chunk,
+            question_type=question_type,
+        )
+        job = await generation_service.submit_job(session, owner_id, request)
+        if job.status == JobStatus.QUEUED:
+            generation_service.generation_queue.enqueue(job.id)
+        jobs.append(GenerationJobRead.model_validate(job))
+
+    return DocumentIngestionRead(
+        filename=filename,
+        size_bytes=size,
+        characters=document.characters,
+        truncated=document.truncated,
+        jobs=jobs,
+    )
@@ -0,0 +1,364 @@
+import logging
+import uuid
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import delete, func, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.core.config import settings
+from app.models.analytics import PlayerQuizStats, PlayerStats
+from app.models.leaderboard import Leaderboard, LeaderboardEntry
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_BOARD = "global"
+
+# Members written per ZADD when rebuilding a board
+REBUILD_BATCH_SIZE = 10_000
+
+
+class LeaderboardUnavailableError(Exception):
+    """
+    Raised when a leaderboard cannot be read from Redis, so it is read from the database.
+    """
+
+
+# --- Helper Functions --- #
+def board_name(quiz_id: Optional[uuid.UUID] = None) -> str:
+    return f"quiz:{quiz_id}" if quiz_id else GLOBAL_BOARD
+
+
+def competition_ranks(points: Sequence[int]) -> list[int]:
+    """
+    Rank points sorted from the top of a board, tied players sharing the best rank of
+    the tie ("1, 2, 2, 4").
+    """
+    ranks: list[int] = []
+    for position, value in enumerate(points):
+        ranks.append(ranks[-1] if position and value == points[position - 1] else position + 1)
+    return ranks
+
+
+# --- Redis --- #
+class RedisLeaderboard:
+    """
+    All-time leaderboards as Redis sorted sets of user IDs scored by points, so top-N and
+    rank lookups take O(log n) however many players there are.
+
+    The rollup tables remain the source of truth: a board missing from Redis (never built,
+    or lost with Redis' data) is not updated and reads fall back to the database until
+    `rebuild_leaderboards` writes it.
+    """
+
+    # Adds the points in ARGV (user ID, points, ...) to every board in KEYS that exists
+    INCREMENT_SCRIPT = """
+    for _, key in ipairs(KEYS) do
+        if redis.call('EXISTS', key) == 1 then
+            for i = 1, #ARGV, 2 do
+                redis.call('ZINCRBY', key, ARGV[i + 1], ARGV[i])
+            end
+        end
+    end
+    """
+
+    def __init__(self, url: str, prefix: str = "leaderboard"):
+        """
+        Args:
+            `url`: Redis URL, such as "redis://localhost:6379/0".
+            `prefix`: Prefix of the board keys.
+
+        Raises:
+            RuntimeError: If the `redis` package is not installed.
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("LEADERBOARD_REDIS_URL is set but redis is not installed") from e
+        self._redis: Any = redis.from_url(url)
+        self._prefix = prefix
+        self._increment = self._redis.register_script(self.INCREMENT_SCRIPT)
+
+    def _key(self, board: str) -> str:
+        return f"{self._prefix}:{board}"
+
+    async def increment(self, boards: Sequence[str], points: dict[uuid.UUID, int]) -> None:
+        args = [value for user_id, score in points.items() for value in (str(user_id), score)]
+        await self._increment(keys=[self._key(board) for board in boards], args=args)
+
+    async def top(self, board: str, limit: int) -> list[tuple[uuid.UUID, int]]:
+        """
+        Raises:
+            LeaderboardUnavailableError: If the board is missing or Redis fails.
+        """
+        key = self._key(board)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.exists(key)
+                pipeline.zrevrange(key, 0, limit - 1, withscores=True)
+                exists, entries = await pipeline.execute()
+        except Exception as e:
+            raise LeaderboardUnavailableError(str(e)) from e
+        if not exists:
+            raise LeaderboardUnavailableError(f"{key} is not built")
+        return [(uuid.UUID(member.decode()), int(score)) for member, score in entries]
+
+    async def rank(self, board: str, user_id: uuid.UUID) -> Optional[tuple[int, int]]:
+        """
+        Returns:
+            The player's rank and points, or None if the player is not on the board.
+
+        Raises:
+            LeaderboardUnavailableError: If the board is missing or Redis fails.
+        """
+        key = self._key(board)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.exists(key)
+                pipeline.zscore(key, str(user_id))
+                exists, score = await pipeline.execute()
+            if not exists:
+                raise LeaderboardUnavailableError(f"{key} is not built")
+            if score is None:
+                return None
+            above = await self._redis.zcount(key, f"({score}", "+inf")
+        except LeaderboardUnavailableError:
+            raise
+        except Exception as e:
+            raise LeaderboardUnavailableError(str(e)) from e
+        return above + 1, int(score)
+
+    async def replace(self, board: str, points: dict[uuid.UUID, int]) -> None:
+        """
+        Replace a board at once: it is written under a temporary key, then renamed over
+        the current one.
+        """
+        key = self._key(board)
+        building = f"{key}:rebuild"
+        await self._redis.delete(building)
+        members = [(str(user_id), score) for user_id, score in points.items()]
+        for start in range(0, len(members), REBUILD_BATCH_SIZE):
+            end = start + REBUILD_BATCH_SIZE
+            await self._redis.zadd(building, dict(members[start:end]))
+        if members:
+            await self._redis.rename(building, key)
+        else:
+            await self._redis.delete(key)
+
+
+def build_leaderboard_cache() -> Optional[RedisLeaderboard]:
+    """
+    Build the Redis leaderboards configured in `Settings`, if any.
+    """
+    if not settings.LEADERBOARD_REDIS_URL:
+        return None
+    return RedisLeaderboard(settings.LEADERBOARD_REDIS_URL)
+
+
+# Redis leaderboards of this process; None reads every board from the rollup tables
+leaderboard_cache = build_leaderboard_cache()
+
+
+# --- Updates --- #
+async def record_game(quiz_id: uuid.UUID, points: dict[uuid.UUID, int]) -> None:
+    """
+    Add the points of a finished game to the global and the quiz's Redis leaderboards.
+
+    Called once the game's rollups are committed. Failures are logged, as the rollups
+    already hold the points; `rebuild_leaderboards` puts Redis back in line.
+
+    Args:
+        `quiz_id`: UUID of the game's quiz.
+        `points`: Points scored by each player in the game.
+    """
+    if leaderboard_cache is None or not points:
+        return
+    try:
+        await leaderboard_cache.increment([GLOBAL_BOARD, board_name(quiz_id)], points)
+    except Exception as e:
+        logger.warning(f"Updating leaderboards failed; rebuild them: {e}")
+
+
+# --- Reads --- #
+def _rollup(quiz_id: Optional[uuid.UUID]) -> Any:
+    return PlayerQuizStats if quiz_id else PlayerStats
+
+
+def _on_board(statement: Any, quiz_id: Optional[uuid.UUID]) -> Any:
+    return statement.where(PlayerQuizStats.quiz_id == quiz_id) if quiz_id else statement
+
+
+async def get_leaderboard(
+    session: AsyncSession, quiz_id: Optional[uuid.UUID], limit: int
+) -> Leaderboard:
+    """
+    Read the top of the global or a quiz's all-time leaderboard.
+
+    Read from Redis when configured, otherwise from the rollup table's points index; ties
+    are ordered by user ID either way.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the quiz, or None for the global leaderboard.
+        `limit`: Number of entries to return.
+
+    Returns:
+        Leaderboard: The leading players, best first.
+    """
+    try:
+        if leaderboard_cache is None:
+            raise LeaderboardUnavailableError("Redis leaderboards are not configured")
+        standings = await leaderboard_cache.top(board_name(quiz_id), limit)
+    except LeaderboardUnavailableError:
+        table = _rollup(quiz_id)
+        statement = _on_board(
+            select(table.user_id, table.total_points)
+            .order_by(table.total_points.desc(), table.user_id.desc())
+            .limit(limit),
+            quiz_id,
+        )
+        standings = [(user_id, points) for user_id, points in (await session.execute(statement))]
+
+    user_ids = [user_id for user_id, _ in standings]
+    usernames: dict[uuid.UUID, str] = {}
+    if user_ids:
+        statement = select(User.id, User.username).where(col(User.id).in_(user_ids))
+        usernames = {user_id: username for user_id, username in await session.execute(statement)}
+    ranks = competition_ranks([points for _, points in standings])
+    return Leaderboard(
+        quiz_id=quiz_id,
+        entries=[
+            LeaderboardEntry(
+                rank=rank, user_id=user_id, username=usernames.get(user_id), total_points=points
+            )
+            for rank, (user_id, points) in zip(ranks, standings)
+        ],
+    )
+
+
+async def get_player_rank(
+    session: AsyncSession, quiz_id: Optional[uuid.UUID], user_id: uuid.UUID
+) -> Optional[LeaderboardEntry]:
+    """
+    Read a player's standing on the global or a quiz's all-time leaderboard.
+
+    Without Redis, the rank is one more than the number of players with more points,
+    counted on the rollup table's points index. That count reads one index entry per
+    player ranked above, so it takes longer the lower the player ranks; boards with many
+    players should be kept in Redis.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the quiz, or None for the global leaderboard.
+        `user_id`: UUID of the player.
+
+    Returns:
+        LeaderboardEntry: The player's standing, or None if the player has no points there.
+    """
+    try:
+        if leaderboard_cache is None:
+            raise LeaderboardUnavailableError("Redis leaderboards are not configured")
+        standing = await leaderboard_cache.rank(board_name(quiz_id), user_id)
+    except LeaderboardUnavailableError:
+        table = _rollup(quiz_id)
+        statement = _on_board(select(table.total_points).where(table.user_id == user_id), quiz_id)
+        points = (await session.execute(statement)).scalar_one_or_none()
+        if points is None:
+            return None
+        statement = _on_board(
+            select(func.count()).select_from(table).where(table.total_points > points), quiz_id
+        )
+        standing = (await session.scalar(statement) or 0) + 1, points
+    if standing is None:
+        return None
+
+    rank, points = standing
+    user = await session.get(User, user_id)
+    return LeaderboardEntry(
+        rank=rank, user_id=user_id, username=user.username if user else None, total_points=points
+    )
+
+
+# --- Rebuild --- #
+async def rebuild_leaderboards(session: AsyncSession) -> int:
+    """
+    Recompute `PlayerStats` from the per-quiz rollups, then rewrite every Redis leaderboard
+    from the rollup tables.
+
+    On PostgreSQL, writes to `player_quiz_stats` are locked out until the recomputed totals
+    are committed, so games finishing meanwhile wait rather than being lost. The Redis
+    boards are rewritten afterwards, without the lock: a game finishing while its boards
+    are rewritten may be missed or counted twice there, so run the rebuild again if it
+    overlapped busy play.
+
+    Args:
+        `session`: Async database session for executing queries.
+
+    Returns:
+        The number of leaderboards written to Redis.
+    """
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        await session.execute(text("LOCK TABLE player_quiz_stats IN SHARE MODE"))
+
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    totals = select(
+        PlayerQuizStats.user_id,
+        func.sum(PlayerQuizStats.games_played),
+        func.sum(PlayerQuizStats.total_points),
+        func.now(),
+    ).group_by(col(PlayerQuizStats.user_id))
+    statement = insert(PlayerStats).from_select(
+        ["user_id", "games_played", "total_points", "updated_at"], totals
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "games_played": statement.excluded.games_played,
+            "total_points": statement.excluded.total_points,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    await session.execute(statement)
+    await session.execute(
+        delete(PlayerStats).where(
+            col(PlayerStats.user_id).not_in(select(PlayerQuizStats.user_id).distinct())
+        )
+    )
+    await session.commit()
+
+    boards = 0
+    if leaderboard_cache is not None:
+        boards = await _rewrite_boards(session, leaderboard_cache)
+    logger.info(f"Rebuilt player totals and {boards} Redis leaderboards")
+    return boards
+
+
+async def _rewrite_boards(session: AsyncSession, cache: RedisLeaderboard) -> int:
+    result = await session.execute(select(PlayerStats.user_id, PlayerStats.total_points))
+    await cache.replace(GLOBAL_BOARD, {user_id: total for user_id, total in result})
+    boards = 1
+
+    statement = (
+        select(PlayerQuizStats.quiz_id, PlayerQuizStats.user_id, PlayerQuizStats.total_points)
+        .order_by(col(PlayerQuizStats.quiz_id))
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    # Rows arrive grouped by quiz; each board is written once its rows are read
+    current: Optional[uuid.UUID] = None
+    points: dict[uuid.UUID, int] = {}
+    async for quiz_id, user_id, total in await session.stream(statement):
+        if quiz_id != current and points:
+            await cache.replace(board_name(current), points)
+            boards += 1
+            points = {}
+        current = quiz_id
+        points[user_id] = total
+    if points:
+        await cache.replace(board_name(current), points)
+        boards += 1
+    await session.commit()
+    return boards
@@ -0,0 +1,190 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Float, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col
+
+from app.models.quiz import Quiz, QuizCreate, QuizSearchPage, QuizSummary
+from app.utils.http_cache import make_etag, response_cache
+from app.utils.pagination import PageParams, SortKey, paginate
+
+# Text search configuration, must match the one used by the search vector trigger
+SEARCH_CONFIG = "english"
+
+# Response cache namespace of rendered `QuizRead` bodies, keyed by quiz id
+QUIZ_CACHE_NAMESPACE = "quizzes"
+
+# Columns needed to render a dashboard card; questions are never loaded for listings
+SUMMARY_COLUMNS = (
+    col(Quiz.id),
+    col(Quiz.owner_id),
+    col(Quiz.title),
+    col(Quiz.description),
+    col(Quiz.tags),
+    col(Quiz.question_count),
+    col(Quiz.average_rating),
+    col(Quiz.rating_count),
+    col(Quiz.play_count),
+    col(Quiz.comment_count),
+    col(Quiz.created_at),
+)
+
+
+async def get_quiz_by_id(session: AsyncSession, quiz_id: uuid.UUID) -> Quiz | None:
+    """
+    Retrieve a quiz from the database by its unique UUID.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the quiz to retrieve.
+
+    Returns:
+        Quiz: The Quiz object if found, otherwise None.
+    """
+    return await session.get(Quiz, quiz_id)
+
+
+async def create_quiz(session: AsyncSession, owner_id: uuid.UUID, quiz_in: QuizCreate) -> Quiz:
+    """
+    Create a new quiz in the database.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `owner_id`: UUID of the user creating the quiz.
+        `quiz_in`: `QuizCreate` object containing the quiz content and metadata.
+
+    Returns:
+        Quiz: The newly created Quiz object.
+    """
+    new_quiz = Quiz(
+        owner_id=owner_id,
+        title=quiz_in.title.strip(),
+        description=quiz_in.description.strip() if quiz_in.description else None,
+        questions=[question.model_dump(mode="json") for question in quiz_in.questions],
+        question_count=len(quiz_in.questions),
+        tags=_normalize_tags(quiz_in.tags),
+        is_public=quiz_in.is_public,
+    )
+
+    session.add(new_quiz)
+    await session.commit()
+    await session.refresh(new_quiz)
+    return new_quiz
+
+
+async def update_quiz(session: AsyncSession, quiz: Quiz, quiz_in: QuizCreate) -> Quiz:
+    """
+    Replace the content of an existing quiz and bump its version.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz`: The Quiz object to update.
+        `quiz_in`: `QuizCreate` object containing the new quiz content and metadata.
+
+    Returns:
+        Quiz: The updated Quiz object.
+    """
+    quiz.title = quiz_in.title.strip()
+    quiz.description = quiz_in.description.strip() if quiz_in.description else None
+    quiz.questions = [question.model_dump(mode="json") for question in quiz_in.questions]
+    quiz.question_count = len(quiz_in.questions)
+    quiz.tags = _normalize_tags(quiz_in.tags)
+    quiz.is_public = quiz_in.is_public
+    quiz.version += 1
+    quiz.updated_at = datetime.now(timezone.utc)
+
+    session.add(quiz)
+    await session.commit()
+    await session.refresh(quiz)
+    response_cache.invalidate(QUIZ_CACHE_NAMESPACE, quiz.id)
+    return quiz
+
+
+def quiz_etag(quiz: Quiz) -> str:
+    """
+    Compute the ETag of a quiz's `QuizRead` representation.
+
+    Content changes bump `version`; the counters change without it, so they are included.
+    """
+    return make_etag(
+        quiz.id,
+        quiz.version,
+        quiz.average_rating,
+        quiz.rating_count,
+        quiz.play_count,
+        quiz.comment_count,
+    )
+
+
+def _normalize_tags(tags: list[str]) -> list[str]:
+    return sorted({tag.strip().lower() for tag in tags if tag.strip()})
+
+
+# --- Search --- #
+def build_search_statement(
+    query: str | None,
+    tags: list[str] | None = None,
+    min_rating: float | None = None,
+) -> tuple[Select, list[SortKey]]:
+    """
+    Build the statement and sort keys for searching public quizzes.
+
+    With a text query, results are matched against the GIN-indexed search vector and
+    ordered by rank; without one, the newest quizzes come first.
+
+    Args:
+        `query`: Free-text search terms in web search syntax, or None to browse.
+        `tags`: Only return quizzes carrying all of these tags.
+        `min_rating`: Only return quizzes with at least this average rating.
+
+    Returns:
+        The unordered select statement yielding summary columns, and its sort keys.
+    """
+    if query:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(col(Quiz.search_vector), ts_query, type_=Float).label("rank")
+        statement = select(*SUMMARY_COLUMNS, rank).where(col(Quiz.search_vector).op("@@")(ts_query))
+        keys = [SortKey(rank, "rank"), SortKey(col(Quiz.id), "id")]
+    else:
+        statement = select(*SUMMARY_COLUMNS)
+        keys = [SortKey(col(Quiz.created_at), "created_at"), SortKey(col(Quiz.id), "id")]
+
+    statement = statement.where(col(Quiz.is_public).is_(True))
+    if tags:
+        statement = statement.where(col(Quiz.tags).contains(_normalize_tags(tags)))
+    if min_rating is not None:
+        statement = statement.where(col(Quiz.average_rating) >= min_rating)
+    return statement, keys
+
+
+async def search_quizzes(
+    session: AsyncSession,
+    query: str | None,
+    tags: list[str] | None = None,
+    min_rating: float | None = None,
+    params: PageParams = PageParams(),
+) -> QuizSearchPage:
+    """
+    Search public quizzes by text, tags and rating, one keyset-paginated page at a time.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `query`: Free-text search terms, or None to browse the newest quizzes.
+        `tags`: Only return quizzes carrying all of these tags.
+        `min_rating`: Only return quizzes with at least this average rating.
+        `params`: The page size and cursor.
+
+    Returns:
+        QuizSearchPage: The matching quizzes and the cursor for the next page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    query = query.strip() if query else None
+    statement, keys = build_search_statement(query, tags, min_rating)
+    rows, next_cursor = await paginate(session, statement, keys, params)
+    return QuizSearchPage(
+        items=[QuizSummary.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+    )
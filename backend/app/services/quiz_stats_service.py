@@ -0,0 +1,352 @@
+import asyncio
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Float, bindparam, case, cast, func, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.game import Game
+from app.models.quiz import Quiz, QuizComment, QuizRating
+from app.services.quiz_service import QUIZ_CACHE_NAMESPACE
+from app.utils.http_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CounterDelta:
+    """
+    Pending changes to the counters of one quiz.
+    """
+
+    plays: int = 0
+    comments: int = 0
+    ratings: int = 0
+    rating_total: int = 0
+
+
+class QuizCounterBuffer:
+    """
+    Accumulates counter changes in memory and applies them to `quizzes` in batches.
+
+    Writers only touch an in-process dict, so a popular quiz receiving many plays,
+    ratings or comments at once never queues transactions on its row lock. Each flush
+    applies the summed deltas with relative `SET x = x + :delta` updates, in quiz id
+    order, which is safe against concurrent flushes from other workers.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[uuid.UUID, CounterDelta] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        quiz_id: uuid.UUID,
+        plays: int = 0,
+        comments: int = 0,
+        ratings: int = 0,
+        rating_total: int = 0,
+    ) -> None:
+        """
+        Record a change to the counters of a quiz.
+
+        Args:
+            `quiz_id`: UUID of the quiz.
+            `plays`: Change in the number of games played.
+            `comments`: Change in the number of comments.
+            `ratings`: Change in the number of ratings.
+            `rating_total`: Change in the sum of all rating scores.
+        """
+        with self._lock:
+            delta = self._deltas.setdefault(quiz_id, CounterDelta())
+            delta.plays += plays
+            delta.comments += comments
+            delta.ratings += ratings
+            delta.rating_total += rating_total
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def drain(self) -> dict[uuid.UUID, CounterDelta]:
+        """
+        Take all pending deltas, leaving the buffer empty.
+        """
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+        return deltas
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Apply all pending deltas to the database in a single batched UPDATE.
+
+        If the update fails, the deltas are put back so that the next flush retries them.
+
+        Args:
+            `session`: Async database session for executing queries.
+
+        Returns:
+            The number of quizzes updated.
+        """
+        deltas = self.drain()
+        if not deltas:
+            return 0
+
+        quizzes = Quiz.metadata.tables["quizzes"]
+        rating_count = quizzes.c.rating_count + bindparam("d_ratings")
+        rating_total = quizzes.c.rating_total + bindparam("d_rating_total")
+        statement = (
+            update(quizzes)
+            .where(quizzes.c.id == bindparam("quiz_id"))
+            .values(
+                play_count=quizzes.c.play_count + bindparam("d_plays"),
+                comment_count=quizzes.c.comment_count + bindparam("d_comments"),
+                rating_count=rating_count,
+                rating_total=rating_total,
+                average_rating=case(
+                    (rating_count > 0, cast(rating_total, Float) / rating_count), else_=0.0
+                ),
+            )
+        )
+        params = [
+            {
+                "quiz_id": quiz_id,
+                "d_plays": delta.plays,
+                "d_comments": delta.comments,
+                "d_ratings": delta.ratings,
+                "d_rating_total": delta.rating_total,
+            }
+            for quiz_id, delta in sorted(deltas.items())
+        ]
+
+        try:
+            # Executed on the connection, as a plain executemany rather than an ORM bulk update
+            connection = await session.connection()
+            await connection.execute(statement, params)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            for quiz_id, delta in deltas.items():
+                self.add(quiz_id, delta.plays, delta.comments, delta.ratings, delta.rating_total)
+            raise
+        response_cache.invalidate(QUIZ_CACHE_NAMESPACE, *deltas)
+        return len(params)
+
+
+# Shared buffer for this process
+quiz_counters = QuizCounterBuffer()
+
+
+async def run_counter_flusher(interval: float | None = None) -> None:
+    """
+    Flush the shared counter buffer periodically until cancelled, then flush once more.
+
+    Args:
+        `interval`: Seconds between flushes, defaults to `COUNTER_FLUSH_INTERVAL_SECONDS`.
+    """
+    interval = interval or settings.COUNTER_FLUSH_INTERVAL_SECONDS
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            if not len(quiz_counters):
+                continue
+            try:
+                async with AsyncSessionLocal() as session:
+                    await quiz_counters.flush(session)
+            except Exception as e:
+                logger.error(f"Flushing quiz counters failed: {e}")
+    finally:
+        if len(quiz_counters):
+            try:
+                async with AsyncSessionLocal() as session:
+                    await quiz_counters.flush(session)
+            except Exception as e:
+                logger.error(f"Final flush of quiz counters failed: {e}")
+
+
+# --- Write Paths --- #
+async def rate_quiz(
+    session: AsyncSession, quiz_id: uuid.UUID, user_id: uuid.UUID, score: int
+) -> QuizRating:
+    """
+    Create or replace a user's rating of a quiz and buffer the counter change.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the rated quiz.
+        `user_id`: UUID of the user rating the quiz.
+        `score`: Rating from 1 to 5.
+
+    Returns:
+        QuizRating: The stored rating.
+    """
+    # A new rating is inserted with ON CONFLICT DO NOTHING and an existing one is locked
+    # before its delta is taken, so concurrent ratings by the same user neither collide on
+    # the primary key nor both subtract the same previous score
+    connection = await session.connection()
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    rating = QuizRating(quiz_id=quiz_id, user_id=user_id, score=score)
+    statement = (
+        insert(QuizRating)
+        .values(rating.model_dump())
+        .on_conflict_do_nothing()
+        .returning(col(QuizRating.quiz_id))
+    )
+    if (await session.execute(statement)).first() is not None:
+        ratings, rating_total = 1, score
+    else:
+        existing = (
+            select(QuizRating)
+            .where(QuizRating.quiz_id == quiz_id, QuizRating.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        rating = (await session.execute(existing)).scalar_one()
+        ratings, rating_total = 0, score - rating.score
+        rating.score = score
+        rating.updated_at = datetime.now(timezone.utc)
+        session.add(rating)
+
+    await session.commit()
+    quiz_counters.add(quiz_id, ratings=ratings, rating_total=rating_total)
+    return rating
+
+
+async def add_comment(
+    session: AsyncSession, quiz_id: uuid.UUID, user_id: uuid.UUID, body: str
+) -> QuizComment:
+    """
+    Add a comment to a quiz and buffer the counter change.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `quiz_id`: UUID of the commented quiz.
+        `user_id`: UUID of the commenting user.
+        `body`: Text of the comment.
+
+    Returns:
+        QuizComment: The new comment.
+    """
+    comment = QuizComment(quiz_id=quiz_id, user_id=user_id, body=body.strip())
+    session.add(comment)
+    await session.commit()
+    await session.refresh(comment)
+    quiz_counters.add(quiz_id, comments=1)
+    return comment
+
+
+def record_play(quiz_id: uuid.UUID) -> None:
+    """
+    Buffer one more play of a quiz.
+    """
+    quiz_counters.add(quiz_id, plays=1)
+
+
+# --- Reconciliation --- #
+async def reconcile_quiz_counters(
+    session: AsyncSession, batch_size: int = 1000, quiet_seconds: float | None = None
+) -> int:
+    """
+    Recompute the counters of every quiz without recent activity from the ratings,
+    comments and games tables.
+
+    Corrects drift from buffered deltas lost in a crash. Quizzes are processed in
+    batches of `batch_size` in id order, each batch in its own short transaction.
+    Quizzes rated, commented or played in the last `quiet_seconds` are skipped, as other
+    workers may still buffer deltas for them that would be applied again on top of the
+    recomputed counters. The check is part of the UPDATE, so it sees the same rows as the
+    recomputation.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `batch_size`: Number of quizzes updated per transaction.
+        `quiet_seconds`: Seconds without activity before a quiz is recomputed, defaults
+            to twice `COUNTER_FLUSH_INTERVAL_SECONDS`.
+
+    Returns:
+        The number of quizzes reconciled.
+    """
+    await quiz_counters.flush(session)
+    if quiet_seconds is None:
+        quiet_seconds = 2 * settings.COUNTER_FLUSH_INTERVAL_SECONDS
+    active_since = datetime.now(timezone.utc) - timedelta(seconds=quiet_seconds)
+
+    rating_count = (
+        select(func.count())
+        .select_from(QuizRating)
+        .where(QuizRating.quiz_id == Quiz.id)
+        .scalar_subquery()
+    )
+    rating_total = (
+        select(func.coalesce(func.sum(QuizRating.score), 0))
+        .where(QuizRating.quiz_id == Quiz.id)
+        .scalar_subquery()
+    )
+    comment_count = (
+        select(func.count())
+        .select_from(QuizComment)
+        .where(QuizComment.quiz_id == Quiz.id)
+        .scalar_subquery()
+    )
+    play_count = (
+        select(func.count()).select_from(Game).where(Game.quiz_id == Quiz.id).scalar_subquery()
+    )
+    recently_active = or_(
+        select(QuizRating.quiz_id)
+        .where(QuizRating.quiz_id == Quiz.id, col(QuizRating.updated_at) >= active_since)
+        .exists(),
+        select(QuizComment.id)
+        .where(QuizComment.quiz_id == Quiz.id, col(QuizComment.created_at) >= active_since)
+        .exists(),
+        select(Game.id)
+        .where(Game.quiz_id == Quiz.id, col(Game.started_at) >= active_since)
+        .exists(),
+    )
+
+    reconciled = 0
+    last_id: uuid.UUID | None = None
+    while True:
+        batch = select(Quiz.id).order_by(col(Quiz.id)).limit(batch_size)
+        if last_id is not None:
+            batch = batch.where(Quiz.id > last_id)
+        quiz_ids = list((await session.execute(batch)).scalars().all())
+        if not quiz_ids:
+            break
+
+        result = await session.execute(
+            update(Quiz)
+            .where(col(Quiz.id).in_(quiz_ids), ~recently_active)
+            .values(
+                rating_count=rating_count,
+                rating_total=rating_total,
+                average_rating=case(
+                    (rating_count > 0, cast(rating_total, Float) / rating_count), else_=0.0
+                ),
+                comment_count=comment_count,
+                play_count=play_count,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        reconciled += result.rowcount
+        last_id = quiz_ids[-1]
+        response_cache.invalidate(QUIZ_CACHE_NAMESPACE, *quiz_ids)
+
+    logger.info(f"Reconciled counters of {reconciled} quizzes")
+    return reconciled
+
+
+async def _reconcile() -> None:
+    async with AsyncSessionLocal() as session:
+        await reconcile_quiz_counters(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(_reconcile())
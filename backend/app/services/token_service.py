@@ -0,0 +1,266 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.user import RefreshToken, Token, TokenRevocation, User
+from app.services import auth_service
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenError(Exception):
+    """
+    Raised when a refresh token is unknown, expired, revoked or already used.
+    """
+
+
+# --- Helper Functions --- #
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes, all of which are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def hash_refresh_token(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def access_token_lifetime() -> timedelta:
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+# --- Revocations --- #
+class RevocationList:
+    """
+    In-memory copy of recent access token revocations, as a "not before" time per user.
+
+    Checking a token is a dict lookup, so authenticating a request never needs the database
+    to know that its token was not revoked. Revocations made by this worker apply at once;
+    those made by others are loaded by `sync_revocations`. An entry is dropped once every
+    token it revokes has expired anyway.
+
+    Only used from the event loop, so it needs no locking.
+    """
+
+    def __init__(self) -> None:
+        self._not_before: dict[uuid.UUID, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._not_before)
+
+    def revoke(self, user_id: uuid.UUID, not_before: float) -> None:
+        """
+        Reject the user's access tokens issued before `not_before` (a POSIX timestamp).
+        """
+        self._not_before[user_id] = max(not_before, self._not_before.get(user_id, 0.0))
+
+    def is_revoked(self, user_id: uuid.UUID, issued_at: Optional[float]) -> bool:
+        """
+        Whether an access token of the user issued at `issued_at` was revoked.
+
+        Tokens without an issue time predate revocations and are revoked with any of them.
+        """
+        not_before = self._not_before.get(user_id)
+        return not_before is not None and (issued_at or 0.0) < not_before
+
+    def merge(self, entries: dict[uuid.UUID, float], horizon: float) -> None:
+        """
+        Add revocations loaded from the database and drop those older than `horizon`.
+        """
+        for user_id, not_before in entries.items():
+            self.revoke(user_id, not_before)
+        self._not_before = {
+            user_id: not_before
+            for user_id, not_before in self._not_before.items()
+            if not_before > horizon
+        }
+
+    def clear(self) -> None:
+        self._not_before.clear()
+
+
+# Shared revocation list for this process
+revocations = RevocationList()
+
+
+async def revoke_user_tokens(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """
+    Sign a user out everywhere: reject their current access tokens and refresh tokens.
+
+    Other workers reject the access tokens after their next `sync_revocations`.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `user_id`: UUID of the user.
+    """
+    now = datetime.now(timezone.utc)
+    connection = await session.connection()
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    await session.execute(
+        insert(TokenRevocation)
+        .values(user_id=user_id, not_before=now)
+        .on_conflict_do_update(index_elements=["user_id"], set_={"not_before": now})
+    )
+    await session.execute(
+        update(RefreshToken)
+        .where(col(RefreshToken.user_id) == user_id, col(RefreshToken.revoked_at).is_(None))
+        .values(revoked_at=now)
+    )
+    await session.commit()
+    revocations.revoke(user_id, now.timestamp())
+
+
+async def sync_revocations(session: AsyncSession) -> None:
+    """
+    Load the revocations of every worker that may still affect unexpired access tokens.
+
+    Args:
+        `session`: Async database session for executing queries.
+    """
+    horizon = datetime.now(timezone.utc) - access_token_lifetime()
+    result = await session.execute(
+        select(TokenRevocation.user_id, TokenRevocation.not_before).where(
+            TokenRevocation.not_before > horizon
+        )
+    )
+    revocations.merge(
+        {user_id: as_utc(not_before).timestamp() for user_id, not_before in result.all()},
+        horizon.timestamp(),
+    )
+
+
+async def run_revocation_sync(interval: float | None = None) -> None:
+    """
+    Keep the shared revocation list in sync with the database until cancelled.
+
+    Args:
+        `interval`: Seconds between syncs, defaults to `TOKEN_REVOCATION_SYNC_SECONDS`.
+    """
+    interval = interval or settings.TOKEN_REVOCATION_SYNC_SECONDS
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await sync_revocations(session)
+        except Exception as e:
+            logger.error(f"Syncing token revocations failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# --- Refresh Tokens --- #
+async def issue_tokens(
+    session: AsyncSession, user: User, family_id: Optional[uuid.UUID] = None
+) -> Token:
+    """
+    Issue an access token and a new refresh token for a user.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `user`: The authenticated user.
+        `family_id`: Family of the refresh token being rotated, or None for a new login.
+
+    Returns:
+        Token: The access token, refresh token and access token lifetime.
+    """
+    lifetime = access_token_lifetime()
+    access_token = auth_service.create_access_token(
+        data={"sub": str(user.id), "email": user.email}, expires_delta=lifetime
+    )
+
+    secret = secrets.token_urlsafe(32)
+    session.add(
+        RefreshToken(
+            user_id=user.id,
+            family_id=family_id or uuid.uuid4(),
+            token_hash=hash_refresh_token(secret),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    await session.commit()
+    return Token(
+        access_token=access_token,
+        refresh_token=secret,
+        expires_in=int(lifetime.total_seconds()),
+    )
+
+
+async def _revoke_family(session: AsyncSession, family_id: uuid.UUID) -> None:
+    await session.execute(
+        update(RefreshToken)
+        .where(col(RefreshToken.family_id) == family_id, col(RefreshToken.revoked_at).is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await session.commit()
+
+
+async def rotate_refresh_token(session: AsyncSession, secret: str) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    The presented token can not be used again. If it already was, it has leaked, and every
+    token of its family is revoked.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `secret`: The refresh token.
+
+    Returns:
+        Token: The new tokens.
+
+    Raises:
+        RefreshTokenError: If the token is not valid, or its user is inactive.
+    """
+    statement = (
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(secret))
+        .with_for_update()
+    )
+    refresh_token = (await session.execute(statement)).scalar_one_or_none()
+    if refresh_token is None:
+        raise RefreshTokenError("Unknown refresh token")
+    if refresh_token.used_at is not None or refresh_token.revoked_at is not None:
+        if refresh_token.revoked_at is None:
+            logger.warning(
+                "Refresh token reused, revoking its family",
+                extra={"user_id": str(refresh_token.user_id)},
+            )
+        await _revoke_family(session, refresh_token.family_id)
+        raise RefreshTokenError("Refresh token was already used")
+    now = datetime.now(timezone.utc)
+    if as_utc(refresh_token.expires_at) <= now:
+        raise RefreshTokenError("Refresh token expired")
+
+    user = await session.get(User, refresh_token.user_id)
+    if user is None or not user.is_active:
+        raise RefreshTokenError("User is inactive")
+
+    refresh_token.used_at = now
+    session.add(refresh_token)
+    return await issue_tokens(session, user, refresh_token.family_id)
+
+
+async def revoke_refresh_token(session: AsyncSession, secret: str) -> None:
+    """
+    Sign out one session by revoking its refresh token family. Unknown tokens are ignored.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `secret`: The refresh token.
+    """
+    statement = select(RefreshToken.family_id).where(
+        RefreshToken.token_hash == hash_refresh_token(secret)
+    )
+    family_id = (await session.execute(statement)).scalar_one_or_none()
+    if family_id is not None:
+        await _revoke_family(session, family_id)
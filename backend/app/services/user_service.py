@@ -5,6 +5,10 @@ from sqlmodel import select
 
 from app.models.user import User, UserCreate
 from app.services import auth_service
+from app.utils.http_cache import make_etag, response_cache
+
+# Response cache namespace of rendered `UserRead` bodies, keyed by id and by ("email", email)
+USER_CACHE_NAMESPACE = "users"
 
 
 async def get_user_by_id(session: AsyncSession, user_id: uuid.UUID) -> User | None:
@@ -37,6 +41,22 @@ async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
     return result.scalar_one_or_none()
 
 
+async def get_user_by_google_id(session: AsyncSession, google_id: str) -> User | None:
+    """
+    Retrieve a user from the database by their Google account ID.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `google_id`: Google account ID (the `sub` claim of their ID tokens).
+
+    Returns:
+        User: The User object if found, otherwise None.
+    """
+    statement = select(User).where(User.google_id == google_id)
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
 async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
     """
     Create a new user in the database.
@@ -53,7 +73,7 @@ async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
     normalized_username = user_in.username.strip()
     normalized_password = user_in.password.strip() if user_in.password else None
     hashed_password = (
-        auth_service.hash_password(normalized_password) if normalized_password else None
+        await auth_service.hash_password_async(normalized_password) if normalized_password else None
     )
     normalized_google_id = user_in.google_id.strip() if user_in.google_id else None
 
@@ -68,3 +88,17 @@ async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
     await session.commit()
     await session.refresh(new_user)
     return new_user
+
+
+def user_etag(user: User) -> str:
+    """
+    Compute the ETag of a user's `UserRead` representation.
+    """
+    return make_etag(user.id, user.email, user.username, user.is_active, user.created_at)
+
+
+def invalidate_cached_user(user: User) -> None:
+    """
+    Drop the cached responses of a user. Must be called whenever a user's public fields change.
+    """
+    response_cache.invalidate(USER_CACHE_NAMESPACE, user.id, ("email", user.email))
@@ -0,0 +1,62 @@
+import zlib
+
+from fastapi import Request
+
+# zlib window settings for each supported Content-Encoding
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+class PayloadTooLargeError(ValueError):
+    """
+    Raised when a request body is larger than allowed once decompressed.
+    """
+
+
+class UnsupportedEncodingError(ValueError):
+    """
+    Raised when a request body uses a Content-Encoding other than gzip, deflate or identity.
+    """
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Read a request body, decompressing it as it streams in according to Content-Encoding.
+
+    The decompressed size is capped as data arrives, so a small compressed body cannot
+    expand into an unbounded amount of memory.
+
+    Args:
+        `request`: The incoming request.
+        `max_bytes`: Largest accepted body size after decompression.
+
+    Returns:
+        The decompressed body.
+
+    Raises:
+        PayloadTooLargeError: If the body is larger than `max_bytes` once decompressed.
+        UnsupportedEncodingError: If the Content-Encoding is not supported.
+        ValueError: If the compressed data is corrupt.
+    """
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in _WBITS and encoding != "identity":
+        raise UnsupportedEncodingError(f"Unsupported Content-Encoding: {encoding}")
+    inflater = zlib.decompressobj(_WBITS[encoding]) if encoding in _WBITS else None
+
+    body = bytearray()
+    try:
+        async for chunk in request.stream():
+            if inflater is not None:
+                # Ask for one byte more than allowed, so that overflowing is detectable
+                chunk = inflater.decompress(chunk, max_bytes - len(body) + 1)
+            body += chunk
+            if len(body) > max_bytes:
+                raise PayloadTooLargeError
+        if inflater is not None:
+            body += inflater.flush()
+            if not inflater.eof:
+                raise ValueError("Truncated compressed body")
+    except zlib.error as e:
+        raise ValueError("Corrupt compressed body") from e
+    if len(body) > max_bytes:
+        raise PayloadTooLargeError
+    return bytes(body)
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Responses of authenticated endpoints may be stored by the browser, but must be revalidated
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Compute a strong ETag from the values a response is rendered from.
+
+    Pass a row version where the table has one, otherwise every column the response shows.
+    The values are hashed by `repr`, so they must have a stable one (UUIDs, datetimes, ...).
+
+    Args:
+        *parts: The values identifying the state of the resource.
+
+    Returns:
+        The quoted ETag.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether a request's `If-None-Match` header lists the given ETag.
+
+    Uses the weak comparison that RFC 9110 prescribes for `If-None-Match`.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def conditional_response(request: Request, etag: str, render: Callable[[], bytes]) -> Response:
+    """
+    Answer a GET request with 304 Not Modified if the client holds the current version.
+
+    The body is only rendered when it has to be sent.
+
+    Args:
+        `request`: The incoming request.
+        `etag`: ETag of the current version of the resource.
+        `render`: Returns the JSON body.
+
+    Returns:
+        An empty 304 response, or a 200 response with the body.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=render(), media_type="application/json", headers=headers)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """
+    A rendered response body and the ETag of the version it was rendered from.
+    """
+
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of rendered response bodies with a TTL per entry.
+
+    Entries are grouped by namespace, one per kind of resource, so that services can drop
+    everything cached about a resource when it changes. Each worker process has its own
+    cache: routes that serve entries without reading the database rely on the TTL to bound
+    staleness caused by writes in other processes, while routes that check the entry's
+    ETag against the row only save the serialization.
+
+    Only used from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[str, Hashable], CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, key: Hashable) -> CachedResponse | None:
+        """
+        Return a live entry, or None if it is missing, expired or caching is disabled.
+        """
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic() or not settings.RESPONSE_CACHE_ENABLED:
+            del self._entries[(namespace, key)]
+            return None
+        self._entries.move_to_end((namespace, key))
+        return entry
+
+    def put(
+        self, namespace: str, key: Hashable, etag: str, body: bytes, ttl: float
+    ) -> CachedResponse:
+        """
+        Store a rendered body for `ttl` seconds, evicting the least recently used entries.
+
+        Returns:
+            The entry, which is not stored if caching is disabled or `ttl` is not positive.
+        """
+        entry = CachedResponse(etag=etag, body=body, expires_at=time.monotonic() + ttl)
+        if ttl <= 0 or not settings.RESPONSE_CACHE_ENABLED:
+            return entry
+        self._entries[(namespace, key)] = entry
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def render(
+        self,
+        namespace: str,
+        key: Hashable,
+        etag: str,
+        render: Callable[[], bytes],
+        ttl: float,
+    ) -> bytes:
+        """
+        Return the cached body if it was rendered from the version `etag` names, otherwise
+        render and store it.
+        """
+        entry = self.get(namespace, key)
+        if entry is not None and entry.etag == etag:
+            return entry.body
+        return self.put(namespace, key, etag, render(), ttl).body
+
+    def invalidate(self, namespace: str, *keys: Hashable) -> None:
+        """
+        Drop the given entries of a namespace, or the whole namespace if no keys are given.
+        """
+        if keys:
+            for key in keys:
+                self._entries.pop((namespace, key), None)
+            return
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == namespace]:
+            del self._entries[entry_key]
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        self._entries.clear()
+
+
+# Shared cache for this process
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
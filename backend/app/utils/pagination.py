@@ -0,0 +1,251 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any, Generic, Optional, Sequence, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, QueryableAttribute
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded for the requested sort keys.
+    """
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset sort order.
+
+    Sort keys must be non-nullable, and the last key of a sort order must be unique
+    (usually the primary key) so that every row has a distinct position.
+
+    Attributes:
+        `column`: The column or labeled expression to sort by.
+        `name`: Attribute name of the value on result rows.
+        `descending`: Sort direction, newest/highest first by default.
+    """
+
+    column: ColumnElement[Any] | Mapped[Any]
+    name: str
+    descending: bool = True
+
+
+@dataclass(frozen=True)
+class PageParams:
+    """
+    Pagination parameters of a list endpoint.
+
+    Attributes:
+        `limit`: Maximum number of items per page.
+        `cursor`: Opaque cursor returned with the previous page, None for the first page.
+    """
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+
+
+def page_params(
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Annotated[Optional[str], Query(description="Cursor from the previous page")] = None,
+) -> PageParams:
+    """
+    FastAPI dependency to read the `limit` and `cursor` query parameters of a list endpoint.
+    """
+    return PageParams(limit=limit, cursor=cursor)
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Generic Pydantic model for one page of a cursor-paginated listing.
+
+    Attributes:
+        items (list[T]): Items on this page, in sort order.
+        next_cursor (Optional[str]): Opaque cursor for the next page, None on the last page.
+    """
+
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+# --- Cursor Encoding --- #
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _python_type(key: SortKey) -> Optional[type]:
+    column = key.column
+    if isinstance(column, QueryableAttribute):
+        column = column.expression
+    try:
+        return column.type.python_type if isinstance(column, ColumnElement) else None
+    except NotImplementedError:
+        return None
+
+
+def _from_json(value: Any, key: SortKey) -> Any:
+    # Values must have the JSON type `_to_json` encodes the column's type as, since
+    # e.g. uuid.UUID(5) raises AttributeError rather than ValueError
+    python_type = _python_type(key)
+    if python_type in (datetime, uuid.UUID, str):
+        if not isinstance(value, str):
+            raise InvalidCursorError("Invalid cursor")
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        return uuid.UUID(value) if python_type is uuid.UUID else value
+    if python_type in (int, float):
+        json_types = (int,) if python_type is int else (int, float)
+        if isinstance(value, bool) or not isinstance(value, json_types):
+            raise InvalidCursorError("Invalid cursor")
+        return python_type(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key values of the last row of a page into an opaque cursor.
+
+    Args:
+        `values`: Sort key values, in sort key order.
+
+    Returns:
+        A URL-safe cursor string.
+    """
+    payload = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> tuple[Any, ...]:
+    """
+    Decode a cursor back into typed sort key values.
+
+    Args:
+        `cursor`: Cursor produced by `encode_cursor`.
+        `keys`: The sort keys the cursor was produced for.
+
+    Returns:
+        The sort key values, converted to the Python types of the sort columns.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or does not match the sort keys.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise InvalidCursorError("Invalid cursor")
+        return tuple(_from_json(value, key) for value, key in zip(values, keys))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+# --- SQL Generation --- #
+def keyset_predicate(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """
+    Build the predicate selecting rows that sort strictly after the given position.
+
+    When all keys share a direction this is a single row-value comparison, which
+    PostgreSQL can answer with a range scan on a matching composite index. Mixed
+    directions expand to `(a > x) OR (a = x AND b < y) ...`.
+
+    Args:
+        `keys`: The sort keys.
+        `values`: The sort key values of the last row of the previous page.
+
+    Returns:
+        The boolean SQL expression.
+    """
+    if all(key.descending == keys[0].descending for key in keys):
+        row = tuple_(*(key.column for key in keys))
+        position = tuple_(*values)
+        return row < position if keys[0].descending else row > position
+
+    clauses = []
+    for index, key in enumerate(keys):
+        after = key.column < values[index] if key.descending else key.column > values[index]
+        equal = [keys[i].column == values[i] for i in range(index)]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+def keyset_order_by(keys: Sequence[SortKey]) -> list[ColumnElement[Any]]:
+    """
+    Build the ORDER BY clauses for the sort keys.
+    """
+    return [key.column.desc() if key.descending else key.column.asc() for key in keys]
+
+
+def apply_keyset(
+    statement: Select, keys: Sequence[SortKey], limit: int, cursor: Optional[str] = None
+) -> Select:
+    """
+    Order, filter and limit a statement to fetch one page after the cursor.
+
+    One extra row is selected to tell whether a next page exists.
+
+    Args:
+        `statement`: The select statement of the listing, without ordering or limit.
+        `keys`: The sort keys.
+        `limit`: Maximum number of items per page.
+        `cursor`: Cursor returned with the previous page.
+
+    Returns:
+        The paginated statement.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    if cursor:
+        statement = statement.where(keyset_predicate(keys, decode_cursor(cursor, keys)))
+    return statement.order_by(*keyset_order_by(keys)).limit(limit + 1)
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    keys: Sequence[SortKey],
+    params: PageParams,
+    scalars: bool = False,
+) -> tuple[list[Any], Optional[str]]:
+    """
+    Fetch one page of a listing with keyset pagination.
+
+    Every page costs one indexed range scan of `limit + 1` rows, however deep it is.
+
+    Args:
+        `session`: Async database session for executing queries.
+        `statement`: The select statement of the listing, without ordering or limit.
+        `keys`: The sort keys; their `name` must be an attribute of the result rows.
+        `params`: The page size and cursor.
+        `scalars`: Return the first column of each row (e.g. ORM objects) instead of rows.
+
+    Returns:
+        The items of the page and the cursor for the next page, None on the last page.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    result = await session.execute(apply_keyset(statement, keys, params.limit, params.cursor))
+    items = list(result.scalars().all() if scalars else result.all())
+
+    next_cursor = None
+    if len(items) > params.limit:
+        items = items[: params.limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, key.name) for key in keys])
+    return items, next_cursor
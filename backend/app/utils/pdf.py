@@ -0,0 +1,214 @@
+import zlib
+
+# Page sizes in PDF points (1/72 inch)
+PAPER_SIZES: dict[str, tuple[float, float]] = {
+    "a4": (595.28, 841.89),
+    "letter": (612.0, 792.0),
+}
+
+# Glyph widths of Helvetica for printable ASCII, in 1/1000 of the font size. Characters
+# outside this range are measured as a digit, which is close to the font's average width.
+_HELVETICA_WIDTHS = (
+    # fmt: off
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    # fmt: on
+)
+_DEFAULT_WIDTH = 556
+# Bold glyphs are wider; widening every glyph keeps wrapped bold lines inside the margins
+_BOLD_FACTOR = 1.08
+
+_FONTS = {False: b"F1", True: b"F2"}
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """
+    Measure the width of a line of Helvetica text.
+
+    Args:
+        `text`: The text to measure.
+        `size`: Font size in points.
+        `bold`: Whether the text is set in Helvetica-Bold.
+
+    Returns:
+        The width of the text in points.
+    """
+    units = sum(
+        _HELVETICA_WIDTHS[code - 32] if 32 <= code < 127 else _DEFAULT_WIDTH
+        for code in map(ord, text)
+    )
+    return units * size / 1000 * (_BOLD_FACTOR if bold else 1.0)
+
+
+def wrap_text(text: str, size: float, width: float, bold: bool = False) -> list[str]:
+    """
+    Break text into lines that fit within a width, splitting on whitespace.
+
+    Words longer than a whole line are split between characters.
+
+    Args:
+        `text`: The text to wrap; newlines start a new line.
+        `size`: Font size in points.
+        `width`: Available line width in points.
+        `bold`: Whether the text is set in Helvetica-Bold.
+
+    Returns:
+        The wrapped lines; an empty text yields a single empty line.
+    """
+    lines: list[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, size, bold) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = ""
+            while text_width(word, size, bold) > width:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], size, bold) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _escape(text: str) -> bytes:
+    # Standard fonts use WinAnsiEncoding; characters it lacks are printed as "?"
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class PdfWriter:
+    """
+    Minimal writer for text-only PDF documents using the standard Helvetica fonts.
+
+    Text is laid out top to bottom; a new page starts automatically when the current one
+    is full. Standard fonts need no embedding, so documents stay small and rendering is
+    pure Python with no native dependencies.
+    """
+
+    def __init__(self, page_size: tuple[float, float], margin: float = 56.0):
+        self.page_width, self.page_height = page_size
+        self.margin = margin
+        self._pages: list[list[bytes]] = []
+        self._y = 0.0
+        self.new_page()
+
+    @property
+    def line_width(self) -> float:
+        return self.page_width - 2 * self.margin
+
+    def new_page(self) -> None:
+        self._pages.append([])
+        self._y = self.page_height - self.margin
+
+    def ensure_space(self, height: float) -> None:
+        """
+        Start a new page unless `height` points still fit on the current one.
+        """
+        if self._y - height < self.margin and self._pages[-1]:
+            self.new_page()
+
+    def space(self, height: float) -> None:
+        self._y -= height
+
+    def paragraph(
+        self,
+        text: str,
+        size: float,
+        bold: bool = False,
+        indent: float = 0.0,
+        keep_together: bool = False,
+    ) -> None:
+        """
+        Write wrapped text at the current position.
+
+        Args:
+            `text`: The text to write.
+            `size`: Font size in points.
+            `bold`: Whether to use Helvetica-Bold.
+            `indent`: Left indent in points, relative to the margin.
+            `keep_together`: Move the whole paragraph to a new page rather than split it.
+        """
+        leading = size * 1.3
+        lines = wrap_text(text, size, self.line_width - indent, bold)
+        if keep_together:
+            self.ensure_space(leading * len(lines))
+        for line in lines:
+            self.ensure_space(leading)
+            self._y -= leading
+            if line:
+                self._pages[-1].append(
+                    b"BT /%s %.1f Tf %.2f %.2f Td (%s) Tj ET"
+                    % (
+                        _FONTS[bold],
+                        size,
+                        self.margin + indent,
+                        self._y + size * 0.25,
+                        _escape(line),
+                    )
+                )
+
+    def rule(self, width: float, indent: float = 0.0, height: float = 18.0) -> None:
+        """
+        Draw a horizontal line to write on, such as an answer blank.
+        """
+        self.ensure_space(height)
+        self._y -= height
+        x = self.margin + indent
+        self._pages[-1].append(
+            b"0.5 w %.2f %.2f m %.2f %.2f l S" % (x, self._y, x + width, self._y)
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the document.
+
+        Returns:
+            The complete PDF file.
+        """
+        page_count = len(self._pages)
+        # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a page and a content stream per page
+        page_ids = [5 + 2 * index for index in range(page_count)]
+        objects: list[bytes] = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (b" ".join(b"%d 0 R" % page_id for page_id in page_ids), page_count),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+            b"/Encoding /WinAnsiEncoding >>",
+        ]
+        for page_id, operations in zip(page_ids, self._pages):
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+                b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                % (self.page_width, self.page_height, page_id + 1)
+            )
+            stream = zlib.compress(b"\n".join(operations))
+            objects.append(
+                b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+                % (len(stream), stream)
+            )
+
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for object_id, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n%s\nendobj\n" % (object_id, body)
+        xref_offset = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1,
+            xref_offset,
+        )
+        return bytes(output)
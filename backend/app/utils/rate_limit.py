@@ -0,0 +1,251 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Protocol
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Attributes:
+        `limit` (int): Events allowed per window; 0 disables the limit.
+        `window_seconds` (float): Length of the sliding window.
+    """
+
+    limit: int
+    window_seconds: float
+
+
+def sliding_estimate(previous: int, current: int, elapsed_fraction: float) -> float:
+    """
+    Estimate the events of the last window from two fixed windows, assuming the previous
+    one's events were spread evenly.
+    """
+    return previous * (1.0 - elapsed_fraction) + current
+
+
+class WindowCounter(Protocol):
+    """
+    Counts events per key over sliding windows.
+    """
+
+    async def count(self, key: str, window_seconds: float) -> float: ...
+
+    async def add(self, key: str, window_seconds: float) -> None: ...
+
+    async def reset(self, key: str, window_seconds: float) -> None: ...
+
+
+@dataclass
+class _Windows:
+    index: int
+    current: int = 0
+    previous: int = 0
+
+
+class MemoryWindowCounter:
+    """
+    Per-process sliding window counters, two integers per key.
+
+    Keys untouched for two windows are swept once per sweep interval, so keys from a spray
+    of addresses or emails do not accumulate. Only used from the event loop, so it needs no
+    locking.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sweep_seconds: float = 60.0):
+        self._clock = clock
+        self._sweep_seconds = sweep_seconds
+        self._next_sweep = clock() + sweep_seconds
+        self._windows: dict[tuple[str, float], _Windows] = {}
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def _current(self, key: str, window_seconds: float) -> tuple[Optional[_Windows], int, float]:
+        position = self._clock() / window_seconds
+        index = int(position)
+        windows = self._windows.get((key, window_seconds))
+        if windows is not None and windows.index != index:
+            # Roll forward: the current window becomes the previous one, or both expire
+            previous = windows.current if windows.index == index - 1 else 0
+            windows.index, windows.current, windows.previous = index, 0, previous
+        return windows, index, position - index
+
+    async def count(self, key: str, window_seconds: float) -> float:
+        windows, _, fraction = self._current(key, window_seconds)
+        if windows is None:
+            return 0.0
+        return sliding_estimate(windows.previous, windows.current, fraction)
+
+    async def add(self, key: str, window_seconds: float) -> None:
+        windows, index, _ = self._current(key, window_seconds)
+        if windows is None:
+            windows = self._windows[(key, window_seconds)] = _Windows(index)
+        windows.current += 1
+        self._maybe_sweep()
+
+    async def reset(self, key: str, window_seconds: float) -> None:
+        self._windows.pop((key, window_seconds), None)
+
+    def _maybe_sweep(self) -> None:
+        now = self._clock()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self._sweep_seconds
+        self._windows = {
+            (key, window_seconds): windows
+            for (key, window_seconds), windows in self._windows.items()
+            if windows.index >= int(now / window_seconds) - 1
+            and (windows.current or windows.previous)
+        }
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+
+class RedisWindowCounter:
+    """
+    Sliding window counters in Redis, shared by every worker and host.
+
+    One round trip per call: fixed windows are keys named by window index, expiring after
+    two windows. Redis errors are logged and count as no events, so an outage disables
+    throttling rather than logins.
+    """
+
+    def __init__(self, url: str, prefix: str = "throttle", clock: Callable[[], float] = time.time):
+        """
+        Args:
+            `url`: Redis URL, such as "redis://localhost:6379/0".
+            `prefix`: Prefix of the counter keys.
+            `clock`: Wall clock, which must agree across hosts.
+
+        Raises:
+            RuntimeError: If the `redis` package is not installed.
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("THROTTLE_REDIS_URL is set but redis is not installed") from e
+        self._redis: Any = redis.from_url(url)
+        self._prefix = prefix
+        self._clock = clock
+
+    def _keys(self, key: str, window_seconds: float) -> tuple[str, str, float]:
+        position = self._clock() / window_seconds
+        index = int(position)
+        base = f"{self._prefix}:{window_seconds:g}:{key}"
+        return f"{base}:{index}", f"{base}:{index - 1}", position - index
+
+    async def count(self, key: str, window_seconds: float) -> float:
+        current_key, previous_key, fraction = self._keys(key, window_seconds)
+        try:
+            current, previous = await self._redis.mget(current_key, previous_key)
+        except Exception as e:
+            logger.warning(f"Reading throttle counters failed: {e}")
+            return 0.0
+        return sliding_estimate(int(previous or 0), int(current or 0), fraction)
+
+    async def add(self, key: str, window_seconds: float) -> None:
+        current_key, _, _ = self._keys(key, window_seconds)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.incr(current_key)
+                pipeline.expire(current_key, math.ceil(2 * window_seconds))
+                await pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Updating throttle counters failed: {e}")
+
+    async def reset(self, key: str, window_seconds: float) -> None:
+        current_key, previous_key, _ = self._keys(key, window_seconds)
+        try:
+            await self._redis.delete(current_key, previous_key)
+        except Exception as e:
+            logger.warning(f"Resetting throttle counters failed: {e}")
+
+
+class LoginThrottle:
+    """
+    Rejects login attempts from busy addresses and against hammered accounts before any
+    database or password hashing work.
+
+    Every attempt counts against its client address and against the email. Attempts are
+    counted before the password is checked, so a burst of concurrent guesses at one
+    account cannot all reach bcrypt; a successful login clears the email's count, so only
+    failed attempts stay counted.
+    """
+
+    def __init__(self, counter: WindowCounter, per_ip: RateLimit, per_email: RateLimit):
+        """
+        Args:
+            `counter`: Where attempts are counted.
+            `per_ip`: Attempts allowed per client address.
+            `per_email`: Attempts allowed per normalized email, not counting the ones
+                cleared by a successful login.
+        """
+        self.counter = counter
+        self.per_ip = per_ip
+        self.per_email = per_email
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"login:email:{email.strip().lower()}"
+
+    async def check(self, ip: Optional[str], email: str) -> float:
+        """
+        Record a login attempt and decide whether it may proceed.
+
+        Args:
+            `ip`: The client's address, if known.
+            `email`: The email being logged into.
+
+        Returns:
+            0 if the attempt may proceed, otherwise the seconds to wait before retrying.
+        """
+        retry_after = 0.0
+        if self.per_email.limit:
+            window = self.per_email.window_seconds
+            key = self._email_key(email)
+            if await self.counter.count(key, window) >= self.per_email.limit:
+                retry_after = window
+            else:
+                await self.counter.add(key, window)
+        if self.per_ip.limit and ip:
+            window = self.per_ip.window_seconds
+            key = f"login:ip:{ip}"
+            if await self.counter.count(key, window) >= self.per_ip.limit:
+                retry_after = max(retry_after, window)
+            else:
+                await self.counter.add(key, window)
+        return retry_after
+
+    async def record_success(self, email: str) -> None:
+        """
+        Clear the attempts counted against the email.
+        """
+        if self.per_email.limit:
+            await self.counter.reset(self._email_key(email), self.per_email.window_seconds)
+
+
+def build_login_throttle() -> LoginThrottle:
+    """
+    Build the login throttle configured in `Settings`.
+    """
+    counter: WindowCounter = (
+        RedisWindowCounter(settings.THROTTLE_REDIS_URL)
+        if settings.THROTTLE_REDIS_URL
+        else MemoryWindowCounter()
+    )
+    return LoginThrottle(
+        counter,
+        per_ip=RateLimit(settings.LOGIN_ATTEMPTS_PER_IP, settings.LOGIN_IP_WINDOW_SECONDS),
+        per_email=RateLimit(settings.LOGIN_FAILURES_PER_EMAIL, settings.LOGIN_EMAIL_WINDOW_SECONDS),
+    )
+
+
+# Shared login throttle for this process
+login_throttle = build_login_throttle()
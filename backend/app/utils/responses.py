@@ -1,7 +1,14 @@
 from typing import Any, Dict
 
+from fastapi import HTTPException, status
+
 from app.models.error import ErrorResponse
 
+InvalidCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid cursor",
+)
+
 
 def get_responses(*codes: int) -> Dict[int | str, Dict[str, Any]]:
     """
@@ -17,12 +24,17 @@ def get_responses(*codes: int) -> Dict[int | str, Dict[str, Any]]:
     Raises:
         ValueError: If any provided status code is not supported.
     """
-    base = {
+    base: Dict[int, Dict[str, Any]] = {
+        304: {"description": "Not Modified: the `If-None-Match` ETag is current"},
         400: {"model": ErrorResponse, "description": "Error: Bad Request"},
         401: {"model": ErrorResponse, "description": "Error: Unauthorized"},
         403: {"model": ErrorResponse, "description": "Error: Forbidden"},
         404: {"model": ErrorResponse, "description": "Error: Not Found"},
         409: {"model": ErrorResponse, "description": "Error: Conflict"},
+        413: {"model": ErrorResponse, "description": "Error: Payload Too Large"},
+        415: {"model": ErrorResponse, "description": "Error: Unsupported Media Type"},
+        429: {"model": ErrorResponse, "description": "Error: Too Many Requests"},
+        503: {"model": ErrorResponse, "description": "Error: Service Unavailable"},
     }
 
     unknown = [c for c in codes if c not in base]
@@ -0,0 +1,95 @@
+from typing import Any, Mapping
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Dict keys may be UUIDs or ints, and analytics payloads carry NumPy arrays
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not handle natively
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON with orjson.
+
+    Handles UUIDs, datetimes, enums, dataclasses, NumPy arrays and Pydantic models.
+
+    Raises:
+        TypeError: If the value contains something that cannot be encoded.
+    """
+    return orjson.dumps(value, default=_default, option=DUMPS_OPTIONS)
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """
+    Decode JSON with orjson.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    return orjson.loads(data)
+
+
+def dump_model(model: BaseModel) -> bytes:
+    """
+    Encode a response model straight to JSON bytes with Pydantic's serializer.
+
+    Skips the validate, dump to dict and encode again steps FastAPI takes for returned
+    models, which is worth it for large or frequently served responses.
+    """
+    return model.model_dump_json().encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the API, rendering content with orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """
+    JSON response rendered directly from a Pydantic model.
+
+    Returning it from a route bypasses FastAPI's response model validation and encoding,
+    so the model must already be an instance of the route's response model.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: BaseModel,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        super().__init__(content=dump_model(model), status_code=status_code, headers=headers)
+
+
+class SocketIOJSON:
+    """
+    Drop-in for the `json` module used by the Socket.IO server to encode packets.
+
+    Socket.IO passes stdlib options such as `separators`, which are ignored: orjson output
+    is always compact.
+    """
+
+    @staticmethod
+    def dumps(value: Any, *args: Any, **kwargs: Any) -> str:
+        return dumps(value).decode()
+
+    @staticmethod
+    def loads(data: str | bytes, *args: Any, **kwargs: Any) -> Any:
+        return loads(data)
@@ -1,21 +1,34 @@
+# WebSocket module initialization
+import logging
 from typing import Any, Dict
 
 import socketio  # type: ignore
 
-# Create a Socket.IO server
-sio = socketio.AsyncServer(cors_allowed_origins="*", async_mode="asgi")
+from app.utils.serialization import SocketIOJSON
 
-# Example WebSocket event handlers
+logger = logging.getLogger(__name__)
 
 
-@sio.event
-async def connect(sid: str, environ: Dict[str, Any]) -> None:
-    """Handle client connection."""
-    print(f"Client {sid} connected")
-    await sio.emit("connected", {"message": "Welcome to Doqu!"}, room=sid)
+def create_sio() -> socketio.AsyncServer:
+    """
+    Create a Socket.IO server with the event handlers registered.
 
+    Each application instance, and so each worker process, gets a server of its own.
+    Workers share no state, so clients must stick to one worker: the frontend connects with
+    the WebSocket transport only, which keeps a client on the worker that accepted it.
+    """
+    # Encode packets with orjson
+    sio = socketio.AsyncServer(cors_allowed_origins="*", async_mode="asgi", json=SocketIOJSON)
 
-@sio.event
-async def disconnect(sid: str) -> None:
-    """Handle client disconnection."""
-    print(f"Client {sid} disconnected")
+    @sio.event
+    async def connect(sid: str, environ: Dict[str, Any]) -> None:
+        """Handle client connection."""
+        logger.info("Client connected", extra={"event": "socket.connect", "sid": sid})
+        await sio.emit("connected", {"message": "Welcome to Doqu!"}, room=sid)
+
+    @sio.event
+    async def disconnect(sid: str) -> None:
+        """Handle client disconnection."""
+        logger.info("Client disconnected", extra={"event": "socket.disconnect", "sid": sid})
+
+    return sio
@@ -0,0 +1,110 @@
+"""
+Benchmark document text extraction and chunking.
+
+Generates a large text file, DOCX document and PDF in a temporary directory, then times
+`iter_document_text` + `chunk_text` over each one and reports throughput and peak Python
+memory. Peak memory should stay flat as `--pages` grows.
+
+Usage (from `backend/`):
+    python -m benchmarks.bench_ingestion --pages 200
+    python -m benchmarks.bench_ingestion --pages 2000 --repeat 3
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from app.ingestion import chunk_text, iter_document_text
+from app.utils.pdf import PAPER_SIZES, PdfWriter
+
+PARAGRAPH = (
+    "Photosynthesis is the process by which green plants use sunlight to synthesize food "
+    "from carbon dioxide and water. It generally involves the green pigment chlorophyll "
+    "and generates oxygen as a by-product. Paragraph {index} of the benchmark textbook."
+)
+PARAGRAPHS_PER_PAGE = 6
+
+DOCX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body>"
+)
+DOCX_FOOTER = "</w:body></w:document>"
+
+
+def paragraphs(pages: int):
+    for index in range(pages * PARAGRAPHS_PER_PAGE):
+        yield PARAGRAPH.format(index=index)
+
+
+def write_text(path: Path, pages: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for paragraph in paragraphs(pages):
+            file.write(paragraph + "\n\n")
+
+
+def write_docx(path: Path, pages: int) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("word/document.xml", "w") as document:
+            document.write(DOCX_HEADER.encode())
+            for paragraph in paragraphs(pages):
+                document.write(f"<w:p><w:r><w:t>{escape(paragraph)}</w:t></w:r></w:p>".encode())
+            document.write(DOCX_FOOTER.encode())
+
+
+def write_pdf(path: Path, pages: int) -> None:
+    pdf = PdfWriter(PAPER_SIZES["a4"])
+    for paragraph in paragraphs(pages):
+        pdf.paragraph(paragraph, 11)
+        pdf.space(8)
+    path.write_bytes(pdf.to_bytes())
+
+
+def extract(path: Path, chunk_chars: int) -> int:
+    return sum(len(chunk) for chunk in chunk_text(iter_document_text(path), chunk_chars))
+
+
+def peak_memory(path: Path, chunk_chars: int) -> int:
+    # Traced separately, as tracing allocations slows extraction down several times
+    tracemalloc.start()
+    extract(path, chunk_chars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-chars", type=int, default=12_000)
+    args = parser.parse_args()
+
+    writers = {"text": write_text, "docx": write_docx, "pdf": write_pdf}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write in writers.items():
+            path = Path(directory) / f"book.{name}"
+            write(path, args.pages)
+            size = os.path.getsize(path)
+
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                characters = extract(path, args.chunk_chars)
+                timings.append(time.perf_counter() - started)
+            elapsed = statistics.median(timings)
+            peak = peak_memory(path, args.chunk_chars)
+            print(
+                f"{name:<5} {size / 1e6:8.2f} MB file  {args.pages / elapsed:8.0f} pages/s"
+                f"  {characters / 1e6 / elapsed:6.1f}M chars/s  peak {peak / 1e6:6.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Benchmark quiz search against a seeded PostgreSQL database.
+
+Seeds `--rows` public quizzes (1M by default) owned by a dedicated benchmark user, then times
+full-text searches, tag filters and deep keyset pagination through `quiz_service`.
+
+Usage (from `backend/`, with DATABASE_URL pointing at a local, disposable database):
+    python -m benchmarks.bench_quiz_search --rows 1000000
+    python -m benchmarks.bench_quiz_search --skip-seed   # reuse previously seeded rows
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.services import quiz_service
+from app.utils.pagination import PageParams
+
+BENCH_USER_EMAIL = "bench-search@doqu.local"
+
+WORDS = [
+    "algebra",
+    "biology",
+    "chemistry",
+    "history",
+    "geography",
+    "physics",
+    "python",
+    "fractions",
+    "photosynthesis",
+    "volcano",
+    "renaissance",
+    "grammar",
+    "verbs",
+    "planets",
+    "ecosystems",
+    "geometry",
+    "probability",
+    "literature",
+    "poetry",
+    "electricity",
+    "magnetism",
+    "cells",
+    "genetics",
+    "revolution",
+    "empire",
+    "river",
+    "mountain",
+    "ocean",
+]
+TAGS = ["math", "science", "history", "language", "geography", "coding", "art", "music"]
+
+SEED_SQL = """
+INSERT INTO quizzes (
+    id, owner_id, title, description, questions, question_count, tags, is_public,
+    average_rating, version, created_at, updated_at
+)
+SELECT
+    gen_random_uuid(),
+    :owner_id,
+    initcap(w[1 + (i % 28)] || ' ' || w[1 + ((i / 28) % 28)] || ' quiz ' || i),
+    'Practice ' || w[1 + ((i / 7) % 28)] || ' and ' || w[1 + ((i / 13) % 28)],
+    jsonb_build_array(
+        jsonb_build_object(
+            'question_text', 'What is ' || w[1 + ((i / 3) % 28)] || '?',
+            'question_type', 'true_false', 'options', '[]'::jsonb,
+            'correct_answer', 'true', 'points', 10, 'time_limit_seconds', 20
+        ),
+        jsonb_build_object(
+            'question_text', 'Explain ' || w[1 + ((i / 5) % 28)] || ' in one word',
+            'question_type', 'true_false', 'options', '[]'::jsonb,
+            'correct_answer', 'false', 'points', 10, 'time_limit_seconds', 20
+        )
+    ),
+    2,
+    ARRAY[t[1 + (i % 8)], t[1 + ((i / 8) % 8)]],
+    true,
+    round((random() * 5)::numeric, 2),
+    1,
+    now() - make_interval(secs => i),
+    now()
+FROM generate_series(:start, :stop) AS i,
+     (SELECT CAST(:words AS text[]) AS w, CAST(:tags AS text[]) AS t) AS vocab
+"""
+
+
+async def seed(session: AsyncSession, rows: int, batch_size: int) -> None:
+    owner_id = (
+        await session.execute(
+            text("SELECT id FROM users WHERE email = :email"), {"email": BENCH_USER_EMAIL}
+        )
+    ).scalar_one_or_none()
+    if owner_id is None:
+        owner_id = uuid.uuid4()
+        await session.execute(
+            text(
+                "INSERT INTO users (id, email, username, is_active, created_at) "
+                "VALUES (:id, :email, 'bench', true, now())"
+            ),
+            {"id": owner_id, "email": BENCH_USER_EMAIL},
+        )
+    await session.execute(
+        text("DELETE FROM quizzes WHERE owner_id = :owner_id"), {"owner_id": owner_id}
+    )
+    await session.commit()
+
+    started = time.perf_counter()
+    for start in range(1, rows + 1, batch_size):
+        stop = min(start + batch_size - 1, rows)
+        await session.execute(
+            text(SEED_SQL),
+            {"owner_id": owner_id, "start": start, "stop": stop, "words": WORDS, "tags": TAGS},
+        )
+        await session.commit()
+        print(f"  seeded {stop:>9,} / {rows:,} rows", end="\r", flush=True)
+    await session.execute(text("ANALYZE quizzes"))
+    await session.commit()
+    print(f"\nSeeded {rows:,} quizzes in {time.perf_counter() - started:.1f}s")
+
+
+async def time_case(session: AsyncSession, name: str, repeat: int, pages: int, **kwargs) -> None:
+    first_page: list[float] = []
+    last_page: list[float] = []
+    for _ in range(repeat):
+        cursor = None
+        for page in range(pages):
+            started = time.perf_counter()
+            result = await quiz_service.search_quizzes(
+                session, params=PageParams(cursor=cursor), **kwargs
+            )
+            elapsed = (time.perf_counter() - started) * 1000
+            if page == 0:
+                first_page.append(elapsed)
+            cursor = result.next_cursor
+            if cursor is None:
+                break
+        last_page.append(elapsed)
+
+    print(
+        f"{name:<34} first page p50 {statistics.median(first_page):7.2f} ms"
+        f"   page {pages} p50 {statistics.median(last_page):7.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        if not args.skip_seed:
+            await seed(session, args.rows, args.batch_size)
+
+        await time_case(session, "browse newest", args.repeat, args.pages, query=None)
+        await time_case(
+            session, "search 'photosynthesis'", args.repeat, args.pages, query="photosynthesis"
+        )
+        await time_case(
+            session, "search 'planets ocean'", args.repeat, args.pages, query="planets ocean"
+        )
+        await time_case(
+            session,
+            "search + tags [science]",
+            args.repeat,
+            args.pages,
+            query="genetics",
+            tags=["science"],
+        )
+        await time_case(
+            session,
+            "browse tags + min_rating 4",
+            args.repeat,
+            args.pages,
+            query=None,
+            tags=["math", "coding"],
+            min_rating=4.0,
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
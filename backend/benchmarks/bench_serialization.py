@@ -0,0 +1,130 @@
+"""
+Benchmark JSON serialization of API responses and socket payloads.
+
+Compares FastAPI's default path for a returned model (validate against the response model,
+dump to Python objects, encode with the stdlib `json` module) with the fast path used by
+the API (`model_dump_json` straight to bytes, or orjson for plain data), over a user, a
+30-question quiz and a 1000-player leaderboard frame.
+
+Usage (from `backend/`):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --repeat 2000
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi._compat import ModelField
+from fastapi.utils import create_response_field
+
+from app.models.quiz import QuestionType, QuizRead
+from app.models.user import UserRead
+from app.utils.serialization import SocketIOJSON, dump_model
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_user() -> UserRead:
+    return UserRead(
+        email="player@example.com",
+        username="player",
+        id=uuid.uuid4(),
+        is_active=True,
+        created_at=NOW,
+    )
+
+
+def make_quiz(questions: int = 30) -> QuizRead:
+    return QuizRead(
+        id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+        title="World Capitals",
+        description="How well do you know the capitals of the world?",
+        tags=["geography", "capitals"],
+        is_public=True,
+        questions=[
+            {
+                "question_text": f"What is the capital of country number {index}?",
+                "question_type": QuestionType.MULTIPLE_CHOICE,
+                "options": ["Paris", "Lima", "Oslo", "Hanoi"],
+                "correct_answer": "Oslo",
+                "points": 1000,
+                "time_limit_seconds": 20,
+            }
+            for index in range(questions)
+        ],
+        version=3,
+        average_rating=4.25,
+        rating_count=120,
+        play_count=5400,
+        comment_count=37,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_leaderboard(players: int = 1000) -> dict:
+    return {
+        "game_id": str(uuid.uuid4()),
+        "question_index": 7,
+        "entries": [
+            {
+                "rank": rank,
+                "user_id": str(uuid.uuid4()),
+                "username": f"p{rank}",
+                "score": 9000 - rank,
+            }
+            for rank in range(1, players + 1)
+        ],
+    }
+
+
+def fastapi_default(field: ModelField, model) -> bytes:
+    # What FastAPI does with a model returned from a route with a response model
+    value, _ = field.validate(model, {}, loc=("response",))
+    content = field.serialize(value)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+def timed(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, model in (("user", make_user()), ("quiz", make_quiz())):
+        field = create_response_field(
+            name=f"Response_{name}", type_=type(model), mode="serialization"
+        )
+        baseline = timed(lambda: fastapi_default(field, model), args.repeat)
+        fast = timed(lambda: dump_model(model), args.repeat)
+        print(
+            f"{name:<12} default {baseline * 1e6:8.1f} us  fast {fast * 1e6:8.1f} us"
+            f"  {baseline / fast:5.1f}x  ({len(dump_model(model))} bytes)"
+        )
+
+    frame = make_leaderboard()
+    baseline = timed(lambda: json.dumps(frame, separators=(",", ":")), args.repeat)
+    fast = timed(lambda: SocketIOJSON.dumps(frame), args.repeat)
+    print(
+        f"{'leaderboard':<12} default {baseline * 1e6:8.1f} us  fast {fast * 1e6:8.1f} us"
+        f"  {baseline / fast:5.1f}x  ({len(SocketIOJSON.dumps(frame))} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
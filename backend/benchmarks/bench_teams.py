@@ -0,0 +1,57 @@
+"""
+Benchmark Team Mode scoring.
+
+Times balanced auto-assignment of a whole room, scoring one reveal for every player, and
+computing team standings, for a room of `--players` players split into `--teams` teams.
+
+Usage (from `backend/`):
+    python -m benchmarks.bench_teams --players 1000 --teams 8
+    python -m benchmarks.bench_teams --players 10000 --teams 50 --repeat 200
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.game.teams import TeamScoreboard
+
+
+def timed(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    players = [f"player-{index}" for index in range(args.players)]
+    points = np.random.default_rng(0).integers(0, 1000, args.players).tolist()
+
+    def assign() -> None:
+        TeamScoreboard(args.teams, capacity=args.players).add_players(players)
+
+    board = TeamScoreboard(args.teams, capacity=args.players)
+    board.add_players(players)
+
+    results = {
+        "assign room": timed(assign, args.repeat),
+        "join one": timed(lambda: (board.add_player("x"), board.remove_player("x")), args.repeat),
+        "score reveal": timed(lambda: board.award_many(players, points), args.repeat),
+        "standings": timed(board.standings, args.repeat),
+    }
+    for name, elapsed in results.items():
+        print(f"{name:<12} {elapsed * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+pytest-benchmark suite for the authentication and user hot paths.
+
+Not part of the test suite; run it explicitly (from `backend/`):
+    pytest benchmarks --benchmark-only --benchmark-storage=benchmarks/baselines \\
+        --benchmark-save=baseline
+    pytest benchmarks --benchmark-only --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+The second command compares against the latest saved run and fails on any benchmark whose
+median got more than 25% slower.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies import get_current_token_data, get_current_user
+from app.models.user import User, UserRead
+from app.services import auth_service
+from app.utils import rate_limit
+
+from .conftest import BENCH_USER, BenchApi
+
+# bcrypt takes hundreds of milliseconds by design; a few rounds give a stable median
+HASH_ROUNDS = 5
+
+
+@pytest.fixture(scope="module")
+def password_hash() -> str:
+    return auth_service.hash_password(BENCH_USER["password"])
+
+
+@pytest.fixture(scope="module")
+def token() -> str:
+    return auth_service.create_access_token({"sub": str(uuid.uuid4()), "email": "a@example.com"})
+
+
+# --- Functions --- #
+def test_hash_password(benchmark):
+    benchmark.pedantic(
+        auth_service.hash_password, args=(BENCH_USER["password"],), rounds=HASH_ROUNDS
+    )
+
+
+def test_verify_password(benchmark, password_hash: str):
+    result = benchmark.pedantic(
+        auth_service.verify_password,
+        args=(BENCH_USER["password"], password_hash),
+        rounds=HASH_ROUNDS,
+    )
+    assert result is True
+
+
+def test_create_access_token(benchmark):
+    data = {"sub": str(uuid.uuid4()), "email": "a@example.com"}
+    benchmark(auth_service.create_access_token, data)
+
+
+def test_get_data_from_token(benchmark, token: str):
+    assert benchmark(auth_service.get_data_from_token, token) is not None
+
+
+def test_user_read_model_validate(benchmark):
+    user = User(
+        email="a@example.com",
+        username="a",
+        password="hash",
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    benchmark(UserRead.model_validate, user)
+
+
+def test_get_current_user(benchmark, run, api: BenchApi, session_factory: async_sessionmaker):
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=api.headers["Authorization"].removeprefix("Bearer ")
+    )
+
+    async def authenticate() -> User:
+        session: AsyncSession
+        async with session_factory() as session:
+            return await get_current_user(session, await get_current_token_data(credentials))
+
+    assert benchmark(lambda: run(authenticate())).email == BENCH_USER["email"]
+
+
+def test_get_current_token_data(benchmark, run, api: BenchApi):
+    # Verifying a token without loading its user never touches the database
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=api.headers["Authorization"].removeprefix("Bearer ")
+    )
+    token_data = benchmark(lambda: run(get_current_token_data(credentials)))
+    assert token_data.email == BENCH_USER["email"]
+
+
+# --- Endpoints --- #
+def test_login_endpoint(benchmark, run, api: BenchApi):
+    login = {"email": BENCH_USER["email"], "password": BENCH_USER["password"]}
+    response = benchmark.pedantic(
+        lambda: run(api.client.post("/api/auth/login", json=login)), rounds=HASH_ROUNDS
+    )
+    assert response.status_code == 200
+
+
+def test_throttled_login_endpoint(benchmark, run, api: BenchApi, monkeypatch):
+    # A rejected attempt stops before the database and bcrypt
+    throttle = rate_limit.LoginThrottle(
+        rate_limit.MemoryWindowCounter(), rate_limit.RateLimit(1, 3600), rate_limit.RateLimit(0, 1)
+    )
+    monkeypatch.setattr(rate_limit, "login_throttle", throttle)
+    login = {"email": BENCH_USER["email"], "password": "wrong password"}
+    run(api.client.post("/api/auth/login", json=login))
+
+    response = benchmark(lambda: run(api.client.post("/api/auth/login", json=login)))
+    assert response.status_code == 429
+
+
+def test_users_me_endpoint(benchmark, run, api: BenchApi):
+    response = benchmark(lambda: run(api.client.get("/api/users/me", headers=api.headers)))
+    assert response.status_code == 200
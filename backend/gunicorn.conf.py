@@ -0,0 +1,30 @@
+"""
+gunicorn settings, read when `gunicorn` is started from `backend/`.
+
+Usage:
+    gunicorn --bind 0.0.0.0:8000
+    gunicorn --workers 4 --preload
+
+gunicorn binds the listening socket once and forks uvicorn workers that accept connections
+on it. Without `--preload` each worker imports `app.main`, which builds its application with
+`create_app`. Either way the lifespan, and so every background task, runs in each worker, and
+database pools are reset in forked processes by `app.db.engine`.
+
+Signals sent to the gunicorn master:
+    SIGHUP: Graceful reload. New workers are started, then the old ones finish their
+        requests and exit. Code changes are only picked up without `--preload`.
+    SIGTTIN / SIGTTOU: Add or remove one worker.
+    SIGTERM: Graceful shutdown.
+"""
+
+import os
+
+wsgi_app = "app.main:app"
+bind = "127.0.0.1:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# One worker per CPU unless `WEB_CONCURRENCY` or `--workers` says otherwise
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+# Seconds a stopping worker gets to finish its requests
+graceful_timeout = 30
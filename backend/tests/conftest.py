@@ -1,34 +1,92 @@
 import asyncio
-from typing import AsyncGenerator, Generator
+import os
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, AsyncIterator, Generator
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import URL, event, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlmodel import SQLModel
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.partitions import maintain_partitions
+from app.db.session import get_db, get_session_factory
 from app.main import app
+from app.models.user import Token
+from app.services import auth_service, token_service
+from app.utils import rate_limit
+from app.utils.http_cache import response_cache
+from tests.query_budget import N_PLUS_ONE_THRESHOLD, QueryRecorder, check_budget
 
-# Test database URL - using SQLite in-memory for tests
-DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Test database URL - SQLite in-memory unless TEST_DATABASE_URL points somewhere else
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 
-# Create test engine
+# bcrypt cost used by the tests; the minimum makes hashing ~1 ms instead of ~250 ms
+TEST_BCRYPT_ROUNDS = 4
+
+
+def worker_database_url(url: str, worker_id: str | None) -> URL:
+    """
+    Give each pytest-xdist worker a database of its own.
+
+    In-memory SQLite databases are already private to the process; file and server
+    databases get the worker ID appended to their name ("doqu_test" -> "doqu_test_gw0").
+    """
+    database_url = make_url(url)
+    if not worker_id or not database_url.database or database_url.database == ":memory:":
+        return database_url
+    stem, dot, suffix = database_url.database.rpartition(".")
+    if database_url.get_backend_name() == "sqlite" and dot:
+        return database_url.set(database=f"{stem}_{worker_id}.{suffix}")
+    return database_url.set(database=f"{database_url.database}_{worker_id}")
+
+
+DATABASE_URL = worker_database_url(TEST_DATABASE_URL, os.environ.get("PYTEST_XDIST_WORKER"))
+IS_SQLITE = DATABASE_URL.get_backend_name() == "sqlite"
+
+# Create test engine; in-memory SQLite keeps its data on a single shared connection
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    poolclass=StaticPool,
-)
-TestingSessionLocal = sessionmaker(
-    expire_on_commit=False,
-    autoflush=False,
-    class_=AsyncSession,
-    bind=engine,
+    **({"poolclass": StaticPool} if IS_SQLITE else {}),
 )
 
+if IS_SQLITE:
+    # pysqlite starts transactions on its own and does not know about SAVEPOINT; let
+    # SQLAlchemy emit BEGIN itself so that nested transactions work (see the SQLAlchemy
+    # docs on "Serializable isolation / Savepoints / Transactional DDL")
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+async def create_database_if_missing(url: URL) -> None:
+    """
+    Create a per-worker PostgreSQL database on first use.
+    """
+    admin_engine = create_async_engine(
+        url.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    try:
+        async with admin_engine.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": url.database},
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+    finally:
+        await admin_engine.dispose()
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -39,26 +97,72 @@ def event_loop():
 
 @pytest_asyncio.fixture(scope="session")
 async def db_engine():
-    """Create a test database engine."""
+    """
+    Create the schema once for the whole session (per xdist worker) and yield the engine.
+    """
+    if DATABASE_URL.get_backend_name() == "postgresql":
+        await create_database_if_missing(DATABASE_URL)
+    async with engine.begin() as conn:
+        # Drop leftovers of an interrupted run against a persistent database
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    # Partitioned tables take no rows until their partitions exist
+    await maintain_partitions(engine)
     yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Hash passwords with the lowest bcrypt cost, so that registering users stays cheap.
+    """
+    options = {"rounds": TEST_BCRYPT_ROUNDS}
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+        patch.setattr(settings, "PASSWORD_HASH_OPTIONS", options)
+        patch.setattr(
+            auth_service, "password_context", auth_service.build_password_context("bcrypt", options)
+        )
+        yield
 
 
 @pytest_asyncio.fixture(scope="function")
-async def session() -> AsyncGenerator[AsyncSession, None]:
+async def session(db_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yields a session inside a transaction that is rolled back after the test.
+
+    Commits and rollbacks made by the code under test only release or roll back a
+    SAVEPOINT, so no test sees another one's rows and the schema is never rebuilt.
     """
-    Creates a test database session, yields it, and drops tables afterwards.
+    async with db_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+            response_cache.clear()
+            token_service.revocations.clear()
+            rate_limit.login_throttle.counter.clear()
+
+
+def shared_session_factory(session: AsyncSession):
+    """
+    Session factory handing out the test's session, for code that opens its own sessions.
     """
-    # Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
 
-    # Create and yield the session for the test to use
-    async with TestingSessionLocal() as session:
+    @asynccontextmanager
+    async def factory() -> AsyncIterator[AsyncSession]:
         yield session
 
-    # Drop all tables to clean up for the next test
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.drop_all)
+    return factory
 
 
 @pytest.fixture(scope="function")
@@ -69,6 +173,7 @@ def client(session: AsyncSession) -> Generator[TestClient, None, None]:
         yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: shared_session_factory(session)
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -82,6 +187,7 @@ async def async_client(session: AsyncSession) -> AsyncClient:  # Return type is
         yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: shared_session_factory(session)
 
     # Explicitly enter the async context manager and yield the client
     client = AsyncClient(app=app, base_url="http://test")
@@ -91,6 +197,51 @@ async def async_client(session: AsyncSession) -> AsyncClient:  # Return type is
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def register_and_login_user(async_client: AsyncClient):
+    """
+    Register a user and log them in, returning their auth headers.
+
+    Usage:
+        headers = await register_and_login_user("test@example.com", "testuser", "password123")
+    """
+
+    async def register_and_login(email: str, username: str, password: str) -> dict[str, str]:
+        register_data = {"email": email, "username": username, "password": password}
+        register_response = await async_client.post("/api/auth/register", json=register_data)
+        assert register_response.status_code == 201
+
+        login_data = {"email": email, "password": password}
+        login_response = await async_client.post("/api/auth/login", json=login_data)
+        assert login_response.status_code == 200
+        token = Token(**login_response.json())
+        return {"Authorization": f"Bearer {token.access_token}"}
+
+    return register_and_login
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert how many SQL statements a block may execute, and that none repeats like an N+1.
+
+    Usage:
+        with query_budget(2) as queries:
+            response = await async_client.get("/api/users/me", headers=headers)
+        assert queries.count == 1
+
+    Pass `n_plus_one_threshold=None` to allow repeated statements.
+    """
+
+    @contextmanager
+    def budget(max_queries: int, n_plus_one_threshold: int | None = N_PLUS_ONE_THRESHOLD):
+        with QueryRecorder().attached(engine.sync_engine) as recorder:
+            yield recorder
+        check_budget(recorder, max_queries, n_plus_one_threshold)
+
+    return budget
+
+
 @pytest.fixture
 def test_user_data():
     """Sample user data for testing."""
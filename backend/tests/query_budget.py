@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import Engine, event
+
+# Statements repeated this many times within one budget are reported as N+1 patterns
+N_PLUS_ONE_THRESHOLD = 3
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+# Transaction control emitted by the test fixtures' SAVEPOINT isolation, not by the code
+# under test; in production the same commits don't execute statements
+_TRANSACTION_CONTROL = re.compile(
+    r"^\s*(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.I
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape, so that the same query with different parameters or
+    a different number of IN values compares equal.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAMETER_LIST.sub("(?)", statement)
+
+
+class QueryRecorder:
+    """
+    Records the SQL statements an engine executes while active.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not _TRANSACTION_CONTROL.match(statement):
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """
+        Return the statement shapes executed at least `threshold` times.
+        """
+        shapes = Counter(normalize_statement(statement) for statement in self.statements)
+        return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+    def report(self) -> str:
+        return "\n".join(f"  {index}. {line}" for index, line in enumerate(self.statements, 1))
+
+    @contextmanager
+    def attached(self, engine: Engine) -> Iterator["QueryRecorder"]:
+        event.listen(engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+
+def check_budget(
+    recorder: QueryRecorder, max_queries: int, n_plus_one_threshold: int | None
+) -> None:
+    """
+    Fail the test if the recorded statements exceed the budget or repeat like an N+1.
+
+    Raises:
+        AssertionError: Listing the recorded statements.
+    """
+    assert recorder.count <= max_queries, (
+        f"Expected at most {max_queries} queries, {recorder.count} were executed:\n"
+        f"{recorder.report()}"
+    )
+    if n_plus_one_threshold is not None:
+        repeated = recorder.repeated(n_plus_one_threshold)
+        assert not repeated, "Possible N+1 queries:\n" + "\n".join(
+            f"  {count}x {shape}" for shape, count in repeated.items()
+        )
@@ -0,0 +1,185 @@
+import uuid
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.game.pack import compile_game_pack
+from app.models.analytics import QuestionStats
+from app.models.game import AnswerSubmit, Game, GameAnswer
+from app.models.quiz import QuizContent
+from app.models.user import User
+from app.services import game_service
+from app.services.analytics_service import (
+    TIME_BUCKET_COUNT,
+    AnswerColumns,
+    compute_game_metrics,
+    derive_question_analytics,
+    load_game_answers,
+)
+
+
+async def answer(client: AsyncClient, game_id: str, headers: dict, index: int, value: str):
+    return await client.post(
+        f"/api/games/{game_id}/answers",
+        json={"question_index": index, "answer": value, "elapsed_ms": 1500},
+        headers=headers,
+    )
+
+
+@pytest.mark.asyncio
+async def test_finished_game_updates_quiz_analytics(
+    async_client: AsyncClient, test_quiz_data, register_and_login_user
+):
+    """
+    Test that answers of a finished game show up in the owner's quiz analytics.
+    """
+    host = await register_and_login_user("host@example.com", "host", "password")
+    player = await register_and_login_user("player@example.com", "pl", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=host)
+    quiz_id = response.json()["id"]
+    game_id = (await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=host)).json()["id"]
+
+    response = await answer(async_client, game_id, host, 0, "4")
+    assert response.status_code == 201
+    assert response.json()["is_correct"] is True
+    assert response.json()["points"] > 0
+    assert (await answer(async_client, game_id, host, 1, "True")).json()["is_correct"] is True
+    assert (await answer(async_client, game_id, player, 0, "5")).json()["points"] == 0
+    assert (await answer(async_client, game_id, player, 0, "4")).status_code == 409
+    assert (await answer(async_client, game_id, player, 2, "4")).status_code == 400
+
+    response = await async_client.post(f"/api/games/{game_id}/finish", headers=player)
+    assert response.status_code == 403
+    response = await async_client.post(f"/api/games/{game_id}/finish", headers=host)
+    assert response.status_code == 200
+    assert response.json()["ended_at"] is not None
+    assert (await answer(async_client, game_id, player, 1, "true")).status_code == 409
+
+    response = await async_client.get(f"/api/quizzes/{quiz_id}/analytics", headers=player)
+    assert response.status_code == 403
+    response = await async_client.get(f"/api/quizzes/{quiz_id}/analytics", headers=host)
+    assert response.status_code == 200
+    analytics = response.json()
+    first, second = analytics["questions"]
+    assert first["attempts"] == 2
+    assert first["difficulty"] == pytest.approx(0.5)
+    assert first["discrimination"] == pytest.approx(1.0)
+    assert first["mean_time_ms"] == pytest.approx(1500)
+    assert sum(first["time_histogram"]) == 2
+    assert second["attempts"] == 1
+    assert second["discrimination"] is None
+    assert [player["accuracy"] for player in analytics["players"]] == [1.0, 0.0]
+
+
+def test_metrics_match_direct_computation(test_quiz_data):
+    """
+    Test that vectorized game metrics and derived analytics match a direct computation.
+    """
+    pack = compile_game_pack(QuizContent.model_validate(test_quiz_data))
+    answers = AnswerColumns(
+        user_ids=[uuid.uuid4() for _ in range(3)],
+        player=np.array([0, 0, 1, 1, 2]),
+        question=np.array([0, 1, 0, 1, 0]),
+        correct=np.array([True, True, True, False, False]),
+        points=np.array([10, 5, 8, 0, 0]),
+        elapsed_ms=np.array([500, 2500, 1000, 40000, 9000]),
+    )
+
+    metrics = compute_game_metrics(answers, pack)
+    assert metrics.attempts.tolist() == [3, 2]
+    assert metrics.correct.tolist() == [2, 1]
+    assert metrics.player_points.tolist() == [15, 8, 0]
+    assert metrics.time_histogram.shape == (2, TIME_BUCKET_COUNT)
+    assert metrics.time_histogram[1, -1] == 1
+
+    rows = [
+        QuestionStats(
+            quiz_id=uuid.uuid4(),
+            content_hash=pack.content_hash,
+            question_index=index,
+            attempts=int(metrics.attempts[index]),
+            correct=int(metrics.correct[index]),
+            time_sum_ms=float(metrics.time_sum_ms[index]),
+            time_sq_sum_ms=float(metrics.time_sq_sum_ms[index]),
+            score_sum=float(metrics.score_sum[index]),
+            score_sq_sum=float(metrics.score_sq_sum[index]),
+            score_correct_sum=float(metrics.score_correct_sum[index]),
+            time_histogram=metrics.time_histogram[index].tolist(),
+        )
+        for index in range(pack.question_count)
+    ]
+    first, _ = derive_question_analytics(rows)
+
+    correct = np.array([1.0, 1.0, 0.0])
+    score = np.array([15, 8, 0]) / pack.total_points
+    elapsed = np.array([500, 1000, 9000])
+    assert first.difficulty == pytest.approx(2 / 3, abs=1e-4)
+    assert first.discrimination == pytest.approx(np.corrcoef(correct, score)[0, 1], abs=1e-4)
+    assert first.mean_time_ms == pytest.approx(elapsed.mean(), abs=0.1)
+    assert first.stddev_time_ms == pytest.approx(elapsed.std(), abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_answer_to_game_ended_meanwhile_is_rejected(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that an answer is rejected if the game ended after it was loaded, rather than
+    stored after the game's answers were merged into the rollups.
+    """
+    host = await register_and_login_user("late@example.com", "late", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=host)
+    game_id = (
+        await async_client.post(f"/api/quizzes/{response.json()['id']}/games", headers=host)
+    ).json()["id"]
+    game = await session.get(Game, uuid.UUID(game_id))
+    stale = Game.model_validate(game.model_dump())
+    pack = await game_service.get_game_pack_for_game(session, game)
+    assert (await async_client.post(f"/api/games/{game_id}/finish", headers=host)).is_success
+
+    with pytest.raises(game_service.GameEndedError):
+        await game_service.submit_answer(
+            session,
+            stale,
+            pack,
+            game.host_id,
+            AnswerSubmit(question_index=0, answer="4", elapsed_ms=1500),
+        )
+
+
+@pytest.mark.asyncio
+async def test_load_answers_keeps_player_ids_ending_in_zero_bytes(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that player ids survive the round trip through NumPy byte strings, which drop
+    trailing NUL bytes.
+    """
+    host = await register_and_login_user("nul@example.com", "nul", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=host)
+    game_id = (
+        await async_client.post(f"/api/quizzes/{response.json()['id']}/games", headers=host)
+    ).json()["id"]
+    game = await session.get(Game, uuid.UUID(game_id))
+    player = User(
+        id=uuid.UUID(bytes=b"\x01" * 8 + b"\0" * 8), email="zero@example.com", username="z"
+    )
+    session.add(player)
+    session.add(
+        GameAnswer(
+            game_id=game.id,
+            user_id=player.id,
+            question_index=0,
+            game_started_at=game.started_at,
+            answer="4",
+            is_correct=True,
+            points=10,
+            elapsed_ms=1500,
+        )
+    )
+    await session.commit()
+
+    answers = await load_game_answers(session, game)
+    assert answers.user_ids == [player.id]
@@ -24,9 +24,10 @@ async def register_and_login_user(client: AsyncClient, email: str, username: str
     token = Token(**login_response.json())
     return token.access_token, user_id
 
+
 @pytest.mark.asyncio
 async def test_register_user_success_email_password(
-    async_client: AsyncClient, session: AsyncSession
+    async_client: AsyncClient, session: AsyncSession, query_budget
 ):
     """
     Test successful user registration with email and password.
@@ -36,7 +37,9 @@ async def test_register_user_success_email_password(
         "username": "testuser",
         "password": "securepassword",
     }
-    response = await async_client.post("/api/auth/register", json=user_data)
+    # The insert, and the refresh of server-side defaults
+    with query_budget(2):
+        response = await async_client.post("/api/auth/register", json=user_data)
     assert response.status_code == 201
     user_read = UserRead(**response.json())
     assert user_read.email == user_data["email"]
@@ -135,7 +138,7 @@ async def test_register_user_both_auth_methods(async_client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_login_user_success(async_client: AsyncClient, session: AsyncSession):
+async def test_login_user_success(async_client: AsyncClient, session: AsyncSession, query_budget):
     """
     Test successful user login.
     """
@@ -152,7 +155,9 @@ async def test_login_user_success(async_client: AsyncClient, session: AsyncSessi
         "email": "login@example.com",
         "password": "loginpassword",
     }
-    response = await async_client.post("/api/auth/login", json=login_data)
+    # The user lookup and the new refresh token
+    with query_budget(2):
+        response = await async_client.post("/api/auth/login", json=login_data)
     assert response.status_code == 200
     token = Token(**response.json())
     assert token.access_token is not None
@@ -197,7 +202,9 @@ async def test_login_user_unregistered_email(async_client: AsyncClient, session:
 
 
 @pytest.mark.asyncio
-async def test_read_users_me_success(async_client: AsyncClient, session: AsyncSession):
+async def test_read_users_me_success(
+    async_client: AsyncClient, session: AsyncSession, query_budget
+):
     """
     Test accessing /api/users/me with a valid token.
     """
@@ -206,10 +213,11 @@ async def test_read_users_me_success(async_client: AsyncClient, session: AsyncSe
         async_client, "me@example.com", "meuser", "mepassword"
     )
 
-    # Access /api/users/me
-    response = await async_client.get(
-        "/api/users/me", headers={"Authorization": f"Bearer {access_token}"}
-    )
+    # Access /api/users/me, loading only the authenticated user
+    with query_budget(1):
+        response = await async_client.get(
+            "/api/users/me", headers={"Authorization": f"Bearer {access_token}"}
+        )
     assert response.status_code == 200
     user_read = UserRead(**response.json())
     assert user_read.email == "me@example.com"
@@ -0,0 +1,139 @@
+import os
+import re
+import zlib
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.export import WorksheetOptions
+from app.models.quiz import QuizContent
+from app.services import export_service
+from app.utils.pdf import PdfWriter, wrap_text
+
+
+@pytest.fixture
+def export_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CACHE_DIR", str(tmp_path))
+    yield tmp_path
+    export_service.shutdown_export_pool()
+
+
+def page_text(pdf: bytes) -> bytes:
+    streams = re.findall(rb"stream\n(.*?)\nendstream", pdf, re.DOTALL)
+    return b"".join(zlib.decompress(stream) for stream in streams)
+
+
+def test_pdf_writer_produces_valid_cross_reference_table():
+    """
+    Test that the xref table points at each object and that long text breaks across pages.
+    """
+    pdf = PdfWriter((200.0, 200.0), margin=20.0)
+    for index in range(30):
+        pdf.paragraph(f"Line {index} (with parentheses)", 10)
+    data = pdf.to_bytes()
+
+    assert data.startswith(b"%PDF-1.4")
+    assert data.endswith(b"%%EOF\n")
+    xref = int(data.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    entries = data[xref:].split(b"\n")[3:]
+    object_count = int(data[xref:].split(b"\n")[1].split()[1]) - 1
+    assert object_count == 4 + 2 * len(pdf._pages) and len(pdf._pages) > 1
+    for object_id, entry in enumerate(entries[:object_count], start=1):
+        offset = int(entry.split()[0])
+        assert data[offset:].startswith(b"%d 0 obj" % object_id)
+    assert b"\\(with parentheses\\)" in page_text(data)
+
+
+def test_wrap_text_fits_width():
+    """
+    Test that wrapped lines never exceed the available width, even for very long words.
+    """
+    lines = wrap_text("short words then " + "x" * 200, 12, 150)
+    assert len(lines) > 2
+    assert all(len(line) > 0 for line in lines)
+    assert "".join(lines).endswith("x" * 10)
+
+
+@pytest.mark.asyncio
+async def test_worksheet_is_rendered_once_and_cached(
+    async_client: AsyncClient,
+    export_cache_dir,
+    test_quiz_data,
+    monkeypatch,
+    register_and_login_user,
+):
+    """
+    Test downloading a worksheet, then getting the cached copy without rendering again.
+    """
+    owner = await register_and_login_user("pdf@example.com", "pdf", "password")
+    other = await register_and_login_user("reader@example.com", "rd", "password")
+    quiz_id = (await async_client.post("/api/quizzes/", json=test_quiz_data, headers=owner)).json()[
+        "id"
+    ]
+
+    response = await async_client.get(f"/api/quizzes/{quiz_id}/worksheet.pdf", headers=other)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-")
+    assert b"What is 2+2?" in page_text(response.content)
+    assert b"Answer Key" not in page_text(response.content)
+    assert len(list(export_cache_dir.glob("*.pdf"))) == 1
+
+    def fail_render(*args):
+        raise AssertionError("cached worksheet was rendered again")
+
+    monkeypatch.setattr(export_service, "_render_to_cache", fail_render)
+    cached = await async_client.get(f"/api/quizzes/{quiz_id}/worksheet.pdf", headers=owner)
+    assert cached.content == response.content
+
+    response = await async_client.get(
+        f"/api/quizzes/{quiz_id}/worksheet.pdf?include_answers=true", headers=other
+    )
+    assert response.status_code == 403
+    response = await async_client.get(
+        f"/api/quizzes/{quiz_id}/worksheet.pdf?font_size=40", headers=other
+    )
+    assert response.status_code == 422
+
+
+def test_cache_key_depends_on_content_and_options(test_quiz_data, export_cache_dir):
+    """
+    Test that the cache key changes with the quiz content and with each option.
+    """
+    content = QuizContent.model_validate(test_quiz_data)
+    digest = export_service.content_hash(content)
+    default = export_service.worksheet_cache_key(digest, WorksheetOptions())
+
+    assert default == export_service.worksheet_cache_key(digest, WorksheetOptions())
+    assert default != export_service.worksheet_cache_key(digest, WorksheetOptions(font_size=12))
+    assert default != export_service.worksheet_cache_key(digest, WorksheetOptions(paper="letter"))
+    assert default != export_service.worksheet_cache_key("other", WorksheetOptions())
+
+    for name, size in (("old.pdf", 600), ("new.pdf", 600)):
+        (export_cache_dir / name).write_bytes(b"x" * size)
+    os.utime(export_cache_dir / "old.pdf", (0, 0))
+    assert export_service.prune_export_cache(export_cache_dir, 1000) == 1
+    assert [path.name for path in export_cache_dir.iterdir()] == ["new.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_pruned_worksheet_is_rendered_again(test_quiz_data, export_cache_dir, monkeypatch):
+    """
+    Test that a worksheet pruned from the cache is rendered again rather than failing, and
+    that a fresh render is served even if the cache cannot hold it.
+    """
+    content = QuizContent.model_validate(test_quiz_data)
+    with await export_service.get_worksheet(content, WorksheetOptions()) as file:
+        first = file.read()
+    for path in export_cache_dir.glob("*.pdf"):
+        path.unlink()
+
+    with await export_service.get_worksheet(content, WorksheetOptions()) as file:
+        assert file.read() == first
+    assert len(list(export_cache_dir.glob("*.pdf"))) == 1
+
+    monkeypatch.setattr(settings, "EXPORT_CACHE_MAX_MB", 0)
+    with await export_service.get_worksheet(content, WorksheetOptions(font_size=12)) as file:
+        assert file.read().startswith(b"%PDF-")
+    assert len(list(export_cache_dir.glob("*.pdf"))) == 0
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from app.game.pack import (
+    clear_game_pack_cache,
+    compile_game_pack,
+    content_hash,
+    get_cached_game_pack,
+    get_game_pack,
+)
+from app.models.quiz import QuizContent
+
+
+@pytest.fixture
+def quiz_content(test_quiz_data) -> QuizContent:
+    clear_game_pack_cache()
+    return QuizContent.model_validate(test_quiz_data)
+
+
+def test_payloads_do_not_contain_answers(quiz_content: QuizContent):
+    """
+    Test that pre-encoded question payloads never leak the correct answer.
+    """
+    pack = compile_game_pack(quiz_content)
+
+    assert pack.question_count == 2
+    for payload in pack.question_payloads:
+        decoded = json.loads(payload)
+        assert "correct_answer" not in decoded
+        assert decoded["total"] == 2
+    assert json.loads(pack.question_payloads[1])["options"] == ["true", "false"]
+
+
+def test_grading_uses_answer_key(quiz_content: QuizContent):
+    """
+    Test grading is case-insensitive and rejects wrong or out-of-range answers.
+    """
+    pack = compile_game_pack(quiz_content)
+
+    assert pack.is_correct(0, "4")
+    assert pack.is_correct(1, " TRUE ")
+    assert not pack.is_correct(0, "5")
+    assert not pack.is_correct(5, "4")
+    assert pack.total_points == 15
+
+
+def test_score_decays_with_elapsed_time(quiz_content: QuizContent):
+    """
+    Test that faster correct answers earn more points and late answers earn none.
+    """
+    pack = compile_game_pack(quiz_content)
+
+    assert pack.score(0, "4", 0) == 10
+    assert pack.score(0, "4", 19_999) == 5
+    assert pack.score(0, "4", 5_000) < pack.score(0, "4", 1_000)
+    assert pack.score(0, "4", 20_000) == 0
+    assert pack.score(0, "3", 0) == 0
+
+
+def test_get_game_pack_is_shared_by_content_hash(quiz_content: QuizContent, test_quiz_data):
+    """
+    Test that identical quiz content compiles once and changed content compiles anew.
+    """
+    first = get_game_pack(quiz_content)
+    second = get_game_pack(QuizContent.model_validate(test_quiz_data))
+    assert first is second
+    assert get_cached_game_pack(content_hash(quiz_content)) is first
+
+    changed = QuizContent.model_validate({**test_quiz_data, "title": "Another Quiz"})
+    assert get_game_pack(changed) is not first
+
+
+def test_game_pack_is_immutable(quiz_content: QuizContent):
+    """
+    Test that a compiled pack cannot be modified after compilation.
+    """
+    pack = compile_game_pack(quiz_content)
+
+    with pytest.raises(AttributeError):
+        pack.title = "Changed"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        pack.answer_keys[(0, "3")] = 10  # type: ignore[index]
@@ -0,0 +1,186 @@
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generation import GenerationRequest
+from app.services import generation_service
+from app.services.ai_client import (
+    FakeQuizGenerator,
+    GeminiQuizGenerator,
+    GenerationError,
+    set_quiz_generator,
+)
+
+
+@pytest.fixture
+def fake_generator():
+    generator = FakeQuizGenerator()
+    set_quiz_generator(generator)
+    yield generator
+    set_quiz_generator(None)
+
+
+@pytest_asyncio.fixture
+async def generation_queue(session: AsyncSession, monkeypatch):
+    @asynccontextmanager
+    async def test_session():
+        yield session
+
+    queue = generation_service.GenerationQueue(session_factory=test_session)
+    monkeypatch.setattr(generation_service, "generation_queue", queue)
+    await queue.start(workers=1)
+    yield queue
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_generation_job_runs_and_identical_requests_are_cached(
+    async_client: AsyncClient, fake_generator, generation_queue, register_and_login_user
+):
+    """
+    Test that a job is generated in the background and repeated requests hit the cache.
+    """
+    headers = await register_and_login_user("gen@example.com", "gen", "password")
+    request = {"topic": "The Solar System", "question_count": 3}
+
+    response = await async_client.post("/api/generations/", json=request, headers=headers)
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    job_id = response.json()["id"]
+    await generation_queue.join()
+
+    response = await async_client.get(f"/api/generations/{job_id}", headers=headers)
+    job = response.json()
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 100
+    assert len(job["result"]["questions"]) == 3
+    assert job["cached"] is False
+
+    # Case and whitespace differences are normalized away
+    request = {"topic": "  the solar   SYSTEM ", "question_count": 3}
+    response = await async_client.post("/api/generations/", json=request, headers=headers)
+    assert response.status_code == 202
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["cached"] is True
+    assert response.json()["result"] == job["result"]
+    assert fake_generator.calls == 1
+
+    # The generated quiz can be saved as is
+    response = await async_client.post("/api/quizzes/", json=job["result"], headers=headers)
+    assert response.status_code == 201
+
+    other = await register_and_login_user("nosy@example.com", "nosy", "password")
+    response = await async_client.get(f"/api/generations/{job_id}", headers=other)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_follows_job(
+    async_client: AsyncClient, session: AsyncSession, fake_generator, register_and_login_user
+):
+    """
+    Test that the event stream reports the queued job, then its result once it has run.
+    """
+    headers = await register_and_login_user("sse@example.com", "sse", "password")
+    response = await async_client.post(
+        "/api/generations/", json={"topic": "Rivers", "question_count": 2}, headers=headers
+    )
+    job_id = uuid.UUID(response.json()["id"])
+
+    @asynccontextmanager
+    async def test_session():
+        yield session
+
+    events = generation_service.stream_job_events(job_id, test_session)
+    first = await events.__anext__()
+    assert first.startswith("event: queued\n")
+
+    await generation_service.GenerationQueue(session_factory=test_session).run_job(job_id)
+    last = await events.__anext__()
+    assert last.startswith("event: succeeded\n")
+    assert json.loads(last.split("data: ", 1)[1])["progress"] == 100
+    with pytest.raises(StopAsyncIteration):
+        await events.__anext__()
+
+    response = await async_client.get(f"/api/generations/{job_id}/events", headers=headers)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: succeeded\n")
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_reported(
+    async_client: AsyncClient, session: AsyncSession, generation_queue, register_and_login_user
+):
+    """
+    Test that model errors fail the job with a message instead of crashing the worker.
+    """
+
+    def reply(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "{}"}]}}]})
+
+    set_quiz_generator(GeminiQuizGenerator("key", "model", transport=httpx.MockTransport(reply)))
+    try:
+        headers = await register_and_login_user("bad@example.com", "bad", "pw")
+        response = await async_client.post(
+            "/api/generations/", json={"topic": "Broken"}, headers=headers
+        )
+        await generation_queue.join()
+    finally:
+        set_quiz_generator(None)
+
+    job = (
+        await async_client.get(f"/api/generations/{response.json()['id']}", headers=headers)
+    ).json()
+    assert job["status"] == "failed"
+    assert job["error"].startswith("Model returned an invalid quiz")
+    assert job["result"] is None
+
+
+@pytest.mark.asyncio
+async def test_gemini_client_sends_prompt_and_parses_quiz():
+    """
+    Test the Gemini request format and parsing of its JSON response.
+    """
+    sent = {}
+    quiz = {
+        "title": "Rivers",
+        "questions": [
+            {
+                "question_text": "Longest river?",
+                "question_type": "multiple_choice",
+                "options": ["Nile", "Seine"],
+                "correct_answer": "Nile",
+            },
+            {"question_text": "Extra", "question_type": "true_false", "correct_answer": "true"},
+        ],
+    }
+
+    def reply(request: httpx.Request) -> httpx.Response:
+        sent["key"] = request.headers["x-goog-api-key"]
+        sent["body"] = json.loads(request.content)
+        text = json.dumps(quiz)
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    async def progress(value: int, message: str) -> None:
+        pass
+
+    client = GeminiQuizGenerator("secret", "model", transport=httpx.MockTransport(reply))
+    request = GenerationRequest(topic="Rivers", source_text="The Nile...", question_count=1)
+    result = await client.generate(request, progress)
+
+    assert sent["key"] == "secret"
+    assert "The Nile..." in sent["body"]["contents"][0]["parts"][0]["text"]
+    assert sent["body"]["generationConfig"]["responseMimeType"] == "application/json"
+    assert [question.question_text for question in result.questions] == ["Longest river?"]
+
+    failing = GeminiQuizGenerator(
+        "secret", "model", transport=httpx.MockTransport(lambda _: httpx.Response(500))
+    )
+    with pytest.raises(GenerationError):
+        await failing.generate(request, progress)
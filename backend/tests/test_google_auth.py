@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from httpx import AsyncClient
+from jose import jwt
+
+from app.core.config import settings
+from app.services import google_auth, user_service
+from app.services.google_auth import GoogleTokenError, SigningKeyCache, verify_google_id_token
+
+CLIENT_ID = "doqu-test.apps.googleusercontent.com"
+CERTS_URL = "https://keys.example.com/certs"
+
+
+def b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class SigningKey:
+    """
+    A locally generated RSA key, standing in for one of Google's.
+    """
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        self._private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.pem = self._private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    def jwk(self) -> dict:
+        numbers = self._private.public_key().public_numbers()
+        return {
+            "kty": "RSA",
+            "alg": "RS256",
+            "use": "sig",
+            "kid": self.kid,
+            "n": b64url_uint(numbers.n),
+            "e": b64url_uint(numbers.e),
+        }
+
+    def sign(self, **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "google.user@example.com",
+            "email_verified": True,
+            "name": "Google User",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(payload, self.pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+class StubKeyServer:
+    """
+    Serves a key set like Google's certs endpoint, counting the requests it gets.
+    """
+
+    def __init__(self, *keys: SigningKey, max_age: int = 3600):
+        self.keys = list(keys)
+        self.max_age = max_age
+        self.requests = 0
+        self.delay = 0.0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        return httpx.Response(
+            200,
+            json={"keys": [key.jwk() for key in self.keys]},
+            headers={"Cache-Control": f"public, max-age={self.max_age}, must-revalidate"},
+        )
+
+    def cache(self, clock=time.monotonic) -> SigningKeyCache:
+        return SigningKeyCache(CERTS_URL, transport=httpx.MockTransport(self.handle), clock=clock)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def signing_key() -> SigningKey:
+    return SigningKey("key-1")
+
+
+@pytest.mark.asyncio
+async def test_keys_are_fetched_once_while_cached(signing_key: SigningKey):
+    """
+    Test that verifying many tokens fetches the key set once.
+    """
+    server = StubKeyServer(signing_key)
+    cache = server.cache()
+
+    for _ in range(5):
+        identity = await verify_google_id_token(signing_key.sign(), CLIENT_ID, cache)
+
+    assert identity.sub == "1234567890"
+    assert identity.email == "google.user@example.com"
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(signing_key: SigningKey):
+    """
+    Test that logins arriving while the key set is being fetched wait for that fetch.
+    """
+    server = StubKeyServer(signing_key)
+    server.delay = 0.05
+    cache = server.cache()
+
+    token = signing_key.sign()
+    results = await asyncio.gather(
+        *(verify_google_id_token(token, CLIENT_ID, cache) for _ in range(10))
+    )
+
+    assert len(results) == 10
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_refreshed_according_to_max_age(signing_key: SigningKey):
+    """
+    Test that keys are refreshed in the background shortly before `max-age` runs out, and
+    fetched before verifying once it has.
+    """
+    clock = FakeClock()
+    server = StubKeyServer(signing_key, max_age=3600)
+    cache = server.cache(clock)
+    token = signing_key.sign()
+
+    await verify_google_id_token(token, CLIENT_ID, cache)
+    clock.now += 3600 - google_auth.REFRESH_AHEAD_SECONDS - 1
+    await verify_google_id_token(token, CLIENT_ID, cache)
+    assert server.requests == 1
+
+    # Close to expiry: served from the cache while a refresh runs
+    clock.now += 2
+    await verify_google_id_token(token, CLIENT_ID, cache)
+    await cache.close()
+    assert server.requests == 2
+
+    clock.now += 3600
+    await verify_google_id_token(token, CLIENT_ID, cache)
+    assert server.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_rotated_keys_are_picked_up(signing_key: SigningKey):
+    """
+    Test that a token signed with a new key refetches the key set, while unknown keys
+    cannot make every request refetch it.
+    """
+    clock = FakeClock()
+    server = StubKeyServer(signing_key)
+    cache = server.cache(clock)
+    await verify_google_id_token(signing_key.sign(), CLIENT_ID, cache)
+
+    new_key = SigningKey("key-2")
+    server.keys.append(new_key)
+    with pytest.raises(GoogleTokenError):
+        await verify_google_id_token(new_key.sign(), CLIENT_ID, cache)
+    assert server.requests == 1
+
+    clock.now += google_auth.UNKNOWN_KEY_REFETCH_SECONDS
+    identity = await verify_google_id_token(new_key.sign(), CLIENT_ID, cache)
+    assert identity.sub == "1234567890"
+    assert server.requests == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "someone-else.apps.googleusercontent.com"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 60},
+        {"email_verified": False},
+    ],
+)
+async def test_invalid_tokens_are_rejected(signing_key: SigningKey, claims: dict):
+    """
+    Test that tokens for another audience or issuer, expired ones, and ones with an
+    unverified email are rejected.
+    """
+    cache = StubKeyServer(signing_key).cache()
+
+    with pytest.raises(GoogleTokenError):
+        await verify_google_id_token(signing_key.sign(**claims), CLIENT_ID, cache)
+
+
+@pytest.mark.asyncio
+async def test_google_login_creates_then_logs_in_user(
+    async_client: AsyncClient, signing_key: SigningKey, monkeypatch
+):
+    """
+    Test that the first Google login creates a user and later ones log into it.
+    """
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(google_auth, "google_key_cache", StubKeyServer(signing_key).cache())
+    body = {"google_id_token": signing_key.sign()}
+
+    first = await async_client.post("/api/auth/google", json=body)
+    assert first.status_code == 200
+    headers = {"Authorization": f"Bearer {first.json()['access_token']}"}
+    me = (await async_client.get("/api/users/me", headers=headers)).json()
+    assert me["email"] == "google.user@example.com"
+    assert me["username"] == "Google User"
+
+    second = await async_client.post("/api/auth/google", json=body)
+    assert second.status_code == 200
+    headers = {"Authorization": f"Bearer {second.json()['access_token']}"}
+    assert (await async_client.get("/api/users/me", headers=headers)).json()["id"] == me["id"]
+
+
+@pytest.mark.asyncio
+async def test_google_login_rejects_bad_tokens_and_taken_emails(
+    async_client: AsyncClient, signing_key: SigningKey, monkeypatch
+):
+    """
+    Test that an invalid token gets a 401, and a Google account whose email is registered
+    with a password gets a 409.
+    """
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(google_auth, "google_key_cache", StubKeyServer(signing_key).cache())
+
+    bad = {"google_id_token": signing_key.sign(aud="someone-else")}
+    assert (await async_client.post("/api/auth/google", json=bad)).status_code == 401
+
+    register = {"email": "taken@example.com", "username": "taken", "password": "password123"}
+    await async_client.post("/api/auth/register", json=register)
+    body = {"google_id_token": signing_key.sign(sub="999", email="taken@example.com")}
+    assert (await async_client.post("/api/auth/google", json=body)).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_google_logins_log_into_the_same_user(
+    async_client: AsyncClient, signing_key: SigningKey, monkeypatch
+):
+    """
+    Test that a first Google login losing the race to create the user logs into the user
+    created by the other login instead of getting a 409.
+    """
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(google_auth, "google_key_cache", StubKeyServer(signing_key).cache())
+    body = {"google_id_token": signing_key.sign()}
+    first = await async_client.post("/api/auth/google", json=body)
+    headers = {"Authorization": f"Bearer {first.json()['access_token']}"}
+    me = (await async_client.get("/api/users/me", headers=headers)).json()
+
+    # The second login looks the user up before the first one committed it
+    get_user_by_google_id = user_service.get_user_by_google_id
+    lookups = []
+
+    async def racing_lookup(session, google_id):
+        lookups.append(google_id)
+        if len(lookups) == 1:
+            return None
+        return await get_user_by_google_id(session, google_id)
+
+    monkeypatch.setattr(user_service, "get_user_by_google_id", racing_lookup)
+    second = await async_client.post("/api/auth/google", json=body)
+    assert second.status_code == 200
+    headers = {"Authorization": f"Bearer {second.json()['access_token']}"}
+    assert (await async_client.get("/api/users/me", headers=headers)).json()["id"] == me["id"]
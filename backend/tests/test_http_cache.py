@@ -0,0 +1,94 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import quiz_stats_service, user_service
+from app.utils.http_cache import response_cache
+
+
+@pytest.mark.asyncio
+async def test_user_reads_answer_conditional_requests(
+    async_client: AsyncClient, session, register_and_login_user
+):
+    """
+    Test that user reads carry an ETag, answer 304 for it, and are served from the cache.
+    """
+    headers = await register_and_login_user("etag@example.com", "etag", "password")
+    me = await async_client.get("/api/users/me", headers=headers)
+    assert me.status_code == 200
+    etag = me.headers["etag"]
+    assert etag.startswith('"')
+    assert me.headers["cache-control"] == "private, no-cache"
+
+    user_id = me.json()["id"]
+    by_id = await async_client.get(f"/api/users/{user_id}", headers=headers)
+    assert by_id.headers["etag"] == etag
+    assert by_id.json() == me.json()
+
+    response = await async_client.get(
+        "/api/users/",
+        params={"email": "ETAG@example.com"},
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await async_client.get(
+        f"/api/users/{user_id}", headers={**headers, "If-None-Match": f'"stale", W/{etag}'}
+    )
+    assert response.status_code == 304
+
+    # Cached users are served without reading the database until invalidated
+    user = await user_service.get_user_by_id(session, uuid.UUID(user_id))
+    user.username = "renamed"
+    session.add(user)
+    await session.commit()
+    response = await async_client.get(f"/api/users/{user_id}", headers=headers)
+    assert response.json()["username"] == "etag"
+
+    user_service.invalidate_cached_user(user)
+    response = await async_client.get(f"/api/users/{user_id}", headers=headers)
+    assert response.json()["username"] == "renamed"
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_quiz_etag_follows_updates_and_counters(
+    async_client: AsyncClient, session, test_quiz_data, register_and_login_user
+):
+    """
+    Test that a quiz's ETag changes with its content and counters, and not otherwise.
+    """
+    headers = await register_and_login_user("quiz@example.com", "quiz", "password")
+    quiz_id = (
+        await async_client.post("/api/quizzes/", json=test_quiz_data, headers=headers)
+    ).json()["id"]
+
+    first = await async_client.get(f"/api/quizzes/{quiz_id}", headers=headers)
+    etag = first.headers["etag"]
+    again = await async_client.get(
+        f"/api/quizzes/{quiz_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert again.status_code == 304
+
+    updated = {**test_quiz_data, "title": "Renamed Quiz"}
+    assert (
+        await async_client.put(f"/api/quizzes/{quiz_id}", json=updated, headers=headers)
+    ).status_code == 200
+    response = await async_client.get(
+        f"/api/quizzes/{quiz_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed Quiz"
+    etag = response.headers["etag"]
+
+    await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 4}, headers=headers)
+    await quiz_stats_service.quiz_counters.flush(session)
+    assert len(response_cache) == 0
+    session.expire_all()
+    response = await async_client.get(
+        f"/api/quizzes/{quiz_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["rating_count"] == 1
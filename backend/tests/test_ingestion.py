@@ -0,0 +1,124 @@
+import zipfile
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.ingestion import UnsupportedDocumentError, chunk_text, iter_document_text
+from app.services.ai_client import FakeQuizGenerator, set_quiz_generator
+from app.services.export_service import render_worksheet
+
+DOCX_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p><w:r><w:t>Photosynthesis turns light</w:t></w:r><w:r><w:t> into energy.</w:t></w:r></w:p>
+    <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Chlorophyll</w:t><w:tab/><w:t>green</w:t></w:r></w:p>
+    </w:tc></w:tr></w:tbl>
+    <w:p><w:r><w:t>Plants release oxygen.</w:t></w:r></w:p>
+  </w:body>
+</w:document>"""
+
+
+def test_extracts_text_from_pdf(tmp_path, test_quiz_data):
+    """
+    Test extracting the text of a Flate-compressed PDF, here a rendered worksheet.
+    """
+    path = tmp_path / "worksheet.pdf"
+    path.write_bytes(render_worksheet(test_quiz_data, {}))
+
+    text = "".join(iter_document_text(path))
+    assert "Test Quiz\n" in text
+    assert "What is 2+2? (10 pts)" in text
+    assert "Is Python a programming language? (5 pts)" in text
+
+
+def test_extracts_text_from_docx(tmp_path):
+    """
+    Test extracting paragraphs, including those inside tables, from a DOCX document.
+    """
+    path = tmp_path / "notes.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCX_XML)
+
+    assert list(iter_document_text(path)) == [
+        "Photosynthesis turns light into energy.\n",
+        "Chlorophyll\tgreen\n",
+        "Plants release oxygen.\n",
+    ]
+
+
+def test_rejects_unsupported_documents(tmp_path):
+    """
+    Test that binary files and archives other than DOCX are rejected.
+    """
+    binary = tmp_path / "image.png"
+    binary.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+    archive_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("readme.txt", "hello")
+
+    for path in (binary, archive_path):
+        with pytest.raises(UnsupportedDocumentError):
+            list(iter_document_text(path))
+
+
+def test_chunks_respect_size_and_sentence_boundaries():
+    """
+    Test that chunks stay within the target size, end on sentences, and keep every word.
+    """
+    sentences = [f"Sentence number {index} talks about rivers." for index in range(500)]
+    # Feed the text in pieces that split sentences at arbitrary places
+    text = " ".join(sentences)
+    pieces = [text[start : start + 777] for start in range(0, len(text), 777)]
+
+    chunks = list(chunk_text(pieces, 1000))
+    assert len(chunks) > 10
+    assert all(500 <= len(chunk) <= 1000 for chunk in chunks[:-1])
+    assert all(chunk.endswith("rivers.") for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+@pytest.mark.asyncio
+async def test_document_upload_submits_one_job_per_chunk(
+    async_client: AsyncClient, monkeypatch, register_and_login_user
+):
+    """
+    Test uploading a text document, including truncation, oversized and unsupported files.
+    """
+    monkeypatch.setattr(settings, "INGESTION_CHUNK_CHARS", 2000)
+    monkeypatch.setattr(settings, "INGESTION_MAX_CHUNKS", 3)
+    set_quiz_generator(FakeQuizGenerator())
+    headers = await register_and_login_user("doc@example.com", "doc", "password")
+    try:
+        body = "\n\n".join(f"Paragraph {index} about volcanoes and lava." for index in range(400))
+        response = await async_client.post(
+            "/api/generations/documents",
+            files={"file": ("volcanoes.txt", body.encode(), "text/plain")},
+            data={"questions_per_chunk": "2", "question_type": "true_false"},
+            headers=headers,
+        )
+        assert response.status_code == 202
+        result = response.json()
+        assert result["filename"] == "volcanoes.txt"
+        assert result["size_bytes"] == len(body)
+        assert result["truncated"] is True
+        assert len(result["jobs"]) == 3
+        assert all(job["status"] == "queued" for job in result["jobs"])
+
+        response = await async_client.post(
+            "/api/generations/documents",
+            files={"file": ("photo.png", b"\x89PNG\r\n\x1a\n\x00\x00", "image/png")},
+            headers=headers,
+        )
+        assert response.status_code == 415
+
+        monkeypatch.setattr(settings, "INGESTION_MAX_UPLOAD_MB", 0)
+        response = await async_client.post(
+            "/api/generations/documents",
+            files={"file": ("small.txt", b"Too big for a zero limit", "text/plain")},
+            headers=headers,
+        )
+        assert response.status_code == 413
+    finally:
+        set_quiz_generator(None)
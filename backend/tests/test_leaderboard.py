@@ -0,0 +1,127 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import PlayerStats
+from app.services import leaderboard_service
+from tests.test_score_sync import item, sync
+
+
+async def play(client: AsyncClient, host: dict, quiz_id: str, answers: list[tuple[dict, list]]):
+    response = await client.post(f"/api/quizzes/{quiz_id}/games", headers=host)
+    game_id = response.json()["id"]
+    for headers, values in answers:
+        await sync(client, headers, [item(game_id, i, value) for i, value in enumerate(values)])
+    response = await client.post(f"/api/games/{game_id}/finish", headers=host)
+    assert response.status_code == 200
+
+
+@pytest.fixture
+async def players(async_client: AsyncClient, test_quiz_data, register_and_login_user) -> dict:
+    """
+    Four players of two quizzes hosted by alice. On the first quiz alice answers both
+    questions, bob and carol the first one, and dave gets it wrong; dave then answers the
+    first question of the second quiz.
+    """
+    players = {}
+    for name in ("alice", "bob", "carol", "dave"):
+        headers = await register_and_login_user(f"{name}@example.com", name, "password")
+        response = await async_client.get("/api/users/me", headers=headers)
+        players[name] = {"headers": headers, "id": response.json()["id"]}
+
+    host = players["alice"]["headers"]
+    quiz_ids = []
+    for _ in range(2):
+        response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=host)
+        quiz_ids.append(response.json()["id"])
+    await play(
+        async_client,
+        host,
+        quiz_ids[0],
+        [
+            (players["alice"]["headers"], ["4", "true"]),
+            (players["bob"]["headers"], ["4"]),
+            (players["carol"]["headers"], ["4"]),
+            (players["dave"]["headers"], ["5"]),
+        ],
+    )
+    await play(async_client, host, quiz_ids[1], [(players["dave"]["headers"], ["4"])])
+    return {**players, "quiz_ids": quiz_ids}
+
+
+def test_competition_ranks_share_ties():
+    """
+    Test that tied players share the best rank of the tie and the next rank is skipped.
+    """
+    assert leaderboard_service.competition_ranks([30, 20, 20, 0]) == [1, 2, 2, 4]
+    assert leaderboard_service.competition_ranks([]) == []
+
+
+@pytest.mark.asyncio
+async def test_leaderboards_add_up_finished_games(async_client: AsyncClient, players: dict):
+    """
+    Test that the global leaderboard adds up every quiz, while a quiz's leaderboard only
+    counts its own games.
+    """
+    headers = players["alice"]["headers"]
+    response = await async_client.get("/api/leaderboard/", headers=headers)
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    assert entries[0]["username"] == "alice"
+    assert [entry["rank"] for entry in entries] == [1, 2, 2, 2]
+    assert {entry["username"] for entry in entries[1:]} == {"bob", "carol", "dave"}
+
+    quiz_id = players["quiz_ids"][0]
+    response = await async_client.get(
+        f"/api/quizzes/{quiz_id}/leaderboard?limit=3", headers=headers
+    )
+    entries = response.json()["entries"]
+    assert response.json()["quiz_id"] == quiz_id
+    assert [(entry["username"], entry["rank"]) for entry in entries][0] == ("alice", 1)
+    assert [entry["rank"] for entry in entries] == [1, 2, 2]
+    assert entries[1]["total_points"] == entries[2]["total_points"] > 0
+
+
+@pytest.mark.asyncio
+async def test_player_rank(async_client: AsyncClient, players: dict):
+    """
+    Test reading one player's rank, globally and per quiz, and that players without a
+    finished game are not ranked.
+    """
+    headers = players["bob"]["headers"]
+    dave = players["dave"]["id"]
+
+    response = await async_client.get(f"/api/leaderboard/{dave}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["rank"] == 2
+    assert response.json()["username"] == "dave"
+
+    quiz_id = players["quiz_ids"][0]
+    response = await async_client.get(f"/api/quizzes/{quiz_id}/leaderboard/{dave}", headers=headers)
+    assert response.json()["rank"] == 4
+    assert response.json()["total_points"] == 0
+
+    response = await async_client.get(f"/api/leaderboard/{uuid.uuid4()}", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rebuild_restores_player_totals(session: AsyncSession, players: dict):
+    """
+    Test that rebuilding recomputes the global totals from the per-quiz rollups.
+    """
+    alice = await session.get(PlayerStats, uuid.UUID(players["alice"]["id"]))
+    expected = alice.total_points
+    alice.total_points = 999
+    await session.delete(await session.get(PlayerStats, uuid.UUID(players["dave"]["id"])))
+    await session.commit()
+
+    assert await leaderboard_service.rebuild_leaderboards(session) == 0
+
+    session.expire_all()
+    alice = await session.get(PlayerStats, uuid.UUID(players["alice"]["id"]))
+    assert alice.total_points == expected
+    dave = await session.get(PlayerStats, uuid.UUID(players["dave"]["id"]))
+    assert dave.games_played == 2
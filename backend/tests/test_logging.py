@@ -0,0 +1,65 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.core.logging import configure_logging, shutdown_logging
+
+
+@pytest.fixture
+def log_stream(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_LEVELS", {"tests.noisy": "WARNING"})
+    monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", {"socket.connect": 0.01, "muted": 0})
+    root_level = logging.getLogger().level
+    stream = io.StringIO()
+    configure_logging(stream)
+    yield stream
+    shutdown_logging()
+    logging.getLogger().setLevel(root_level)
+    logging.getLogger("tests.noisy").setLevel(logging.NOTSET)
+
+
+def read_records(stream: io.StringIO) -> list[dict]:
+    # Stopping the listener writes out everything still queued
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_written_as_json_lines(log_stream):
+    """
+    Test that records, their extra fields and exceptions are written as JSON.
+    """
+    logger = logging.getLogger("tests.app")
+    logger.info("Job %s finished", "abc", extra={"event": "job.finished", "job_id": "abc"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Job failed")
+    logging.getLogger("tests.noisy").info("Hidden by its module level")
+
+    first, second = read_records(log_stream)
+    assert first["message"] == "Job abc finished"
+    assert first["level"] == "INFO"
+    assert first["logger"] == "tests.app"
+    assert first["job_id"] == "abc"
+    assert first["time"].endswith("+00:00")
+    assert second["level"] == "ERROR"
+    assert "ValueError: boom" in second["exception"]
+
+
+def test_high_volume_events_are_sampled(log_stream):
+    """
+    Test that sampled events keep one record in every interval, but never drop warnings.
+    """
+    logger = logging.getLogger("tests.socket")
+    for index in range(250):
+        logger.info("Client connected", extra={"event": "socket.connect", "sid": str(index)})
+    logger.warning("Connect storm", extra={"event": "socket.connect"})
+    logger.info("Never written", extra={"event": "muted"})
+
+    records = read_records(log_stream)
+    assert [record.get("sid") for record in records] == ["0", "100", "200", None]
+    assert all(record["sample_interval"] == 100 for record in records[:3])
+    assert records[3]["message"] == "Connect storm"
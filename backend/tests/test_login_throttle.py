@@ -0,0 +1,120 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils import rate_limit
+from app.utils.rate_limit import LoginThrottle, MemoryWindowCounter, RateLimit
+
+LOGIN = {"email": "throttled@example.com", "password": "throttledpassword"}
+WRONG_LOGIN = {"email": LOGIN["email"], "password": "wrongpassword"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def throttle(monkeypatch) -> LoginThrottle:
+    throttle = LoginThrottle(MemoryWindowCounter(), RateLimit(100, 60), RateLimit(3, 300))
+    monkeypatch.setattr(rate_limit, "login_throttle", throttle)
+    return throttle
+
+
+@pytest.mark.asyncio
+async def test_failed_logins_throttle_the_email(
+    async_client: AsyncClient, session: AsyncSession, throttle: LoginThrottle, query_budget
+):
+    """
+    Test that repeated failures against an email are rejected before reading the database,
+    and that other emails are unaffected.
+    """
+    await async_client.post("/api/auth/register", json={"username": "throttled", **LOGIN})
+    for _ in range(3):
+        assert (await async_client.post("/api/auth/login", json=WRONG_LOGIN)).status_code == 401
+
+    # Even the right password is rejected while the email is throttled
+    with query_budget(0):
+        response = await async_client.post("/api/auth/login", json=LOGIN)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "300"
+
+    other = {"email": "other@example.com", "password": "anypassword"}
+    assert (await async_client.post("/api/auth/login", json=other)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_attempts_in_flight_count_against_the_email():
+    """
+    Test that attempts count against the email before their outcome is known, so a burst
+    of concurrent attempts from many addresses cannot all proceed to the password check.
+    """
+    throttle = LoginThrottle(MemoryWindowCounter(), RateLimit(100, 60), RateLimit(3, 300))
+
+    waits = [await throttle.check(f"10.0.0.{i}", LOGIN["email"]) for i in range(5)]
+    assert waits == [0, 0, 0, 300, 300]
+
+    await throttle.record_success(LOGIN["email"])
+    assert await throttle.check("10.0.0.9", LOGIN["email"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_successful_login_clears_failures(
+    async_client: AsyncClient, session: AsyncSession, throttle: LoginThrottle
+):
+    """
+    Test that a successful login forgets the earlier failures against the email.
+    """
+    await async_client.post("/api/auth/register", json={"username": "throttled", **LOGIN})
+    for _ in range(2):
+        await async_client.post("/api/auth/login", json=WRONG_LOGIN)
+    assert (await async_client.post("/api/auth/login", json=LOGIN)).status_code == 200
+
+    for _ in range(2):
+        assert (await async_client.post("/api/auth/login", json=WRONG_LOGIN)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_attempts_throttle_the_client_address(
+    async_client: AsyncClient, session: AsyncSession, monkeypatch
+):
+    """
+    Test that a client trying many emails is throttled by its address.
+    """
+    throttle = LoginThrottle(MemoryWindowCounter(), RateLimit(3, 60), RateLimit(0, 300))
+    monkeypatch.setattr(rate_limit, "login_throttle", throttle)
+
+    for i in range(3):
+        login = {"email": f"sprayed{i}@example.com", "password": "password"}
+        assert (await async_client.post("/api/auth/login", json=login)).status_code == 401
+    login = {"email": "sprayed3@example.com", "password": "password"}
+    response = await async_client.post("/api/auth/login", json=login)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+
+
+@pytest.mark.asyncio
+async def test_window_slides_and_stale_keys_are_swept():
+    """
+    Test that past events weigh less as the window slides, and that keys of finished
+    windows are dropped.
+    """
+    clock = FakeClock()
+    counter = MemoryWindowCounter(clock=clock, sweep_seconds=10)
+    for _ in range(4):
+        await counter.add("key", 10)
+    assert await counter.count("key", 10) == 4
+
+    # A quarter into the next window, three quarters of the previous one still count
+    clock.now = 12.5
+    assert await counter.count("key", 10) == 3
+    await counter.add("key", 10)
+    assert await counter.count("key", 10) == 4
+
+    clock.now = 35
+    assert await counter.count("key", 10) == 0
+    await counter.add("other", 10)
+    assert len(counter) == 1
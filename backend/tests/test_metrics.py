@@ -0,0 +1,78 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import metrics
+from app.core.metrics import Histogram, Metric
+
+
+def test_histogram_renders_cumulative_buckets():
+    """
+    Test the Prometheus text format of a histogram.
+    """
+    histogram = Histogram("test_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, '/a"b')
+
+    assert list(histogram.render()) == [
+        "# HELP test_seconds Test latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a\\"b",le="0.1"} 2',
+        'test_seconds_bucket{route="/a\\"b",le="1.0"} 3',
+        'test_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'test_seconds_sum{route="/a\\"b"} 3.65',
+        'test_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_metric_base_class_is_abstract():
+    """
+    Test that a metric type must implement its samples and reset.
+    """
+    with pytest.raises(TypeError):
+        Metric("test_total", "Test.")  # type: ignore[abstract]
+
+
+def test_failed_queries_leave_no_start_time_on_the_connection():
+    """
+    Test that a statement that fails does not leave its start time on the pooled connection.
+    """
+    metrics.instrument_engines()
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_started"] == []
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes_queries_and_hashing(
+    async_client: AsyncClient, register_and_login_user
+):
+    """
+    Test that requests are recorded by route template with their database queries.
+    """
+    metrics.registry.reset()
+    headers = await register_and_login_user("m@example.com", "m", "password")
+    me = await async_client.get("/api/users/me", headers=headers)
+    await async_client.get(f"/api/users/{me.json()['id']}", headers=headers)
+    await async_client.get("/api/no-such-path")
+
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    assert 'http_requests_total{method="POST",route="/api/auth/register",status="201"} 1' in text
+    assert 'http_requests_total{method="GET",route="/api/users/{user_id}",status="200"} 1' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'http_requests_in_flight{method="POST"} 0' in text
+    assert metrics.REQUEST_DB_QUERIES.count("POST", "/api/auth/login") == 1
+    assert metrics.REQUEST_DB_QUERIES.sum("POST", "/api/auth/login") >= 1
+    assert metrics.REQUEST_DB_TIME.sum("POST", "/api/auth/login") > 0
+    assert metrics.PASSWORD_HASH_DURATION.count("hash") == 1
+    assert metrics.PASSWORD_HASH_WAIT.count("verify") == 1
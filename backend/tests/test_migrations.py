@@ -0,0 +1,163 @@
+import io
+import textwrap
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import sqlalchemy as sa
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from app.db import migrations
+from app.migration_lint import lint_migrations, lint_source
+
+MIGRATION = """
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade() -> None:
+{body}
+
+
+def downgrade() -> None:
+    op.create_index("ix_users_name", "users", ["name"])
+"""
+
+
+def lint(body: str) -> list[str]:
+    source = MIGRATION.format(body=textwrap.indent(textwrap.dedent(body), "    "))
+    return [finding.operation for finding in lint_source(source, Path("migration.py"))]
+
+
+@pytest.fixture
+def connection() -> Iterator[sa.Connection]:
+    engine = sa.create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(
+            sa.text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, display_name TEXT)")
+        )
+        connection.execute(
+            sa.text("INSERT INTO users (id, name) VALUES (:id, :name)"),
+            [{"id": i, "name": f"user{i}"} for i in range(1, 26)],
+        )
+        connection.commit()
+        context = MigrationContext.configure(connection)
+        with Operations.context(context):
+            yield connection
+    engine.dispose()
+
+
+def test_repository_migrations_pass_the_lint():
+    """
+    Test that no migration after the baseline locks a populated table.
+    """
+    assert [str(finding) for finding in lint_migrations()] == []
+
+
+@pytest.mark.parametrize(
+    "body, operations",
+    [
+        ('op.create_index("ix_users_name", "users", ["name"])', ["create_index"]),
+        (
+            'op.alter_column("users", "created_at", type_=sa.DateTime(timezone=True))',
+            ["alter_column"],
+        ),
+        ('op.alter_column("users", "name", nullable=False)', ["alter_column"]),
+        ('op.add_column("users", sa.Column("age", sa.Integer(), nullable=False))', ["add_column"]),
+        ('op.create_unique_constraint(None, "users", ["name"])', ["create_unique_constraint"]),
+        (
+            'op.create_foreign_key("fk", "users", "teams", ["team_id"], ["id"])',
+            ["create_foreign_key"],
+        ),
+        ('op.execute("CREATE INDEX ix_users_name ON users (name)")', ["execute"]),
+        ('op.execute("UPDATE users SET name = lower(name)")', ["execute"]),
+    ],
+)
+def test_lint_flags_locking_operations(body: str, operations: list[str]):
+    """
+    Test that operations scanning or rewriting an existing table under a lock are flagged.
+    """
+    assert lint(body) == operations
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        'op.create_index("ix_users_name", "users", ["name"], postgresql_concurrently=True)',
+        'op.add_column("users", sa.Column("age", sa.Integer(), nullable=True))',
+        'op.add_column("users", sa.Column("age", sa.Integer(), nullable=False, '
+        'server_default="0"))',
+        'op.execute("CREATE INDEX CONCURRENTLY ix_users_name ON users (name)")',
+        'op.create_index("ix_users_name", "users", ["name"])  # migration-lint: ignore',
+        """
+        op.create_table("teams", sa.Column("id", sa.Integer(), primary_key=True))
+        op.create_index("ix_teams_id", "teams", ["id"], unique=True)
+        """,
+    ],
+)
+def test_lint_allows_online_operations(body: str):
+    """
+    Test that concurrent, metadata-only and ignored operations pass, as do operations on
+    tables created in the same migration, and that `downgrade()` is not checked.
+    """
+    assert lint(body) == []
+
+
+def test_backfill_in_batches_resumes(connection: sa.Connection):
+    """
+    Test that a backfill updates the rows in batches and picks up where an interrupted run
+    stopped.
+    """
+    backfill = {
+        "table_name": "users",
+        "values": {"display_name": sa.func.upper(sa.column("name"))},
+        "where": "display_name IS NULL",
+        "batch_size": 10,
+        "pause_seconds": 0,
+    }
+
+    assert migrations.backfill_in_batches(**backfill, max_batches=1) == 10
+    assert migrations.backfill_in_batches(**backfill) == 15
+    assert migrations.backfill_in_batches(**backfill) == 0
+
+    rows = connection.execute(sa.text("SELECT name, display_name FROM users")).all()
+    assert all(display_name == name.upper() for name, display_name in rows)
+
+
+def test_helpers_fall_back_off_postgresql(connection: sa.Connection):
+    """
+    Test that the helpers run as plain operations on databases without online DDL.
+    """
+    migrations.create_index_concurrently("ix_users_name", "users", ["name"])
+    migrations.add_not_null("users", "name")
+
+    columns = {column["name"]: column for column in sa.inspect(connection).get_columns("users")}
+    assert columns["name"]["nullable"] is False
+    assert [index["name"] for index in sa.inspect(connection).get_indexes("users")] == [
+        "ix_users_name"
+    ]
+    with pytest.raises(ValueError):
+        migrations.add_column("users", sa.Column("age", sa.Integer(), nullable=False))
+
+
+def test_postgresql_helpers_emit_online_ddl():
+    """
+    Test the SQL emitted on PostgreSQL: indexes built concurrently outside a transaction,
+    and NOT NULL set through a validated constraint, each step committed on its own.
+    """
+    output = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name="postgresql",
+        opts={"as_sql": True, "output_buffer": output, "transactional_ddl": True},
+    )
+    with Operations.context(context):
+        migrations.set_lock_timeout("2s")
+        migrations.create_index_concurrently("ix_users_name", "users", ["name"])
+        migrations.add_not_null("users", "name")
+    sql = output.getvalue()
+
+    assert "SET lock_timeout = '2s'" in sql
+    assert "COMMIT;\n\nCREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_name" in sql
+    assert "CHECK (name IS NOT NULL) NOT VALID" in sql
+    assert sql.index("VALIDATE CONSTRAINT") < sql.index("ALTER COLUMN name SET NOT NULL")
@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.quiz import Quiz, QuizSummary
+from app.utils.pagination import (
+    CursorPage,
+    InvalidCursorError,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+)
+
+NEWEST_FIRST = [SortKey(Quiz.created_at, "created_at"), SortKey(Quiz.id, "id")]
+
+
+def compile_sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip_restores_types():
+    """
+    Test that cursors decode back to the Python types of the sort columns.
+    """
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    quiz_id = uuid.uuid4()
+
+    cursor = encode_cursor([created_at, quiz_id])
+
+    assert decode_cursor(cursor, NEWEST_FIRST) == (created_at, quiz_id)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor(["2026-01-01T00:00:00"]),
+        encode_cursor(["yesterday", "3c30e14a-bffa-4aca-9bd0-c7a55f5460b3"]),
+        encode_cursor(["2026-01-01T00:00:00", "not-a-uuid"]),
+        encode_cursor(["2024-01-01T00:00:00+00:00", 5]),
+        encode_cursor([20240101, "3c30e14a-bffa-4aca-9bd0-c7a55f5460b3"]),
+    ],
+)
+def test_decode_invalid_cursor(cursor: str):
+    """
+    Test that malformed or mismatched cursors raise InvalidCursorError.
+    """
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, NEWEST_FIRST)
+
+
+def test_keyset_predicate_same_direction_uses_row_comparison():
+    """
+    Test that keys sorted the same way compile to a single row-value comparison.
+    """
+    predicate = keyset_predicate(NEWEST_FIRST, (datetime.now(timezone.utc), uuid.uuid4()))
+
+    sql = compile_sql(predicate)
+    assert sql.startswith("(quizzes.created_at, quizzes.id) <")
+    assert " OR " not in sql
+
+
+def test_keyset_predicate_mixed_directions_expands():
+    """
+    Test that mixed sort directions expand into one clause per key.
+    """
+    keys = [SortKey(Quiz.average_rating, "average_rating"), SortKey(Quiz.id, "id", False)]
+
+    sql = compile_sql(keyset_predicate(keys, (4.5, uuid.uuid4())))
+
+    assert "quizzes.average_rating < " in sql
+    assert " OR " in sql
+    assert "quizzes.average_rating = " in sql
+    assert "quizzes.id > " in sql
+
+
+def test_cursor_page_is_generic():
+    """
+    Test that CursorPage validates its items against the parameterized model.
+    """
+    page = CursorPage[QuizSummary].model_validate({"items": [], "next_cursor": "abc"})
+
+    assert page.items == []
+    assert page.next_cursor == "abc"
+    assert CursorPage[QuizSummary].model_json_schema()["properties"]["items"]["type"] == "array"
@@ -0,0 +1,117 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlmodel import select
+
+from app.db import partitions
+from app.db.partitions import PartitionedTable
+from app.models.game import Game, GameAnswer, GameEvent, GameEventType
+from tests.test_score_sync import item, sync
+
+NOW = datetime(2026, 10, 19, 12, 30, tzinfo=timezone.utc)
+ANSWERS = PartitionedTable("game_answers", "game_started_at", retention_months=2)
+
+
+def month(year: int, number: int) -> datetime:
+    return datetime(year, number, 1, tzinfo=timezone.utc)
+
+
+def test_months_roll_over_years():
+    """
+    Test month arithmetic across year boundaries, in UTC.
+    """
+    assert partitions.month_start(NOW) == month(2026, 10)
+    assert partitions.add_months(month(2026, 11), 2) == month(2027, 1)
+    assert partitions.add_months(month(2026, 1), -1) == month(2025, 12)
+    assert partitions.partition_month("game_answers", "game_answers_p2026_09") == month(2026, 9)
+    assert partitions.partition_month("game_answers", "game_events_p2026_09") is None
+
+
+def test_plan_creates_upcoming_and_drops_expired_partitions():
+    """
+    Test that missing partitions up to the premade months are created, and that those older
+    than the retention are dropped, oldest first.
+    """
+    existing = [
+        "game_answers_p2026_10",
+        "game_answers_p2026_08",
+        "game_answers_p2026_07",
+        "game_answers_p2026_06",
+        "game_answers_legacy",
+    ]
+    plan = partitions.plan_partitions(ANSWERS, existing, NOW, premake_months=2)
+
+    assert plan.create == [month(2026, 11), month(2026, 12)]
+    assert plan.drop == ["game_answers_p2026_06", "game_answers_p2026_07"]
+
+    keep_all = PartitionedTable("game_answers", "game_started_at", retention_months=0)
+    assert partitions.plan_partitions(keep_all, existing, NOW, premake_months=0).drop == []
+
+
+def test_expired_partitions_are_detached_before_dropping():
+    """
+    Test that expired partitions are detached concurrently, or finalized if an earlier
+    detach was interrupted, and then dropped.
+    """
+    existing = {
+        "game_answers_p2026_07": True,
+        "game_answers_p2026_06": False,
+        "game_answers_p2026_10": False,
+    }
+    statements = partitions.maintenance_statements(ANSWERS, existing, NOW)
+
+    assert statements[-4:] == [
+        "ALTER TABLE game_answers DETACH PARTITION game_answers_p2026_06 CONCURRENTLY",
+        "DROP TABLE game_answers_p2026_06",
+        "ALTER TABLE game_answers DETACH PARTITION game_answers_p2026_07 FINALIZE",
+        "DROP TABLE game_answers_p2026_07",
+    ]
+    assert statements[0] == (
+        "CREATE TABLE IF NOT EXISTS game_answers_p2026_11 PARTITION OF game_answers "
+        "FOR VALUES FROM ('2026-11-01T00:00:00+00:00') TO ('2026-12-01T00:00:00+00:00')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_skipped_off_postgresql(db_engine: AsyncEngine):
+    """
+    Test that maintaining partitions does nothing on databases without partitioning.
+    """
+    if db_engine.dialect.name == "postgresql":
+        pytest.skip("Partitions are maintained on PostgreSQL")
+    assert await partitions.maintain_partitions(db_engine) == []
+
+
+@pytest.mark.asyncio
+async def test_game_history_carries_partition_keys(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that answers are stored with their game's start time, and that starting and
+    finishing a game are recorded as events.
+    """
+    headers = await register_and_login_user("part@example.com", "part", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=headers)
+    response = await async_client.post(
+        f"/api/quizzes/{response.json()['id']}/games", headers=headers
+    )
+    game_id = response.json()["id"]
+    await sync(async_client, headers, [item(game_id, 0, "4")])
+    response = await async_client.post(f"/api/games/{game_id}/finish", headers=headers)
+    assert response.status_code == 200
+
+    game = await session.get(Game, uuid.UUID(game_id))
+    answer = (await session.execute(select(GameAnswer))).scalar_one()
+    assert answer.game_started_at == game.started_at
+    events = (
+        await session.execute(
+            select(GameEvent).where(GameEvent.game_id == game.id).order_by(GameEvent.occurred_at)
+        )
+    ).scalars()
+    assert [(event.type, event.user_id) for event in events] == [
+        (GameEventType.STARTED, game.host_id),
+        (GameEventType.FINISHED, None),
+    ]
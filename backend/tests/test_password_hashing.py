@@ -0,0 +1,92 @@
+import pytest
+from httpx import AsyncClient
+from passlib.registry import get_crypt_handler
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.calibrate_hashing import calibrate
+from app.models.user import User
+from app.services import auth_service
+
+LOGIN = {"email": "rehash@example.com", "password": "rehashpassword"}
+
+
+async def stored_hash(session: AsyncSession) -> str:
+    user = await session.scalar(select(User).where(User.email == LOGIN["email"]))
+    await session.refresh(user)
+    return user.password
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "scheme, options, prefix",
+    [
+        ("bcrypt", {"rounds": 5}, "$2b$05$"),
+        ("scrypt", {"rounds": 4}, "$scrypt$ln=4,"),
+    ],
+)
+async def test_login_upgrades_legacy_hashes(
+    async_client: AsyncClient,
+    session: AsyncSession,
+    monkeypatch,
+    query_budget,
+    scheme: str,
+    options: dict,
+    prefix: str,
+):
+    """
+    Test that a hash made with another cost or scheme is replaced on the next login, and
+    that logins with an up-to-date hash write nothing.
+    """
+    register = {"username": "rehash", **LOGIN}
+    assert (await async_client.post("/api/auth/register", json=register)).status_code == 201
+    legacy_hash = await stored_hash(session)
+    assert legacy_hash.startswith("$2b$04$")
+
+    context = auth_service.build_password_context(scheme, options, legacy_schemes=["bcrypt"])
+    monkeypatch.setattr(auth_service, "password_context", context)
+
+    assert (await async_client.post("/api/auth/login", json=LOGIN)).status_code == 200
+    upgraded_hash = await stored_hash(session)
+    assert upgraded_hash.startswith(prefix)
+    assert auth_service.verify_password(LOGIN["password"], upgraded_hash)
+
+    # Only the user lookup and the new refresh token once the hash is current
+    with query_budget(2):
+        response = await async_client.post("/api/auth/login", json=LOGIN)
+    assert response.status_code == 200
+    assert await stored_hash(session) == upgraded_hash
+
+
+@pytest.mark.asyncio
+async def test_failed_login_does_not_upgrade(
+    async_client: AsyncClient, session: AsyncSession, monkeypatch
+):
+    """
+    Test that a wrong password leaves a legacy hash untouched.
+    """
+    register = {"username": "rehash", **LOGIN}
+    await async_client.post("/api/auth/register", json=register)
+    legacy_hash = await stored_hash(session)
+    context = auth_service.build_password_context("bcrypt", {"rounds": 5})
+    monkeypatch.setattr(auth_service, "password_context", context)
+
+    response = await async_client.post(
+        "/api/auth/login", json={"email": LOGIN["email"], "password": "wrong"}
+    )
+    assert response.status_code == 401
+    assert await stored_hash(session) == legacy_hash
+
+
+@pytest.mark.parametrize("scheme", ["bcrypt", "pbkdf2_sha256"])
+def test_calibration_stays_within_target(scheme: str):
+    """
+    Test that calibration picks the costliest rounds within the target, for log2 and
+    linear cost schemes.
+    """
+    result = calibrate(scheme, target_seconds=0.01, samples=3)
+
+    assert result.scheme == scheme
+    # Only the minimum cost may exceed the target, when the machine is that slow
+    min_rounds = get_crypt_handler(scheme).min_rounds
+    assert result.verify_seconds <= 0.01 or result.options["rounds"] == min_rounds
@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services import user_service
+from tests.query_budget import QueryRecorder, check_budget, normalize_statement
+
+
+def test_normalize_statement_ignores_parameters():
+    """
+    Test that statements differing only in whitespace or IN list length share a shape.
+    """
+    assert normalize_statement("SELECT *\n  FROM users WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM users WHERE id IN (?)"
+    )
+    assert normalize_statement("SELECT * FROM users WHERE id IN (?)") == (
+        "SELECT * FROM users WHERE id IN (?)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_budget_flags_n_plus_one_queries(session: AsyncSession, query_budget):
+    """
+    Test that loading rows one by one trips the N+1 check, and that exceeding the
+    budget fails with the list of statements.
+    """
+    users = [User(email=f"user{index}@example.com", username=f"u{index}") for index in range(4)]
+    session.add_all(users)
+    await session.commit()
+    session.expunge_all()
+
+    with pytest.raises(AssertionError, match="Possible N\\+1 queries"):
+        with query_budget(10):
+            for user in users:
+                await user_service.get_user_by_id(session, user.id)
+
+    with pytest.raises(AssertionError, match="at most 1 queries, 2 were executed"):
+        with query_budget(1, n_plus_one_threshold=None):
+            await user_service.get_user_by_email(session, "user0@example.com")
+            await user_service.get_user_by_id(session, uuid.uuid4())
+
+    recorder = QueryRecorder()
+    recorder.statements = ["SELECT 1", "SELECT 1", "SELECT 1"]
+    check_budget(recorder, 3, n_plus_one_threshold=None)
@@ -0,0 +1,157 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.quiz import QuizRead, QuizSearchPage
+from app.services.quiz_service import build_search_statement
+from app.utils.pagination import apply_keyset, encode_cursor
+
+
+@pytest.mark.asyncio
+async def test_create_and_read_quiz(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test creating a quiz and reading it back as its owner.
+    """
+    headers = await register_and_login_user("quizowner@example.com", "quizowner", "password")
+
+    response = await async_client.post(
+        "/api/quizzes/", json={**test_quiz_data, "tags": [" Math ", "math"]}, headers=headers
+    )
+    assert response.status_code == 201
+    quiz = QuizRead(**response.json())
+    assert quiz.title == test_quiz_data["title"]
+    assert quiz.tags == ["math"]
+    assert quiz.version == 1
+
+    response = await async_client.get(f"/api/quizzes/{quiz.id}", headers=headers)
+    assert response.status_code == 200
+    assert QuizRead(**response.json()).questions[0].correct_answer == "4"
+
+
+@pytest.mark.asyncio
+async def test_read_quiz_not_owner(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that only the owner can read the full quiz, answers included.
+    """
+    owner_headers = await register_and_login_user("owner2@example.com", "owner2", "password")
+    other_headers = await register_and_login_user("other2@example.com", "other2", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=owner_headers)
+    quiz_id = response.json()["id"]
+
+    response = await async_client.get(f"/api/quizzes/{quiz_id}", headers=other_headers)
+    assert response.status_code == 403
+
+    response = await async_client.get(f"/api/quizzes/{uuid.uuid4()}", headers=other_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_quiz_bumps_version(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that replacing quiz content creates a new version.
+    """
+    headers = await register_and_login_user("updater@example.com", "updater", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=headers)
+    quiz_id = response.json()["id"]
+
+    response = await async_client.put(
+        f"/api/quizzes/{quiz_id}", json={**test_quiz_data, "title": "Renamed"}, headers=headers
+    )
+    assert response.status_code == 200
+    quiz = QuizRead(**response.json())
+    assert quiz.title == "Renamed"
+    assert quiz.version == 2
+
+
+@pytest.mark.asyncio
+async def test_create_quiz_invalid_answer(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that a multiple choice answer outside the options is rejected.
+    """
+    headers = await register_and_login_user("invalid@example.com", "invalid", "password")
+    questions = [{**test_quiz_data["questions"][0], "correct_answer": "7"}]
+
+    response = await async_client.post(
+        "/api/quizzes/", json={**test_quiz_data, "questions": questions}, headers=headers
+    )
+    assert response.status_code == 422
+    assert "correct_answer must be one of the options" in response.json()["detail"][0]["msg"]
+
+
+@pytest.mark.asyncio
+async def test_browse_quizzes_paginates(
+    async_client: AsyncClient,
+    session: AsyncSession,
+    test_quiz_data,
+    query_budget,
+    register_and_login_user,
+):
+    """
+    Test browsing public quizzes page by page, newest first, skipping private ones.
+    """
+    headers = await register_and_login_user("browser@example.com", "browser", "password")
+    for index in range(5):
+        await async_client.post(
+            "/api/quizzes/", json={**test_quiz_data, "title": f"Quiz {index}"}, headers=headers
+        )
+    await async_client.post(
+        "/api/quizzes/", json={**test_quiz_data, "is_public": False}, headers=headers
+    )
+
+    titles = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        # Authentication and a single query for the page, however many quizzes it holds
+        with query_budget(2):
+            response = await async_client.get("/api/quizzes/", params=params, headers=headers)
+        assert response.status_code == 200
+        page = QuizSearchPage(**response.json())
+        titles.extend(item.title for item in page.items)
+        cursor = page.next_cursor
+
+    assert titles == ["Quiz 4", "Quiz 3", "Quiz 2", "Quiz 1", "Quiz 0"]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_search_quizzes_invalid_cursor(
+    async_client: AsyncClient, session: AsyncSession, register_and_login_user
+):
+    """
+    Test that a malformed cursor is rejected with 400.
+    """
+    headers = await register_and_login_user("cursor@example.com", "cursor", "password")
+
+    response = await async_client.get(
+        "/api/quizzes/", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+def test_search_statement_uses_full_text_index():
+    """
+    Test that text search compiles to an indexed tsquery match ranked with keyset paging.
+    """
+    statement, keys = build_search_statement("volcano", tags=["science"], min_rating=3)
+    cursor = encode_cursor([0.5, uuid.uuid4()])
+    page = apply_keyset(statement, keys, limit=10, cursor=cursor)
+    sql = str(page.compile(dialect=postgresql.dialect()))
+
+    assert "quizzes.search_vector @@ websearch_to_tsquery" in sql
+    assert "ts_rank_cd(quizzes.search_vector" in sql
+    assert "quizzes.tags @>" in sql
+    assert "ORDER BY rank DESC, quizzes.id DESC" in sql
+    assert "OFFSET" not in sql
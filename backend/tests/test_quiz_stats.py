@@ -0,0 +1,130 @@
+import uuid
+from dataclasses import asdict
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.quiz import Quiz
+from app.services.quiz_stats_service import quiz_counters, reconcile_quiz_counters
+
+
+@pytest.fixture(autouse=True)
+def empty_counter_buffer():
+    quiz_counters.drain()
+    yield
+    quiz_counters.drain()
+
+
+async def create_quiz(client: AsyncClient, headers: dict, quiz_data: dict) -> uuid.UUID:
+    response = await client.post("/api/quizzes/", json=quiz_data, headers=headers)
+    assert response.status_code == 201
+    return uuid.UUID(response.json()["id"])
+
+
+@pytest.mark.asyncio
+async def test_counters_are_buffered_then_flushed(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that ratings, comments and plays only reach the quiz row when the buffer flushes.
+    """
+    owner = await register_and_login_user("statowner@example.com", "o", "password")
+    player = await register_and_login_user("statplayer@example.com", "p", "password")
+    quiz_id = await create_quiz(async_client, owner, test_quiz_data)
+
+    assert (
+        await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 5}, headers=owner)
+    ).status_code == 200
+    assert (
+        await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 2}, headers=player)
+    ).status_code == 200
+    # Re-rating replaces the previous score instead of adding a rating
+    await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 4}, headers=player)
+    await async_client.post(
+        f"/api/quizzes/{quiz_id}/comments", json={"body": "Fun!"}, headers=player
+    )
+    response = await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=player)
+    assert response.status_code == 201
+    assert response.json()["question_count"] == 2
+
+    quiz = await session.get(Quiz, quiz_id)
+    assert quiz.rating_count == 0 and quiz.play_count == 0
+
+    assert await quiz_counters.flush(session) == 1
+    await session.refresh(quiz)
+    assert quiz.rating_count == 2
+    assert quiz.rating_total == 9
+    assert quiz.average_rating == pytest.approx(4.5)
+    assert quiz.comment_count == 1
+    assert quiz.play_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_recomputes_counters(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that reconciliation repairs counters that drifted from the source tables.
+    """
+    owner = await register_and_login_user("reconcile@example.com", "r", "password")
+    quiz_id = await create_quiz(async_client, owner, test_quiz_data)
+    await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 3}, headers=owner)
+    await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=owner)
+    await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=owner)
+
+    # Simulate deltas lost in a crash
+    quiz_counters.drain()
+    quiz = await session.get(Quiz, quiz_id)
+    quiz.comment_count = 7
+    session.add(quiz)
+    await session.commit()
+
+    assert await reconcile_quiz_counters(session, batch_size=1, quiet_seconds=0) == 1
+    await session.refresh(quiz)
+    assert quiz.rating_count == 1
+    assert quiz.average_rating == pytest.approx(3.0)
+    assert quiz.play_count == 2
+    assert quiz.comment_count == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_recently_active_quizzes(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that reconciliation leaves quizzes with recent activity alone, as other workers
+    may still buffer deltas for them.
+    """
+    owner = await register_and_login_user("active@example.com", "a", "password")
+    quiz_id = await create_quiz(async_client, owner, test_quiz_data)
+    await async_client.put(f"/api/quizzes/{quiz_id}/rating", json={"score": 3}, headers=owner)
+
+    # The rating's delta is still buffered, as if in another worker
+    pending = quiz_counters.drain()
+
+    assert await reconcile_quiz_counters(session, quiet_seconds=60) == 0
+    for pending_id, delta in pending.items():
+        quiz_counters.add(pending_id, **asdict(delta))
+    await quiz_counters.flush(session)
+    quiz = await session.get(Quiz, quiz_id)
+    await session.refresh(quiz)
+    assert quiz.rating_count == 1
+
+
+@pytest.mark.asyncio
+async def test_private_quiz_cannot_be_rated_by_others(
+    async_client: AsyncClient, session: AsyncSession, test_quiz_data, register_and_login_user
+):
+    """
+    Test that private quizzes are hidden from other users.
+    """
+    owner = await register_and_login_user("private@example.com", "a", "password")
+    other = await register_and_login_user("outsider@example.com", "b", "password")
+    quiz_id = await create_quiz(async_client, owner, {**test_quiz_data, "is_public": False})
+
+    response = await async_client.put(
+        f"/api/quizzes/{quiz_id}/rating", json={"score": 5}, headers=other
+    )
+    assert response.status_code == 404
+    assert len(quiz_counters) == 0
@@ -0,0 +1,139 @@
+import gzip
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+
+async def sync(client: AsyncClient, headers: dict, items: list[dict]):
+    body = gzip.compress(json.dumps({"items": items}).encode())
+    return await client.post(
+        "/api/games/sync",
+        content=body,
+        headers={**headers, "Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+
+
+def item(game_id: str, index: int, value: str, key: uuid.UUID | None = None) -> dict:
+    return {
+        "idempotency_key": str(key or uuid.uuid4()),
+        "game_id": game_id,
+        "question_index": index,
+        "answer": value,
+        "elapsed_ms": 2000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sync_grades_and_dedupes_answers(
+    async_client: AsyncClient, test_quiz_data, register_and_login_user
+):
+    """
+    Test that a synced batch is graded server-side and that retrying it is harmless.
+    """
+    headers = await register_and_login_user("sync@example.com", "sync", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=headers)
+    quiz_id = response.json()["id"]
+    response = await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=headers)
+    game_id = response.json()["id"]
+
+    batch = [
+        item(game_id, 0, "4"),
+        item(game_id, 1, "False"),
+        item(game_id, 5, "4"),
+        item(str(uuid.uuid4()), 0, "4"),
+        item(game_id, 0, "5"),
+    ]
+    response = await sync(async_client, headers, batch)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["idempotency_key"] for result in results] == [
+        entry["idempotency_key"] for entry in batch
+    ]
+    assert [result["status"] for result in results] == [
+        "accepted",
+        "accepted",
+        "rejected",
+        "rejected",
+        "rejected",
+    ]
+    assert results[0]["is_correct"] is True
+    assert results[0]["points"] > 0
+    assert results[1]["is_correct"] is False
+    assert results[1]["points"] == 0
+    assert results[2]["error"] == "No such question"
+    assert results[3]["error"] == "Game not found"
+    assert results[4]["error"] == "Question answered twice in this batch"
+
+    # A retry of the same batch returns the stored grading
+    retry = await sync(async_client, headers, batch[:2])
+    assert [result["status"] for result in retry.json()["results"]] == ["duplicate", "duplicate"]
+    assert retry.json()["results"][0]["points"] == results[0]["points"]
+
+    # A new key for an already answered question cannot overwrite it
+    response = await sync(async_client, headers, [item(game_id, 0, "4")])
+    assert response.json()["results"][0]["status"] == "rejected"
+    assert response.json()["results"][0]["error"] == "Question already answered"
+
+    response = await async_client.post(f"/api/games/{game_id}/finish", headers=headers)
+    assert response.status_code == 200
+    response = await sync(async_client, headers, [item(game_id, 1, "True")])
+    assert response.json()["results"][0]["error"] == "Game has ended"
+
+
+@pytest.mark.asyncio
+async def test_sync_retry_after_game_ended_reports_duplicates(
+    async_client: AsyncClient, test_quiz_data, register_and_login_user
+):
+    """
+    Test that re-sending a stored batch once its game has ended returns the stored grading
+    rather than rejecting the answers.
+    """
+    headers = await register_and_login_user("retry@example.com", "retry", "password")
+    response = await async_client.post("/api/quizzes/", json=test_quiz_data, headers=headers)
+    quiz_id = response.json()["id"]
+    response = await async_client.post(f"/api/quizzes/{quiz_id}/games", headers=headers)
+    game_id = response.json()["id"]
+
+    batch = [item(game_id, 0, "4"), item(game_id, 1, "False")]
+    first = (await sync(async_client, headers, batch)).json()["results"]
+    assert [result["status"] for result in first] == ["accepted", "accepted"]
+    response = await async_client.post(f"/api/games/{game_id}/finish", headers=headers)
+    assert response.status_code == 200
+
+    retry = (await sync(async_client, headers, batch)).json()["results"]
+    assert [result["status"] for result in retry] == ["duplicate", "duplicate"]
+    assert [result["points"] for result in retry] == [result["points"] for result in first]
+    assert [result["is_correct"] for result in retry] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_sync_rejects_bad_bodies(async_client: AsyncClient, register_and_login_user):
+    """
+    Test that oversized, corrupt, unsupported and invalid sync bodies are refused.
+    """
+    headers = await register_and_login_user("bad@example.com", "bad", "password")
+
+    # A few kilobytes that inflate past the body limit
+    bomb = gzip.compress(b" " * (4 * 1024 * 1024))
+    response = await async_client.post(
+        "/api/games/sync", content=bomb, headers={**headers, "Content-Encoding": "gzip"}
+    )
+    assert response.status_code == 413
+
+    response = await async_client.post(
+        "/api/games/sync", content=b"not gzip", headers={**headers, "Content-Encoding": "gzip"}
+    )
+    assert response.status_code == 400
+
+    response = await async_client.post(
+        "/api/games/sync", content=b"{}", headers={**headers, "Content-Encoding": "br"}
+    )
+    assert response.status_code == 415
+
+    response = await sync(async_client, headers, [])
+    assert response.status_code == 422
+
+    response = await async_client.post("/api/games/sync", json={"items": []})
+    assert response.status_code == 401
@@ -0,0 +1,47 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import socketio.packet  # type: ignore
+
+from app.models.quiz import QuestionType
+from app.models.user import UserRead
+from app.utils.serialization import SocketIOJSON, dump_model, dumps
+
+
+def test_dumps_matches_pydantic_json_encoding():
+    """
+    Test that orjson encodes models, UUIDs, datetimes, enums and arrays like the API does.
+    """
+    user = UserRead(
+        email="json@example.com",
+        username="json",
+        id=uuid.uuid4(),
+        is_active=True,
+        created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+    assert json.loads(dumps(user)) == json.loads(dump_model(user))
+    assert json.loads(dumps({"user": user, "ids": {user.id}})) == {
+        "user": json.loads(user.model_dump_json()),
+        "ids": [str(user.id)],
+    }
+    assert dumps({1: QuestionType.TRUE_FALSE, "scores": np.arange(3)}) == (
+        b'{"1":"true_false","scores":[0,1,2]}'
+    )
+
+
+def test_socketio_packets_use_orjson():
+    """
+    Test that Socket.IO packets round-trip through the orjson shim.
+    """
+    game_id = uuid.uuid4()
+    packet = socketio.packet.Packet(
+        socketio.packet.EVENT, data=["answer", {"game_id": game_id, "points": 950}]
+    )
+    packet.json = SocketIOJSON
+    encoded = packet.encode()
+    assert encoded == f'2["answer",{{"game_id":"{game_id}","points":950}}]'
+
+    decoded = socketio.packet.Packet(encoded_packet=encoded)
+    assert decoded.data == ["answer", {"game_id": str(game_id), "points": 950}]
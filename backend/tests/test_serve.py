@@ -0,0 +1,147 @@
+import os
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Collection
+
+import httpx
+import pytest
+from gunicorn.util import import_app
+
+from app.db.engine import async_engine
+from app.main import app, create_app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Minimal application reporting the worker's PID
+FAKE_APP = """
+import os
+import runpy
+
+from fastapi import FastAPI
+
+
+app = FastAPI()
+
+
+@app.get("/")
+async def pid():
+    return {"pid": os.getpid()}
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_pids(
+    url: str, expected: int, exclude: Collection[int] = (), timeout: float = 15
+) -> set:
+    # Workers share the socket, so keep asking until enough distinct workers answered
+    deadline = time.monotonic() + timeout
+    seen: set[int] = set()
+    while time.monotonic() < deadline:
+        try:
+            pid = httpx.get(url, timeout=1).json()["pid"]
+            if pid not in exclude:
+                seen.add(pid)
+        except httpx.TransportError:
+            time.sleep(0.1)
+        if len(seen) >= expected:
+            return seen
+    raise AssertionError(f"Only {len(seen)} of {expected} workers answered")
+
+
+def test_create_app_builds_independent_apps():
+    """
+    Test that each call of the factory builds a new app with its own Socket.IO server.
+    """
+    first, second = create_app(), create_app()
+
+    assert first is not second
+    mounts = [
+        route.app.engineio_server  # type: ignore[attr-defined]
+        for app in (first, second)
+        for route in app.routes
+        if getattr(route, "path", None) == "/socket.io"
+    ]
+    assert len(mounts) == 2 and mounts[0] is not mounts[1]
+
+
+def test_gunicorn_serves_the_module_app():
+    """
+    Test that gunicorn loads the app built by importing `app.main`, rather than building
+    a second one with the factory.
+    """
+    config = runpy.run_path(str(BACKEND_DIR / "gunicorn.conf.py"))
+
+    assert import_app(config["wsgi_app"]) is app
+
+
+def test_forked_process_gets_its_own_pool():
+    """
+    Test that a forked process never reuses the connection pool of its parent.
+    """
+    parent_pool = id(async_engine.sync_engine.pool)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, str(id(async_engine.sync_engine.pool)).encode())
+        os._exit(0)
+    os.close(write_fd)
+    child_pool = int(os.read(read_fd, 64))
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert child_pool != parent_pool
+    assert id(async_engine.sync_engine.pool) == parent_pool
+
+
+@pytest.mark.slow
+def test_gunicorn_reloads_workers(tmp_path: Path):
+    """
+    Test that gunicorn, with the settings in `gunicorn.conf.py`, runs the requested uvicorn
+    workers, replaces them on SIGHUP and shuts down cleanly on SIGTERM.
+    """
+    (tmp_path / "fake_app.py").write_text(textwrap.dedent(FAKE_APP))
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "fake_app:app",
+            "--pythonpath",
+            str(tmp_path),
+            "--workers",
+            "2",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--graceful-timeout",
+            "5",
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        first = wait_for_pids(url, 2)
+
+        process.send_signal(signal.SIGHUP)
+        second = wait_for_pids(url, 2, exclude=first)
+        assert not first & second
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=15) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
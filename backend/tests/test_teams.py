@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from app.game.teams import TeamScoreboard, balanced_counts, competition_ranks
+
+
+def test_auto_assignment_balances_teams():
+    """
+    Test that auto-assigned players fill the smallest teams first and take turns.
+    """
+    board = TeamScoreboard(3, capacity=2)
+    teams = board.add_players([f"p{index}" for index in range(7)])
+    assert teams.tolist() == [0, 1, 2, 0, 1, 2, 0]
+    assert board.team_sizes.tolist() == [3, 2, 2]
+
+    board.remove_player("p1")
+    board.remove_player("p4")
+    assert board.add_player("late") == 1
+    assert board.add_players(["a", "b", "c"]).tolist() == [1, 1, 2]
+    assert board.team_sizes.tolist() == [3, 3, 3]
+    assert len(board) == 9
+
+    with pytest.raises(ValueError):
+        board.add_players(["a"])
+    with pytest.raises(ValueError):
+        board.add_player("new", team=3)
+
+
+def test_balanced_counts_match_one_by_one_assignment():
+    """
+    Test that bulk assignment ends with the same team sizes as adding players one by one.
+    """
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        sizes = rng.integers(0, 12, rng.integers(1, 9))
+        count = int(rng.integers(0, 40))
+        expected = sizes.copy()
+        for _ in range(count):
+            expected[np.argmin(expected)] += 1
+        assert (sizes + balanced_counts(sizes, count)).tolist() == expected.tolist()
+
+
+def test_scores_and_ranks_update_incrementally():
+    """
+    Test that team totals, averages and ranks follow awards and departures.
+    """
+    board = TeamScoreboard(3)
+    board.add_players(["a", "b", "c", "d", "e"])  # Teams: a, d | b, e | c
+    board.award("a", 100)
+    board.award_many(["b", "c", "d", "e"], [300, 50, 100, 0])
+
+    assert board.score_of("b") == 300
+    assert board.team_totals.tolist() == [200, 300, 50]
+    assert board.team_averages().tolist() == [100.0, 150.0, 50.0]
+    assert board.team_ranks().tolist() == [2, 1, 3]
+
+    board.remove_player("e")
+    standings = board.standings()
+    assert [standing.team for standing in standings] == [1, 0, 2]
+    assert standings[0].total == 300
+    assert standings[0].members == 1
+    assert standings[0].average == 300.0
+
+    totals = board.team_totals
+    board.rebuild_totals()
+    assert board.team_totals.tolist() == totals.tolist()
+
+
+def test_competition_ranks_share_ties():
+    """
+    Test that equal scores share a rank and the next rank is skipped.
+    """
+    assert competition_ranks(np.array([5.0, 3.0, 5.0, 1.0])).tolist() == [1, 3, 1, 4]
@@ -0,0 +1,179 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import TokenRevocation, User
+from app.services import token_service
+
+LOGIN = {"email": "tokens@example.com", "password": "tokenspassword"}
+
+
+@pytest.fixture
+async def tokens(async_client: AsyncClient, register_and_login_user) -> dict:
+    """
+    Access and refresh tokens of a registered user.
+    """
+    await register_and_login_user(LOGIN["email"], "tokens", LOGIN["password"])
+    response = await async_client.post("/api/auth/login", json=LOGIN)
+    assert response.status_code == 200
+    return response.json()
+
+
+def token_user_id(tokens: dict) -> uuid.UUID:
+    return uuid.UUID(jwt.get_unverified_claims(tokens["access_token"])["sub"])
+
+
+async def read_me(async_client: AsyncClient, access_token: str) -> int:
+    response = await async_client.get(
+        "/api/users/me", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    return response.status_code
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_tokens(
+    async_client: AsyncClient, session: AsyncSession, tokens: dict
+):
+    """
+    Test that a refresh token gives a new working pair and can only be used once, and that
+    reusing it revokes the tokens issued from it.
+    """
+    assert tokens["expires_in"] == 15 * 60
+
+    response = await async_client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert await read_me(async_client, rotated["access_token"]) == 200
+
+    # A stolen copy of the first token signs out the whole session
+    reused = await async_client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert reused.status_code == 401
+    response = await async_client.post(
+        "/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(
+    async_client: AsyncClient, session: AsyncSession, tokens: dict
+):
+    """
+    Test that a logged out session cannot be refreshed, while other sessions still can.
+    """
+    second = (await async_client.post("/api/auth/login", json=LOGIN)).json()
+
+    response = await async_client.post(
+        "/api/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 204
+
+    for pair, status_code in ((tokens, 401), (second, 200)):
+        response = await async_client.post(
+            "/api/auth/refresh", json={"refresh_token": pair["refresh_token"]}
+        )
+        assert response.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_access_tokens(
+    async_client: AsyncClient, session: AsyncSession, tokens: dict
+):
+    """
+    Test that signing out everywhere rejects the user's access and refresh tokens at once,
+    and that logging in again works.
+    """
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    assert (await async_client.post("/api/auth/logout-all", headers=headers)).status_code == 204
+
+    assert await read_me(async_client, tokens["access_token"]) == 401
+    response = await async_client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+    fresh = (await async_client.post("/api/auth/login", json=LOGIN)).json()
+    assert await read_me(async_client, fresh["access_token"]) == 200
+
+
+@pytest.mark.asyncio
+async def test_legacy_long_lived_access_tokens_are_rejected(
+    async_client: AsyncClient, tokens: dict
+):
+    """
+    Test that access tokens shaped like those issued before refresh tokens, without `iat`
+    or valid for 30 days, are rejected even though their signature is valid.
+    """
+    now = time.time()
+    claims = {"sub": str(token_user_id(tokens)), "email": LOGIN["email"]}
+    short = jwt.encode({**claims, "iat": now, "exp": int(now) + 60}, settings.SECRET_KEY)
+    assert await read_me(async_client, short) == 200
+
+    legacy = jwt.encode({**claims, "exp": int(now) + 30 * 86400}, settings.SECRET_KEY)
+    assert await read_me(async_client, legacy) == 401
+    long_lived = jwt.encode(
+        {**claims, "iat": now, "exp": int(now) + 30 * 86400}, settings.SECRET_KEY
+    )
+    assert await read_me(async_client, long_lived) == 401
+
+
+@pytest.mark.asyncio
+async def test_revocations_by_other_workers_are_synced(
+    async_client: AsyncClient, session: AsyncSession, tokens: dict
+):
+    """
+    Test that a revocation stored by another worker is applied after a sync.
+    """
+    session.add(
+        TokenRevocation(user_id=token_user_id(tokens), not_before=datetime.now(timezone.utc))
+    )
+    await session.commit()
+    assert await read_me(async_client, tokens["access_token"]) == 200
+
+    await token_service.sync_revocations(session)
+    assert await read_me(async_client, tokens["access_token"]) == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_inactive_users(
+    async_client: AsyncClient, session: AsyncSession, tokens: dict
+):
+    """
+    Test that a deactivated user cannot refresh their tokens.
+    """
+    user = await session.get(User, token_user_id(tokens))
+    user.is_active = False
+    session.add(user)
+    await session.commit()
+
+    response = await async_client.post(
+        "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_revocation_list_drops_expired_entries():
+    """
+    Test that revocations are kept only while tokens they revoke can still be unexpired.
+    """
+    revocations = token_service.RevocationList()
+    old_user, new_user = uuid.uuid4(), uuid.uuid4()
+    now = time.time()
+
+    revocations.merge({old_user: now - 3600, new_user: now}, horizon=now - 900)
+
+    assert len(revocations) == 1
+    assert revocations.is_revoked(new_user, now - 1)
+    assert not revocations.is_revoked(new_user, now + 1)
+    assert not revocations.is_revoked(old_user, now - 7200)
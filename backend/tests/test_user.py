@@ -26,7 +26,9 @@ async def register_and_login_user(client: AsyncClient, email: str, username: str
 
 
 @pytest.mark.asyncio
-async def test_read_user_by_id_success(async_client: AsyncClient, session: AsyncSession):
+async def test_read_user_by_id_success(
+    async_client: AsyncClient, session: AsyncSession, query_budget
+):
     """
     Test retrieving a user by ID with a valid token (fetching own user details).
     """
@@ -34,9 +36,11 @@ async def test_read_user_by_id_success(async_client: AsyncClient, session: Async
         async_client, "idtest@example.com", "idtestuser", "idtestpassword"
     )
 
-    response = await async_client.get(
-        f"/api/users/{user_id}", headers={"Authorization": f"Bearer {access_token}"}
-    )
+    # One query to authenticate, one to load the user
+    with query_budget(2):
+        response = await async_client.get(
+            f"/api/users/{user_id}", headers={"Authorization": f"Bearer {access_token}"}
+        )
     assert response.status_code == 200
     user_read = UserRead(**response.json())
     assert user_read.id == user_id
@@ -95,7 +99,9 @@ async def test_read_user_by_id_nonexistent(async_client: AsyncClient, session: A
 
 
 @pytest.mark.asyncio
-async def test_read_user_by_email_success(async_client: AsyncClient, session: AsyncSession):
+async def test_read_user_by_email_success(
+    async_client: AsyncClient, session: AsyncSession, query_budget
+):
     """
     Test retrieving a user by email with a valid token (fetching own user details).
     """
@@ -103,11 +109,13 @@ async def test_read_user_by_email_success(async_client: AsyncClient, session: As
         async_client, "emailtest@example.com", "emailtestuser", "emailtestpassword"
     )
 
-    response = await async_client.get(
-        "/api/users/",
-        params={"email": "emailtest@example.com"},
-        headers={"Authorization": f"Bearer {access_token}"},
-    )
+    # One query to authenticate, one to look up the email
+    with query_budget(2):
+        response = await async_client.get(
+            "/api/users/",
+            params={"email": "emailtest@example.com"},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
     assert response.status_code == 200
     user_read = UserRead(**response.json())
     assert user_read.email == "emailtest@example.com"